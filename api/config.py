@@ -16,6 +16,16 @@ class Settings(BaseSettings):
     adls_account_key: str = ""
     debug: bool = False
     cors_origins: str = "*"
+    job_workers: int = 4  # DQ jobs executing at once
+    job_executor: str = "process"  # "process" or "thread"
+    job_concurrency: dict[str, int] = {}  # per source type limit, e.g. DQ_JOB_CONCURRENCY='{"spark": 1}'
+    job_poll_seconds: float = 2.0  # how often runners look for queued jobs
+    job_lease_seconds: int = 60  # a claimed job whose lease is not renewed for this long is taken over
+    job_max_attempts: int = 3
+    job_retry_backoff_seconds: float = 30.0  # doubled on every further attempt
+    scheduler_jitter_seconds: float = 60.0  # spread of run times among schedules sharing a cron time
+    scheduler_max_queued_per_source: int = 2  # schedules wait while their source has this many runs queued
+    scheduler_refresh_seconds: float = 60.0  # how often the scheduler loads changed schedules
 
     model_config = {"env_prefix": "DQ_"}
 
@@ -0,0 +1,120 @@
+"""Cron expressions for DQ schedules.
+
+Standard five-field expressions (minute, hour, day of month, month, day of
+week) with ``*``, ranges, steps, lists and month/weekday names, plus the
+``@hourly``, ``@daily``, ``@weekly``, ``@monthly`` and ``@yearly``
+aliases. As in cron, when both day fields are restricted a day matches
+either of them. Times are evaluated in UTC.
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTHS = {name: i + 1 for i, name in enumerate("jan feb mar apr may jun jul aug sep oct nov dec".split())}
+_WEEKDAYS = {name: i for i, name in enumerate("sun mon tue wed thu fri sat".split())}
+# (lowest, highest, names) of each field
+_FIELDS = ((0, 59, {}), (0, 23, {}), (1, 31, {}), (1, 12, _MONTHS), (0, 7, _WEEKDAYS))
+_MAX_YEARS = 5  # an expression that matches no time within this many years (e.g. "0 0 30 2 *") never fires
+
+
+class CronExpression:
+    """A parsed cron expression.
+
+    Args:
+        expression: Five-field cron expression or ``@`` alias.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = _ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        minutes, hours, days, months, weekdays = (_parse_field(field, *spec) for field, spec in zip(fields, _FIELDS))
+        self.minutes = sorted(minutes)
+        self.hours = sorted(hours)
+        self.days = days
+        self.months = months
+        self.weekdays = {day % 7 for day in weekdays}  # 7 is Sunday too
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+    def next_after(self, after: datetime) -> datetime:
+        """The first time strictly after ``after`` that the expression matches (seconds are zero).
+
+        Raises:
+            ValueError: If the expression matches no time in the next few years.
+        """
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after.year + _MAX_YEARS
+        while moment.year <= limit:
+            if moment.month not in self.months:
+                month = moment.month % 12 + 1
+                moment = moment.replace(year=moment.year + (month == 1), month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                hour = next((h for h in self.hours if h > moment.hour), None)
+                if hour is None:
+                    moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                else:
+                    moment = moment.replace(hour=hour, minute=0)
+            elif moment.minute not in self.minutes:
+                minute = next((m for m in self.minutes if m > moment.minute), None)
+                if minute is None:
+                    moment = (moment + timedelta(hours=1)).replace(minute=0)
+                else:
+                    moment = moment.replace(minute=minute)
+            else:
+                return moment
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_days = moment.day in self.days
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+
+@lru_cache(maxsize=1024)
+def parse_cron(expression: str) -> CronExpression:
+    """Parse a cron expression, caching the result (schedules share a few expressions)."""
+    return CronExpression(expression)
+
+
+def _parse_field(field: str, lowest: int, highest: int, names: dict[str, int]) -> set[int]:
+    values: set[int] = set()
+    for part in field.lower().split(","):
+        span, slash, step = part.partition("/")
+        try:
+            step = int(step) if step else 1
+            if span == "*":
+                start, end = lowest, highest
+            else:
+                first, dash, last = span.partition("-")
+                start = names[first] if first in names else int(first)
+                if dash:
+                    end = names[last] if last in names else int(last)
+                else:
+                    end = highest if slash else start  # "5/10" steps from 5 to the end of the range
+        except ValueError:
+            raise ValueError(f"Invalid cron field: {field!r}") from None
+        if step < 1 or not lowest <= start <= end <= highest:
+            raise ValueError(f"Invalid cron field: {field!r}")
+        values.update(range(start, end + 1, step))
+    return values
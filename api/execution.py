@@ -0,0 +1,234 @@
+"""Execution of DQ runs: load the rules and source of a run, check the data and store the results.
+
+Runs are executed by the job runner's worker processes (see
+``api.job_runner``), each with its own database session.
+"""
+
+import json
+import threading
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Optional
+
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session
+
+from api import job_queue
+from api.config import settings
+from api.dependencies import SessionLocal
+from api.models.database import DQRun, DQResult, DQScore, Rule, DataSource, gen_uuid
+from engine.freshness import run_checks_with_metadata
+from engine.pushdown import run_checks_pushdown
+from engine.reference import set_source_resolver
+from engine.rule_engine import DQCheckResult, RuleDefinition, run_checks_streaming
+from connectors import get_connector
+from connectors.base import DataConnector
+
+
+def _open_reference_source(source: str) -> DataConnector:
+    """Connect to the data source a referential integrity rule names (by id or name)."""
+    db = SessionLocal()
+    try:
+        record = db.query(DataSource).filter(or_(DataSource.id == source, DataSource.name == source)).first()
+    finally:
+        db.close()
+    if not record:
+        raise ValueError(f"Reference source not found: {source}")
+    connector = get_connector(record.type)()
+    connection_config = record.connection_config
+    connector.connect(json.loads(connection_config) if isinstance(connection_config, str) else connection_config)
+    return connector
+
+
+set_source_resolver(_open_reference_source)
+
+
+def run_job(run_id: str, owner: str) -> Optional[str]:
+    """Execute a run claimed by ``owner`` (see ``api.job_queue.claim``) and record its outcome.
+
+    While the checks execute, a background thread renews the claim's
+    lease. The run ends ``completed`` (with its results), ``failed``, or
+    back in ``pending`` to be retried after a transient error; every
+    transition is committed, so it is visible through
+    ``GET /api/jobs/{job_id}``.
+
+    Args:
+        run_id: ID of the claimed DQRun.
+        owner: Lease owner the run was claimed for.
+
+    Returns:
+        The run's new status, or None if the lease was lost to another runner
+        (whose outcome stands instead).
+
+    Raises:
+        ValueError: If the run does not exist.
+    """
+    stop = threading.Event()
+    renewer = threading.Thread(target=_renew_lease, args=(run_id, owner, stop), daemon=True)
+    renewer.start()
+    db = SessionLocal()
+    try:
+        db_run = db.query(DQRun).filter(DQRun.id == run_id).first()
+        if not db_run:
+            raise ValueError(f"Job not found: {run_id}")
+        try:
+            _execute_dq_checks(db_run, db)
+        except Exception as e:
+            # Discard partial results; invalid jobs (ValueError) fail at once, others are retried
+            db.rollback()
+            return job_queue.release(db, run_id, owner, str(e), retry=not isinstance(e, ValueError))
+        if not job_queue.holds_lease(db, run_id, owner):
+            db.rollback()
+            return None
+        db_run.lease_owner = db_run.lease_expires_at = None
+        db.commit()
+        return db_run.status
+    finally:
+        stop.set()
+        renewer.join()
+        db.close()
+
+
+def _renew_lease(run_id: str, owner: str, stop: threading.Event) -> None:
+    """Renew a run's lease every third of its duration until ``stop`` is set or the lease is lost."""
+    db = SessionLocal()
+    try:
+        while not stop.wait(settings.job_lease_seconds / 3):
+            try:
+                if not job_queue.heartbeat(db, run_id, owner):
+                    return
+            except Exception:  # database unavailable: retry at the next beat, the lease may still hold
+                db.rollback()
+    finally:
+        db.close()
+
+
+def _execute_dq_checks(db_run: DQRun, db: Session) -> None:
+    """Execute DQ checks for a run and store results."""
+    # 1. Load the data source
+    source = db.query(DataSource).filter(DataSource.id == db_run.source_id).first()
+    if not source:
+        raise ValueError(f"Data source not found: {db_run.source_id}")
+
+    # Parse source configuration
+    source_config = json.loads(source.connection_config)
+
+    # 2. Load rules from database
+    params = json.loads(db_run.parameters or "{}")
+    rule_ids = params.get("rule_ids")
+
+    if rule_ids:
+        # Use specified rule IDs
+        db_rules = db.query(Rule).filter(Rule.id.in_(rule_ids), Rule.is_active == True).all()
+    else:
+        # Use all active rules for the source
+        db_rules = db.query(Rule).filter(Rule.source_id == db_run.source_id, Rule.is_active == True).all()
+
+    if not db_rules:
+        raise ValueError("No active rules found for execution")
+
+    # Convert database rules to RuleDefinition objects
+    rules = []
+    for db_rule in db_rules:
+        rule_config = json.loads(db_rule.config or "{}")
+        rules.append(RuleDefinition(
+            name=db_rule.name,
+            dimension=db_rule.dimension,
+            column=db_rule.column_name,
+            operator=db_rule.operator or "gte",
+            threshold=db_rule.threshold,
+            config=rule_config,
+            severity=db_rule.severity,
+            rule_id=db_rule.id,
+        ))
+
+    # 3. Get connector and connect to data source
+    connector_class = get_connector(source.type)
+    connector = connector_class()
+    connector.connect(source_config)
+
+    # 4. Read data from the source
+    # For simplicity, use the first table if no specific path is configured
+    tables = connector.list_tables()
+    if not tables:
+        raise ValueError("No tables found in data source")
+
+    # Use the first table or a configured table path
+    table_name = params.get("table_name", tables[0])
+    limit = params.get("limit")  # Optional sampling; streaming keeps memory bounded by batch size
+    workers = int(params.get("workers", 1))  # >1 evaluates batches in a process pool
+
+    # 5. Run DQ checks: answer freshness-only rules from source metadata,
+    # count in the source database where possible, and stream batches
+    # through per-rule accumulators for everything else
+    def run_rest(rest: list[RuleDefinition]) -> list[DQCheckResult]:
+        if connector.pushdown_dialect and not limit and params.get("pushdown", True):
+            return run_checks_pushdown(rest, connector, table_name, workers)
+        return _run_streaming(connector, table_name, limit, rest, workers)
+
+    try:
+        check_results = run_checks_with_metadata(rules, connector, table_name, run_rest)
+    finally:
+        connector.close()
+
+    # 6. Store results in database, in one multi-row INSERT per batch of rows
+    # rather than a flush per ORM object; run_job commits them with the run
+    created_at = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": gen_uuid(),
+            "run_id": db_run.id,
+            "rule_id": result.rule_id,
+            "dimension": result.dimension,
+            "column_name": result.column,
+            "metric_value": result.metric_value,
+            "threshold": result.threshold,
+            "passed": result.passed,
+            "details": json.dumps(result.details),
+            "created_at": created_at,
+        }
+        for result in check_results
+        if result.rule_id is not None
+    ]
+    if rows:
+        db.execute(insert(DQResult), rows)
+
+    # 7. Store the run's score per dimension (mean metric value, as in the HTML report),
+    # which the metrics endpoints aggregate instead of the results
+    by_dimension: dict[str, list[dict]] = {}
+    for row in rows:
+        by_dimension.setdefault(row["dimension"], []).append(row)
+    scores = [
+        {
+            "id": gen_uuid(),
+            "run_id": db_run.id,
+            "source_id": db_run.source_id,
+            "dimension": dimension,
+            "score": round(sum(row["metric_value"] for row in dimension_rows) / len(dimension_rows), 2),
+            "total_checks": len(dimension_rows),
+            "passed_checks": sum(1 for row in dimension_rows if row["passed"]),
+            "created_at": created_at,
+        }
+        for dimension, dimension_rows in by_dimension.items()
+    ]
+    if scores:
+        db.execute(insert(DQScore), scores)
+
+    # 8. Update run status and statistics, counted over every result (metadata, pushdown and streamed alike)
+    passed_count = sum(1 for result in check_results if result.passed)
+    db_run.status = "completed"
+    db_run.completed_at = datetime.now(timezone.utc)
+    db_run.total_rules = len(check_results)
+    db_run.passed_rules = passed_count
+    db_run.failed_rules = len(check_results) - passed_count
+
+
+def _run_streaming(
+    connector, table_name: str, limit: Optional[int], rules: list[RuleDefinition], workers: int
+) -> list[DQCheckResult]:
+    """Stream the table through the rule accumulators batch by batch."""
+    batches = connector.read_data_iterator(table_name, limit=limit)
+    first_batch = next(batches, None)
+    if not first_batch:
+        raise ValueError("No data found in source")
+    return run_checks_streaming(rules, chain([first_batch], batches), workers)
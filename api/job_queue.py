@@ -0,0 +1,157 @@
+"""Durable job queue on the ``dq_runs`` table.
+
+A run is queued by inserting it as ``pending``. Job runners claim runs
+atomically, holding a lease that their workers renew while the run
+executes:
+
+- On PostgreSQL (and MySQL 8) candidates are selected with
+  ``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent runners skip each
+  other's rows. Every dialect then claims a run with a compare-and-set
+  ``UPDATE`` on its ``attempts`` counter, which on SQLite (one writer at a
+  time, no row locks) is what keeps two runners from claiming one run.
+- A run whose lease expires (its runner died) is claimed again by any
+  runner; after ``max_attempts`` claims it fails.
+- A run that fails with a transient error goes back to ``pending`` and is
+  retried after an exponential backoff; a ValueError (missing source, no
+  rules, no data) fails it at once, since retrying cannot help.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from api.config import settings
+from api.models.database import DQRun, DataSource
+
+
+def claim(db: Session, owner: str, slots: int, limits: Optional[dict[str, int]] = None) -> list[tuple[str, str]]:
+    """Claim up to ``slots`` runnable runs for ``owner``, oldest first, and commit.
+
+    Args:
+        db: Database session.
+        owner: Lease owner recorded on the claimed runs.
+        slots: Maximum number of runs to claim.
+        limits: Maximum number of runs to claim per source type; types not
+            listed are only limited by ``slots``.
+
+    Returns:
+        ``(run_id, source_type)`` of each claimed run, now ``running``.
+    """
+    if slots <= 0:
+        return []
+    limits = dict(limits or {})
+    now = _now()
+    query = (
+        db.query(DQRun.id, DQRun.attempts, DQRun.status, DataSource.type)
+        .outerjoin(DataSource, DQRun.source_id == DataSource.id)
+        .filter(_claimable(now))
+        .order_by(DQRun.available_at, DQRun.id)
+    )
+    saturated = [source_type for source_type, limit in limits.items() if limit <= 0]
+    if saturated:
+        query = query.filter(or_(DataSource.type.is_(None), DataSource.type.notin_(saturated)))
+    candidates = query.limit(slots * 4).with_for_update(skip_locked=True, of=DQRun).all()
+
+    claimed: list[tuple[str, str]] = []
+    for run_id, attempts, status, source_type in candidates:
+        source_type = source_type or ""
+        if len(claimed) >= slots or limits.get(source_type, slots) <= 0:
+            continue
+        if status == "running" and attempts >= settings.job_max_attempts:
+            _compare_and_set(db, run_id, attempts, now, {
+                "status": "failed",
+                "completed_at": now,
+                "error_message": "Job worker lost (lease expired)",
+                "lease_owner": None,
+                "lease_expires_at": None,
+            })
+            continue
+        if _compare_and_set(db, run_id, attempts, now, {
+            "status": "running",
+            "started_at": now,
+            "attempts": attempts + 1,
+            "lease_owner": owner,
+            "lease_expires_at": now + timedelta(seconds=settings.job_lease_seconds),
+        }):
+            claimed.append((run_id, source_type))
+            if source_type in limits:
+                limits[source_type] -= 1
+    db.commit()
+    return claimed
+
+
+def heartbeat(db: Session, run_id: str, owner: str) -> bool:
+    """Extend ``owner``'s lease on a running run; False if the lease was lost."""
+    renewed = db.execute(
+        update(DQRun)
+        .where(DQRun.id == run_id, DQRun.lease_owner == owner, DQRun.status == "running")
+        .values(lease_expires_at=_now() + timedelta(seconds=settings.job_lease_seconds))
+    ).rowcount
+    db.commit()
+    return renewed == 1
+
+
+def holds_lease(db: Session, run_id: str, owner: str) -> bool:
+    """Whether ``owner`` still holds the run's lease, locking the run until the transaction ends."""
+    query = db.query(DQRun.id).filter(DQRun.id == run_id, DQRun.lease_owner == owner, DQRun.status == "running")
+    return query.with_for_update().first() is not None
+
+
+def release(db: Session, run_id: str, owner: Optional[str], error: str, retry: bool = True) -> Optional[str]:
+    """Give up ``owner``'s claim on a failed run: queue it for another attempt, or fail it.
+
+    Args:
+        db: Database session.
+        run_id: ID of the run.
+        owner: Lease owner; None releases the run whoever holds it.
+        error: Error message recorded on the run.
+        retry: Whether the failure is transient. The run is retried after
+            ``job_retry_backoff_seconds * 2 ** (attempts - 1)`` unless it
+            has used its ``job_max_attempts``.
+
+    Returns:
+        The run's new status, or None if ``owner`` no longer held it.
+    """
+    query = db.query(DQRun).filter(DQRun.id == run_id, DQRun.status.in_(("pending", "running")))
+    if owner is not None:
+        query = query.filter(DQRun.lease_owner == owner)
+    run = query.with_for_update().first()
+    if run is None:
+        db.rollback()
+        return None
+    now = _now()
+    run.error_message = error
+    run.lease_owner = run.lease_expires_at = None
+    if retry and (run.attempts or 0) < settings.job_max_attempts:
+        run.status = "pending"
+        run.available_at = now + timedelta(seconds=settings.job_retry_backoff_seconds * 2 ** max(0, run.attempts - 1))
+    else:
+        run.status = "failed"
+        run.completed_at = now
+    db.commit()
+    return run.status
+
+
+def _claimable(now: datetime):
+    """Pending runs that are due, and running runs whose lease expired (runs from before leases have none)."""
+    return or_(
+        and_(DQRun.status == "pending", or_(DQRun.available_at.is_(None), DQRun.available_at <= now)),
+        and_(DQRun.status == "running", or_(DQRun.lease_expires_at.is_(None), DQRun.lease_expires_at < now)),
+    )
+
+
+def _compare_and_set(db: Session, run_id: str, seen_attempts: int, now: datetime, values: dict) -> bool:
+    """Update a claimable run only if no one claimed it since it was read (its attempts are unchanged)."""
+    statement = (
+        update(DQRun)
+        .where(DQRun.id == run_id, DQRun.attempts == seen_attempts, _claimable(now))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(statement).rowcount == 1
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
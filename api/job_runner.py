@@ -0,0 +1,194 @@
+"""Background execution of queued DQ jobs.
+
+``POST /api/jobs`` records a ``pending`` run in the job queue (the
+``dq_runs`` table, see ``api.job_queue``) and returns. Every API process
+runs a :class:`JobRunner`, whose dispatcher thread claims queued runs and
+executes them in a bounded pool of worker processes (checks are
+CPU-bound) in submission order. Each source type can be given a lower
+concurrency limit than the pool size, e.g. to keep a handful of Spark or
+warehouse jobs from occupying every worker; runs of a saturated source
+type wait while later runs of other types start.
+
+Because the queue is the database, runs survive restarts: runs still
+pending are claimed by the next runner to start, and runs whose runner
+died are claimed again once their lease expires.
+"""
+
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import uuid
+from collections import Counter
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Optional
+
+from api import job_queue
+from api.config import settings
+from api.dependencies import SessionLocal
+from api.execution import run_job
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """Claims queued runs and executes them, at most ``concurrency[source_type]`` at a time per source type.
+
+    Args:
+        max_workers: Maximum number of runs executing at once.
+        concurrency: Maximum concurrent runs per source type; types not
+            listed may use every worker.
+        executor: "process" (default) runs jobs in worker processes,
+            "thread" in threads of the API process.
+        poll_seconds: How often to look for runs queued by other processes,
+            retries that became due and expired leases.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        concurrency: Optional[dict[str, int]] = None,
+        executor: str = "process",
+        poll_seconds: float = 2.0,
+    ):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown job executor: {executor}")
+        self.max_workers = max(1, max_workers)
+        self.concurrency = dict(concurrency or {})
+        self.executor = executor
+        self.poll_seconds = poll_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._pool: Optional[Executor] = None
+        self._running: Counter = Counter()  # source type -> executing runs
+        self._drained = False  # the last claim found nothing runnable
+        self._generation = 0  # bumped by notify(); a claim only proves the queue drained if none came since
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._state = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the dispatcher thread (idempotent)."""
+        with self._state:
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name="dq-job-dispatcher", daemon=True)
+                self._dispatcher.start()
+
+    def notify(self) -> None:
+        """Look for runnable runs now, e.g. after queueing one."""
+        with self._state:
+            self._generation += 1
+            self._drained = False
+        self._wake.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is executing here and no queued run is due; False if ``timeout`` expired first.
+
+        Runs waiting for a retry backoff are not waited for.
+        """
+        self.notify()
+        with self._state:
+            return self._state.wait_for(lambda: self._drained and not sum(self._running.values()), timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop claiming runs and stop the worker pool.
+
+        With ``wait`` False, claimed runs no worker has started are
+        cancelled; their leases expire and a runner claims them again.
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        with self._state:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _dispatch_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.clear()
+            try:
+                self._dispatch()
+            except Exception:  # e.g. the database is unavailable: try again at the next poll
+                logger.exception("Failed to claim queued DQ jobs")
+            self._wake.wait(self.poll_seconds)
+
+    def _dispatch(self) -> None:
+        """Claim as many runs as free workers and source type limits allow, and start them."""
+        with self._state:
+            generation = self._generation
+            free = self.max_workers - sum(self._running.values())
+            limits = {kind: limit - self._running[kind] for kind, limit in self.concurrency.items()}
+        db = SessionLocal()
+        try:
+            claimed = job_queue.claim(db, self.owner, free, limits)
+        finally:
+            db.close()
+        with self._state:
+            self._running.update(source_type for _, source_type in claimed)
+            self._drained = free > 0 and not claimed and generation == self._generation
+            if self._drained:
+                self._state.notify_all()
+            pool = self._get_pool() if claimed else None
+        for run_id, source_type in claimed:
+            try:
+                future = pool.submit(run_job, run_id, self.owner)
+            except (BrokenProcessPool, RuntimeError) as e:  # the pool died or was shut down
+                future = Future()
+                future.set_exception(e)
+            future.add_done_callback(partial(self._finished, run_id, source_type))
+
+    def _finished(self, run_id: str, source_type: str, future: Future) -> None:
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            # The worker died (or the run vanished): queue the run for another attempt
+            db = SessionLocal()
+            try:
+                job_queue.release(db, run_id, self.owner, f"Job worker failed: {error}")
+            except Exception:
+                logger.exception("Failed to release DQ job %s", run_id)  # its lease will expire instead
+            finally:
+                db.close()
+        with self._state:
+            self._running[source_type] -= 1
+            if isinstance(error, BrokenProcessPool):
+                self._pool = None  # replaced on the next dispatch
+        self.notify()
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.executor == "thread":
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="dq-job")
+            else:
+                # Spawned workers start without the API's threads, sockets and database connections
+                self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """The application's job runner, configured from settings and started on first use."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner(
+                settings.job_workers, settings.job_concurrency, settings.job_executor, settings.job_poll_seconds
+            )
+            _runner.start()
+        return _runner
+
+
+def shutdown_job_runner(wait: bool = True) -> None:
+    """Stop the application's job runner, if it was started."""
+    global _runner
+    with _runner_lock:
+        runner, _runner = _runner, None
+    if runner is not None:
+        runner.shutdown(wait=wait)
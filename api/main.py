@@ -8,6 +8,8 @@ from sqlalchemy import text
 
 from api.config import settings
 from api.dependencies import engine
+from api.job_runner import get_job_runner, shutdown_job_runner
+from api.migrations import upgrade_schema
 from api.models.database import Base
 from api.routers import jobs, metrics, rules, sources
 
@@ -15,10 +17,14 @@ from api.routers import jobs, metrics, rules, sources
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown."""
-    # Startup: Create database tables
+    # Startup: Create database tables, and add columns new since an existing database was created
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    # Start claiming queued jobs, including any left pending or orphaned by a previous process
+    get_job_runner()
     yield
-    # Shutdown: Add any cleanup here if needed
+    # Shutdown: stop the job workers; unfinished runs are claimed again once their leases expire
+    shutdown_job_runner(wait=False)
 
 
 app = FastAPI(
@@ -0,0 +1,89 @@
+"""Schema upgrades for databases created by earlier versions.
+
+``Base.metadata.create_all`` creates missing tables and indexes but never
+alters a table that already exists, so columns added to existing models
+since a database was created are added here. :func:`upgrade_schema` runs
+right after ``create_all`` wherever the application starts (the API, the
+scheduler and the seed script); run it on its own with
+``python -m api.migrations`` (``make migrate``) before starting several
+processes against an upgraded database. Every step checks the live schema
+first, so running it again changes nothing.
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import Column, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from api.models.database import Base, DQRun, Schedule
+
+logger = logging.getLogger(__name__)
+
+# Columns added to existing tables, with the SQL value for rows written before them (None leaves them NULL)
+ADDED_COLUMNS: tuple[tuple[Column, Optional[str]], ...] = (
+    # Job queue leases (api.job_queue): existing runs have never been claimed
+    (DQRun.__table__.c.attempts, "0"),
+    (DQRun.__table__.c.available_at, None),  # NULL: due now
+    (DQRun.__table__.c.lease_owner, None),
+    (DQRun.__table__.c.lease_expires_at, None),
+    # Submission time, for listing jobs: runs from before it were queued no later than they started
+    (DQRun.__table__.c.created_at, "COALESCE(started_at, completed_at)"),
+    # Incremental scheduler refreshes (api.scheduler): the first refresh loads every schedule anyway
+    (Schedule.__table__.c.updated_at, "created_at"),
+)
+
+
+def upgrade_schema(engine: Engine) -> list[str]:
+    """Add the missing columns (filling in existing rows) and indexes to existing tables.
+
+    Args:
+        engine: Engine of the application database, after ``create_all``.
+
+    Returns:
+        ``table.column`` of each column added.
+    """
+    added = []
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        existing: dict[str, set[str]] = {}
+        for column, backfill in ADDED_COLUMNS:
+            table = column.table.name
+            if table not in existing:
+                existing[table] = {c["name"] for c in inspector.get_columns(table)}
+            if column.name not in existing[table]:
+                _add_column(conn, column, backfill)
+                added.append(f"{table}.{column.name}")
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+    if added:
+        logger.info("Added columns %s", ", ".join(added))
+    return added
+
+
+def _add_column(conn: Connection, column: Column, backfill: Optional[str]) -> None:
+    """``ALTER TABLE ... ADD`` a model column; a NOT NULL column gets its backfill as the default."""
+    dialect = conn.dialect
+    quote = dialect.identifier_preparer
+    table, name = quote.format_table(column.table), quote.format_column(column)
+    definition = f"{name} {column.type.compile(dialect=dialect)}"
+    if not column.nullable:
+        definition += f" DEFAULT {backfill} NOT NULL"  # fills the existing rows
+    add = "ADD" if dialect.name == "mssql" else "ADD COLUMN"
+    conn.execute(text(f"ALTER TABLE {table} {add} {definition}"))
+    if column.nullable and backfill is not None:
+        conn.execute(text(f"UPDATE {table} SET {name} = {backfill}"))
+
+
+def main() -> None:
+    """Create missing tables and upgrade existing ones."""
+    from api.dependencies import engine
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+
+if __name__ == "__main__":
+    main()
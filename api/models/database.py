@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import DeclarativeBase, relationship
 
 
@@ -74,6 +74,18 @@ class DQRun(Base):
     failed_rules: int = Column(Integer, default=0)
     error_message: str = Column(Text, nullable=True)
     parameters: str = Column(Text, nullable=True)  # JSON
+    created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))  # when it was queued
+    # Job queue (see api.job_queue): claims so far, earliest next claim, and the current claim's lease
+    attempts: int = Column(Integer, nullable=False, default=0)
+    available_at: datetime = Column(DateTime, nullable=True, default=lambda: datetime.now(timezone.utc))
+    lease_owner: str = Column(String(128), nullable=True)
+    lease_expires_at: datetime = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_dq_runs_queue", "status", "available_at"),
+        Index("ix_dq_runs_source_completed", "source_id", "completed_at"),
+        Index("ix_dq_runs_created_at", "created_at"),
+    )
 
     source = relationship("DataSource", back_populates="runs")
     results = relationship("DQResult", back_populates="run")
@@ -114,6 +126,12 @@ class DQScore(Base):
     passed_checks: int = Column(Integer, default=0)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
+    # The metrics endpoints average scores per dimension, overall and per source, from these indexes alone
+    __table_args__ = (
+        Index("ix_dq_scores_dimension_score", "dimension", "score"),
+        Index("ix_dq_scores_source_dimension_score", "source_id", "dimension", "score"),
+    )
+
     run = relationship("DQRun", back_populates="scores")
     source = relationship("DataSource", back_populates="scores")
 
@@ -132,3 +150,9 @@ class Schedule(Base):
     last_run_at: datetime = Column(DateTime, nullable=True)
     next_run_at: datetime = Column(DateTime, nullable=True)
     created_at: datetime = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Lets the scheduler (api.scheduler) load only the schedules changed since it last looked
+    updated_at: datetime = Column(
+        DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (Index("ix_schedules_updated_at", "updated_at"),)
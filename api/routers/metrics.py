@@ -1,7 +1,14 @@
-"""Endpoints for DQ metrics and scores."""
+"""Endpoints for DQ metrics and scores.
+
+Runs store one DQScore per dimension when they complete; the endpoints
+aggregate those rows in the database with ``GROUP BY`` rather than
+loading the score history.
+"""
+
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
 from api.dependencies import get_db
@@ -10,36 +17,22 @@ from api.schemas.metrics import DimensionScore, MetricsSummary, SourceMetrics
 
 router = APIRouter(prefix="/api/metrics", tags=["metrics"])
 
+PASSING_SCORE = 80.0  # a run's dimension score at or above this counts as passed
+
 
 @router.get("/summary", response_model=MetricsSummary)
 def get_summary(db: Session = Depends(get_db)) -> dict:
     """Get overall DQ metrics summary across all sources."""
-    scores = db.query(DQScore).all()
-    if not scores:
+    dimensions = _dimension_scores(db)
+    if not dimensions:
         return {"overall_score": 0.0, "dimensions": [], "total_runs": 0, "last_run_at": None}
 
-    dim_groups: dict[str, list[float]] = {}
-    for s in scores:
-        dim_groups.setdefault(s.dimension, []).append(s.score)
-
-    dimensions = [
-        DimensionScore(
-            dimension=dim,
-            score=round(sum(vals) / len(vals), 2),
-            total_checks=len(vals),
-            passed_checks=sum(1 for v in vals if v >= 80.0),
-        )
-        for dim, vals in dim_groups.items()
-    ]
-
-    overall = round(sum(d.score for d in dimensions) / len(dimensions), 2) if dimensions else 0.0
-    total_runs = db.query(func.count(DQRun.id)).scalar() or 0
-    last_run = db.query(func.max(DQRun.completed_at)).scalar()
+    total_runs, last_run = db.query(func.count(DQRun.id), func.max(DQRun.completed_at)).one()
 
     return {
-        "overall_score": overall,
+        "overall_score": _overall(dimensions),
         "dimensions": dimensions,
-        "total_runs": total_runs,
+        "total_runs": total_runs or 0,
         "last_run_at": last_run,
     }
 
@@ -47,20 +40,7 @@ def get_summary(db: Session = Depends(get_db)) -> dict:
 @router.get("/dimensions")
 def get_dimension_scores(db: Session = Depends(get_db)) -> list[DimensionScore]:
     """Get per-dimension DQ scores."""
-    scores = db.query(DQScore).all()
-    dim_groups: dict[str, list[float]] = {}
-    for s in scores:
-        dim_groups.setdefault(s.dimension, []).append(s.score)
-
-    return [
-        DimensionScore(
-            dimension=dim,
-            score=round(sum(vals) / len(vals), 2),
-            total_checks=len(vals),
-            passed_checks=sum(1 for v in vals if v >= 80.0),
-        )
-        for dim, vals in dim_groups.items()
-    ]
+    return _dimension_scores(db)
 
 
 @router.get("/sources/{source_id}", response_model=SourceMetrics)
@@ -70,30 +50,41 @@ def get_source_metrics(source_id: str, db: Session = Depends(get_db)) -> dict:
     if not source:
         raise HTTPException(status_code=404, detail="Source not found")
 
-    scores = db.query(DQScore).filter(DQScore.source_id == source_id).all()
-    dim_groups: dict[str, list[float]] = {}
-    for s in scores:
-        dim_groups.setdefault(s.dimension, []).append(s.score)
-
-    dimensions = [
-        DimensionScore(
-            dimension=dim,
-            score=round(sum(vals) / len(vals), 2),
-            total_checks=len(vals),
-            passed_checks=sum(1 for v in vals if v >= 80.0),
-        )
-        for dim, vals in dim_groups.items()
-    ]
-
-    overall = round(sum(d.score for d in dimensions) / len(dimensions), 2) if dimensions else 0.0
-    run_count = db.query(func.count(DQRun.id)).filter(DQRun.source_id == source_id).scalar() or 0
-    last_run = db.query(func.max(DQRun.completed_at)).filter(DQRun.source_id == source_id).scalar()
+    dimensions = _dimension_scores(db, source_id)
+    run_count, last_run = (
+        db.query(func.count(DQRun.id), func.max(DQRun.completed_at)).filter(DQRun.source_id == source_id).one()
+    )
 
     return {
         "source_id": source_id,
         "source_name": source.name,
-        "overall_score": overall,
+        "overall_score": _overall(dimensions),
         "dimensions": dimensions,
         "last_run_at": last_run,
-        "run_count": run_count,
+        "run_count": run_count or 0,
     }
+
+
+def _dimension_scores(db: Session, source_id: Optional[str] = None) -> list[DimensionScore]:
+    """Mean score, number of scored runs and number of passing runs per dimension."""
+    query = db.query(
+        DQScore.dimension,
+        func.avg(DQScore.score),
+        func.count(DQScore.score),
+        func.sum(case((DQScore.score >= PASSING_SCORE, 1), else_=0)),
+    )
+    if source_id is not None:
+        query = query.filter(DQScore.source_id == source_id)
+    return [
+        DimensionScore(
+            dimension=dimension,
+            score=round(float(score), 2),
+            total_checks=total,
+            passed_checks=int(passed or 0),
+        )
+        for dimension, score, total, passed in query.group_by(DQScore.dimension).order_by(DQScore.dimension)
+    ]
+
+
+def _overall(dimensions: list[DimensionScore]) -> float:
+    return round(sum(d.score for d in dimensions) / len(dimensions), 2) if dimensions else 0.0
@@ -8,8 +8,9 @@ from sqlalchemy.orm import Session
 
 from api.dependencies import get_db
 from api.models.database import DataSource, gen_uuid
-from api.schemas.sources import SourceCreate, SourceListResponse, SourceResponse, SourceUpdate
+from api.schemas.sources import ProfileRequest, SourceCreate, SourceListResponse, SourceResponse, SourceUpdate
 from connectors import get_connector
+from engine.table_profile import profile_table
 
 router = APIRouter(prefix="/api/sources", tags=["sources"])
 
@@ -95,7 +96,9 @@ def test_connection(source_id: str, db: Session = Depends(get_db)) -> dict:
         connector = connector_class()
 
         # Parse connection config from JSON string
-        connection_config = json.loads(source.connection_config) if isinstance(source.connection_config, str) else source.connection_config
+        connection_config = source.connection_config
+        if isinstance(connection_config, str):
+            connection_config = json.loads(connection_config)
 
         # Try to connect and test
         connector.connect(connection_config)
@@ -116,3 +119,29 @@ def test_connection(source_id: str, db: Session = Depends(get_db)) -> dict:
     except Exception as e:
         # Connection or other errors
         return {"success": False, "error": f"Connection failed: {str(e)}"}
+
+
+@router.post("/{source_id}/profile")
+def profile_source_table(source_id: str, request: ProfileRequest, db: Session = Depends(get_db)) -> dict:
+    """Profile every column (or the requested ones) of a source table in one scan."""
+    source = db.query(DataSource).filter(DataSource.id == source_id).first()
+    if not source:
+        raise HTTPException(status_code=404, detail="Data source not found")
+
+    try:
+        connector = get_connector(source.type)()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    connection_config = source.connection_config
+    if isinstance(connection_config, str):
+        connection_config = json.loads(connection_config)
+    try:
+        connector.connect(connection_config)
+        batches = connector.read_data_iterator(request.table_name, limit=request.limit, columns=request.columns)
+        columns = profile_table(batches, request.columns, workers=request.workers)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Profiling failed: {str(e)}")
+    finally:
+        if hasattr(connector, 'close'):
+            connector.close()
+    return {"source_id": source_id, "table_name": request.table_name, "columns": columns}
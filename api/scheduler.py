@@ -0,0 +1,272 @@
+"""Cron scheduling of DQ runs.
+
+The scheduler (``python -m api.scheduler``) queues a ``pending`` run (see
+``api.job_queue``) for every schedule whose cron expression comes due.
+Rather than polling every schedule, it keeps the active schedules in a
+min-heap ordered by their next run time and sleeps until the earliest one
+is due; every ``scheduler_refresh_seconds`` it loads only the schedules
+changed since it last looked (by ``updated_at``).
+
+- Each schedule fires up to ``scheduler_jitter_seconds`` after its cron
+  time, by a fixed per-schedule offset, so schedules sharing an
+  expression (``0 * * * *``) do not all queue their runs at once.
+- A schedule whose source already has ``scheduler_max_queued_per_source``
+  runs pending or running is deferred rather than piling up more runs.
+- After downtime, a schedule that missed one or more cron times queues a
+  single catch-up run, then resumes at its next cron time.
+
+A schedule fires by advancing its ``next_run_at`` with a compare-and-set
+``UPDATE`` in the same transaction that queues the run, so several
+schedulers can run side by side without queueing a run twice.
+"""
+
+import hashlib
+import heapq
+import json
+import logging
+import signal
+import threading
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from api.config import settings
+from api.cron import CronExpression, parse_cron
+from api.dependencies import SessionLocal, engine
+from api.migrations import upgrade_schema
+from api.models.database import Base, DQRun, Schedule, gen_uuid
+
+logger = logging.getLogger(__name__)
+
+# Schedules changed up to this long before the last refresh are loaded again, in case their
+# transaction committed late or the writer's clock is behind ours
+_REFRESH_OVERLAP = timedelta(minutes=1)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    """An active schedule as the scheduler tracks it."""
+
+    schedule_id: str
+    source_id: str
+    rule_ids: Optional[list[str]]
+    cron: CronExpression
+    next_run_at: datetime  # cron time of the next run
+    stored: Optional[datetime]  # next_run_at as the row holds it, for the compare-and-set
+    fire_at: datetime  # when to queue the run: next_run_at plus jitter, or later if deferred
+
+
+class Scheduler:
+    """Queues runs for due schedules.
+
+    Args:
+        jitter_seconds: Maximum delay after a cron time before its run is
+            queued (at most a quarter of the schedule's period).
+        max_queued_per_source: Maximum pending and running runs per source;
+            schedules of a source at the limit are deferred.
+        refresh_seconds: How often to load changed schedules, and how long
+            a deferred schedule waits before trying again.
+    """
+
+    def __init__(self, jitter_seconds: float = 60.0, max_queued_per_source: int = 2, refresh_seconds: float = 60.0):
+        self.jitter_seconds = jitter_seconds
+        self.max_queued_per_source = max_queued_per_source
+        self.refresh_seconds = refresh_seconds
+        self._heap: list[tuple[datetime, str]] = []  # (fire_at, schedule id); stale if it no longer matches _entries
+        self._entries: dict[str, _Entry] = {}
+        self._refreshed_at: Optional[datetime] = None
+
+    def refresh(self, db: Session, now: Optional[datetime] = None) -> None:
+        """Load the schedules created or changed since the last refresh (all of them the first time)."""
+        now = now or _now()
+        query = db.query(Schedule)
+        if self._refreshed_at is not None:
+            query = query.filter(Schedule.updated_at >= self._refreshed_at - _REFRESH_OVERLAP)
+        for schedule in query.all():
+            self._load(db, schedule, now)
+        db.commit()
+        self._refreshed_at = now
+
+    def next_fire_at(self) -> Optional[datetime]:
+        """When the earliest schedule is due, or None if there are no active schedules."""
+        while self._heap:
+            fire_at, schedule_id = self._heap[0]
+            entry = self._entries.get(schedule_id)
+            if entry is not None and entry.fire_at == fire_at:
+                return fire_at
+            heapq.heappop(self._heap)
+        return None
+
+    def run_due(self, db: Session, now: Optional[datetime] = None) -> list[str]:
+        """Queue a run for every due schedule, and commit.
+
+        Returns:
+            IDs of the queued runs.
+        """
+        now = now or _now()
+        due: list[_Entry] = []
+        while (fire_at := self.next_fire_at()) is not None and fire_at <= now:
+            due.append(self._entries[heapq.heappop(self._heap)[1]])
+        if not due:
+            return []
+
+        try:
+            return self._enqueue(db, due, now)
+        except Exception:
+            db.rollback()
+            for entry in due:  # as they were before the rolled back transaction
+                self._track(entry)
+            raise
+
+    def run(self, stop: threading.Event) -> None:
+        """Refresh schedules and queue due runs until ``stop`` is set."""
+        next_refresh = _now()
+        while not stop.is_set():
+            now = _now()
+            db = SessionLocal()
+            try:
+                if now >= next_refresh:
+                    next_refresh = now + timedelta(seconds=self.refresh_seconds)
+                    self.refresh(db, now)
+                run_ids = self.run_due(db, now)
+                if run_ids:
+                    logger.info("Queued %d scheduled DQ runs", len(run_ids))
+            except Exception:  # e.g. the database is unavailable: try again at the next refresh
+                logger.exception("Failed to queue scheduled DQ runs")
+                db.rollback()
+            finally:
+                db.close()
+            fire_at = self.next_fire_at()
+            wake = next_refresh if fire_at is None else min(fire_at, next_refresh)
+            stop.wait(max(0.0, (wake - _now()).total_seconds()))
+
+    def _enqueue(self, db: Session, due: list[_Entry], now: datetime) -> list[str]:
+        """Queue runs for schedules taken off the heap, deferring those whose source is saturated."""
+        queued = self._queued_runs(db, {entry.source_id for entry in due})
+        run_ids = []
+        for entry in due:
+            if queued[entry.source_id] >= self.max_queued_per_source:
+                self._track(replace(entry, fire_at=now + timedelta(seconds=self.refresh_seconds)))
+                continue
+            # Missed cron times (the scheduler was down) collapse into this one run
+            following = entry.cron.next_after(max(entry.next_run_at, now))
+            advanced = db.execute(
+                update(Schedule)
+                .where(Schedule.id == entry.schedule_id, Schedule.next_run_at == entry.stored)
+                .values(next_run_at=following, last_run_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if advanced != 1:
+                # Changed, deleted or fired by another scheduler since we loaded it
+                schedule = db.query(Schedule).filter(Schedule.id == entry.schedule_id).populate_existing().first()
+                if schedule is None:
+                    self._entries.pop(entry.schedule_id, None)
+                else:
+                    self._load(db, schedule, now)
+                continue
+            parameters = {"schedule_id": entry.schedule_id, "scheduled_for": entry.next_run_at.isoformat()}
+            if entry.rule_ids:
+                parameters["rule_ids"] = entry.rule_ids
+            run_id = gen_uuid()
+            db.add(DQRun(id=run_id, source_id=entry.source_id, status="pending", parameters=json.dumps(parameters)))
+            queued[entry.source_id] += 1
+            run_ids.append(run_id)
+            self._track(self._entry(entry.schedule_id, entry.source_id, entry.rule_ids, entry.cron, following))
+        db.commit()
+        return run_ids
+
+    def _load(self, db: Session, schedule: Schedule, now: datetime) -> None:
+        """Track a schedule as the row describes it, or stop tracking it if it cannot run."""
+        current = self._entries.pop(schedule.id, None)
+        if not schedule.is_active or not schedule.source_id:
+            return
+        try:
+            cron = parse_cron(schedule.cron_expression or "")
+            rule_ids = json.loads(schedule.rule_ids) if schedule.rule_ids else None
+            next_run_at = _aware(schedule.next_run_at)
+            if next_run_at is None:
+                # First sight of a new schedule: it runs at its next cron time, not now
+                next_run_at = cron.next_after(now)
+                db.execute(
+                    update(Schedule)
+                    .where(Schedule.id == schedule.id, Schedule.next_run_at.is_(None))
+                    .values(next_run_at=next_run_at)
+                    .execution_options(synchronize_session=False)
+                )
+                stored = next_run_at
+            else:
+                stored = schedule.next_run_at
+        except ValueError as e:
+            logger.warning("Skipping schedule %s: %s", schedule.id, e)
+            return
+        if current is not None and (current.source_id, current.rule_ids, current.next_run_at) == (
+            schedule.source_id, rule_ids, next_run_at
+        ) and current.cron is cron:  # parse_cron caches, so an unchanged expression is the same object
+            self._entries[schedule.id] = current  # unchanged (e.g. we just fired it): keep any deferral
+            return
+        self._track(self._entry(schedule.id, schedule.source_id, rule_ids, cron, next_run_at, stored))
+
+    def _entry(
+        self,
+        schedule_id: str,
+        source_id: str,
+        rule_ids: Optional[list[str]],
+        cron: CronExpression,
+        next_run_at: datetime,
+        stored: Optional[datetime] = None,
+    ) -> _Entry:
+        # A fixed fraction of the jitter per schedule spreads a shared cron time evenly across schedulers
+        fraction = int(hashlib.sha1(schedule_id.encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+        period = (cron.next_after(next_run_at) - next_run_at).total_seconds()
+        jitter = timedelta(seconds=fraction * min(self.jitter_seconds, period / 4))
+        return _Entry(
+            schedule_id, source_id, rule_ids, cron, next_run_at, next_run_at if stored is None else stored,
+            next_run_at + jitter,
+        )
+
+    def _track(self, entry: _Entry) -> None:
+        self._entries[entry.schedule_id] = entry
+        heapq.heappush(self._heap, (entry.fire_at, entry.schedule_id))
+
+    @staticmethod
+    def _queued_runs(db: Session, source_ids: set[str]) -> Counter:
+        """Pending and running runs per source."""
+        rows = (
+            db.query(DQRun.source_id, func.count())
+            .filter(DQRun.source_id.in_(source_ids), DQRun.status.in_(("pending", "running")))
+            .group_by(DQRun.source_id)
+            .all()
+        )
+        return Counter(dict(rows))
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """Read a stored UTC time (databases may drop the time zone)."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def main() -> None:
+    """Run the scheduler until interrupted."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    Scheduler(
+        settings.scheduler_jitter_seconds, settings.scheduler_max_queued_per_source, settings.scheduler_refresh_seconds
+    ).run(stop)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,12 +20,14 @@ class JobResponse(BaseModel):
     id: str
     source_id: Optional[str] = None
     status: str
+    created_at: Optional[datetime] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     total_rules: int = 0
     passed_rules: int = 0
     failed_rules: int = 0
     error_message: Optional[str] = None
+    attempts: int = 0
 
     model_config = {"from_attributes": True}
 
@@ -1,17 +1,20 @@
 """Pydantic schemas for DQ rules."""
 
+import json
 from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, Field, field_validator, model_validator, ValidationInfo
 
+DIMENSION_PATTERN = "^(completeness|uniqueness|accuracy|consistency|timeliness|validity|referential_integrity)$"
+
 
 class RuleCreate(BaseModel):
     """Schema for creating a new rule."""
 
     name: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
-    dimension: str = Field(..., pattern="^(completeness|uniqueness|accuracy|consistency|timeliness|validity)$")
+    dimension: str = Field(..., pattern=DIMENSION_PATTERN)
     source_id: Optional[str] = None
     column_name: Optional[str] = None
     operator: Optional[str] = None
@@ -39,7 +42,7 @@ class RuleCreate(BaseModel):
 
         # Get dimension from values dict (it's validated before threshold)
         dimension = info.data.get('dimension') if info.data else None
-        if dimension in {'completeness', 'uniqueness', 'validity'}:
+        if dimension in {'completeness', 'uniqueness', 'validity', 'referential_integrity'}:
             if not (0 <= v <= 100):
                 raise ValueError(f'threshold for {dimension} dimension must be between 0 and 100')
 
@@ -51,7 +54,7 @@ class RuleUpdate(BaseModel):
 
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
-    dimension: Optional[str] = Field(None, pattern="^(completeness|uniqueness|accuracy|consistency|timeliness|validity)$")
+    dimension: Optional[str] = Field(None, pattern=DIMENSION_PATTERN)
     column_name: Optional[str] = None
     operator: Optional[str] = None
     threshold: Optional[float] = None
@@ -79,7 +82,7 @@ class RuleUpdate(BaseModel):
 
         # Get dimension from values dict (it's validated before threshold)
         dimension = info.data.get('dimension') if info.data else None
-        if dimension in {'completeness', 'uniqueness', 'validity'}:
+        if dimension in {'completeness', 'uniqueness', 'validity', 'referential_integrity'}:
             if not (0 <= v <= 100):
                 raise ValueError(f'threshold for {dimension} dimension must be between 0 and 100')
 
@@ -105,6 +108,13 @@ class RuleResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @field_validator("config", mode="before")
+    @classmethod
+    def parse_config(cls, v: Optional[str | dict]) -> Optional[dict]:
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
 
 class RuleListResponse(BaseModel):
     """Paginated rule list response."""
@@ -51,3 +51,12 @@ class SourceListResponse(BaseModel):
 
     items: list[SourceResponse]
     total: int
+
+
+class ProfileRequest(BaseModel):
+    """Schema for profiling a table of a data source."""
+
+    table_name: str = Field(..., min_length=1)
+    columns: Optional[list[str]] = None
+    limit: Optional[int] = Field(None, ge=1)
+    workers: int = Field(1, ge=1)
@@ -1,7 +1,7 @@
 """Data source connectors."""
 
 from connectors.adls_gen2 import ADLSGen2Connector
-from connectors.base import DataConnector
+from connectors.base import DataConnector, SQLPushdownMixin
 from connectors.bigquery import BigQueryConnector
 from connectors.delta_table import DeltaTableConnector
 from connectors.glue_catalog import GlueCatalogConnector
@@ -14,6 +14,7 @@ from connectors.sqlite import SQLiteConnector
 
 __all__ = [
     "DataConnector",
+    "SQLPushdownMixin",
     "ADLSGen2Connector",
     "BigQueryConnector",
     "DeltaTableConnector",
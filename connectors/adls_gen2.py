@@ -1,7 +1,7 @@
 """ADLS Gen2 data source connector."""
 
 import json
-from typing import Optional
+from typing import Any, Optional
 
 from connectors.base import DataConnector
 
@@ -82,6 +82,15 @@ class ADLSGen2Connector(DataConnector):
             data = data[:limit]
         return data
 
+    def max_timestamp(self, path: str, column: Optional[str]) -> Optional[Any]:
+        """The file's last-modified time (only for a rule without a column)."""
+        if not self._client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        if column is not None:
+            return None
+        fs_client = self._client.get_file_system_client(self._container)
+        return fs_client.get_file_client(path).get_file_properties().last_modified
+
     def list_tables(self) -> list[str]:
         """List files in the configured container."""
         if not self._client:
@@ -1,11 +1,22 @@
 """Abstract base class for data source connectors."""
 
+import json
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Iterator, Optional
+
+from engine.dataset import ColumnarDataset
+from engine.pushdown import DIALECTS, quote_identifier
 
 
 class DataConnector(ABC):
-    """Abstract interface for all data source connectors."""
+    """Abstract interface for all data source connectors.
+
+    Relational connectors also derive from :class:`SQLPushdownMixin`, which
+    sets ``pushdown_dialect``: callers push rule metrics down to the source
+    database only for connectors whose ``pushdown_dialect`` is set.
+    """
+
+    pushdown_dialect: Optional[str] = None
 
     @abstractmethod
     def connect(self, config: dict) -> None:
@@ -33,6 +44,63 @@ class DataConnector(ABC):
         """
         ...
 
+    def read_data_iterator(
+        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
+    ) -> Iterator[list[dict]]:
+        """Yield the data as batches of row dicts.
+
+        The default yields :meth:`read_data` as a single batch; connectors
+        with server-side cursors override this to keep memory bounded by
+        their batch size.
+        """
+        rows = self.read_data(path, limit=limit, columns=columns)
+        if rows:
+            yield rows
+
+    def read_columnar(
+        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
+    ) -> ColumnarDataset:
+        """Read data from the source as a column-oriented dataset.
+
+        The default adapts :meth:`read_data`; connectors that can fill column
+        arrays directly override this to avoid building a dict per row.
+        """
+        return ColumnarDataset.from_rows(self.read_data(path, limit=limit, columns=columns), columns)
+
+    def max_timestamp(self, path: str, column: Optional[str]) -> Optional[Any]:
+        """Newest value of a timestamp column, read from metadata rather than rows.
+
+        With no column, returns the table's last-modified time instead.
+        Connectors with file or catalog metadata override this; the default
+        cannot tell.
+
+        Args:
+            path: Table name or file path.
+            column: Timestamp column, or None for the table's last-modified time.
+
+        Returns:
+            A datetime or ISO timestamp string, or None if the source cannot tell.
+        """
+        return None
+
+    def data_version(self, path: str, column: Optional[str] = None) -> Optional[str]:
+        """Fingerprint of a table's contents, used to invalidate data cached from it.
+
+        The default is the table's last-modified time where the source
+        reports one (see :meth:`max_timestamp`), which changes with every
+        write.
+
+        Args:
+            path: Table name or file path.
+            column: Column the cached data is read from, if any.
+
+        Returns:
+            A string that changes when the data does, or None if the source
+            cannot tell (caches then rely on their TTL alone).
+        """
+        modified = self.max_timestamp(path, None)
+        return None if modified is None else str(modified)
+
     @abstractmethod
     def list_tables(self) -> list[str]:
         """List available tables or paths in the source."""
@@ -42,3 +110,53 @@ class DataConnector(ABC):
     def get_schema(self, path: str) -> dict[str, str]:
         """Get schema (column name -> type) for a table/path."""
         ...
+
+
+class SQLPushdownMixin(ABC):
+    """Aggregate pushdown for relational connectors.
+
+    Subclasses (``class XConnector(SQLPushdownMixin, DataConnector)``) name
+    their ``pushdown_dialect`` (a key of ``engine.pushdown.DIALECTS``),
+    implement :meth:`aggregate` and build their ``SELECT`` with
+    ``_build_query``, so rule metrics, newest timestamps and data versions
+    are computed in the source database.
+    """
+
+    pushdown_dialect: str
+
+    @abstractmethod
+    def aggregate(self, path: str, expressions: list[str]) -> list:
+        """Evaluate SQL aggregate expressions over a table and return the single result row."""
+        ...
+
+    def max_timestamp(self, path: str, column: Optional[str]) -> Optional[Any]:
+        """``SELECT MAX(column)``; None for the table's last-modified time, which SQL does not report.
+
+        Text columns compare as strings, which is chronological for ISO-8601
+        values with one UTC offset.
+        """
+        if column is None:
+            return None
+        return self.aggregate(path, [f"MAX({quote_identifier(column, DIALECTS[self.pushdown_dialect])})"])[0]
+
+    def data_version(self, path: str, column: Optional[str] = None) -> Optional[str]:
+        """The table's last-modified time, else its row count and the column's count, minimum and maximum.
+
+        The fingerprint is a full-table aggregate on every call, and misses
+        in-place updates that keep those four values, so caches must still
+        expire entries by age.
+        """
+        modified = self.max_timestamp(path, None)
+        if modified is not None:
+            return str(modified)
+        expressions = ["COUNT(*)"]
+        if column:
+            col = quote_identifier(column, DIALECTS[self.pushdown_dialect])
+            expressions += [f"COUNT({col})", f"MIN({col})", f"MAX({col})"]
+        return json.dumps(list(self.aggregate(path, expressions)), default=str)
+
+    def _aggregate_query(self, path: str, expressions: list[str]) -> str:
+        """SELECT aggregate expressions from a table, or from a 'sql:' query as a derived table."""
+        if path.startswith("sql:"):
+            return f"SELECT {', '.join(expressions)} FROM ({path[4:]}) dq_src"  # noqa: S608
+        return self._build_query(path, None, expressions)
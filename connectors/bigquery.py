@@ -1,13 +1,16 @@
 """BigQuery data source connector."""
 
-from typing import Optional
+from typing import Any, Optional
 
-from connectors.base import DataConnector
+from connectors.base import DataConnector, SQLPushdownMixin
+from engine.dataset import ColumnarDataset
 
 
-class BigQueryConnector(DataConnector):
+class BigQueryConnector(SQLPushdownMixin, DataConnector):
     """Connector for Google BigQuery via google-cloud-bigquery."""
 
+    pushdown_dialect = "bigquery"
+
     def __init__(self) -> None:
         self._client = None
         self._dataset: str = ""
@@ -50,6 +53,17 @@ class BigQueryConnector(DataConnector):
         except Exception:
             return False
 
+    def _build_query(self, path: str, limit: Optional[int], columns: Optional[list[str]]) -> str:
+        """Build the SELECT statement for a table read or pass through a 'sql:' query."""
+        if path.startswith("sql:"):
+            return path[4:]
+        cols = ", ".join(columns) if columns else "*"
+        table_ref = f"`{self._project_id}.{self._dataset}.{path}`"
+        query = f"SELECT {cols} FROM {table_ref}"
+        if limit:
+            query += f" LIMIT {limit}"
+        return query
+
     def read_data(
         self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
     ) -> list[dict]:
@@ -61,20 +75,38 @@ class BigQueryConnector(DataConnector):
         if not self._client:
             raise RuntimeError("Not connected. Call connect() first.")
 
-        if path.startswith("sql:"):
-            query = path[4:]
-        else:
-            cols = ", ".join(columns) if columns else "*"
-            table_ref = f"`{self._project_id}.{self._dataset}.{path}`"
-            query = f"SELECT {cols} FROM {table_ref}"
-            if limit:
-                query += f" LIMIT {limit}"
-
-        query_job = self._client.query(query)
+        query_job = self._client.query(self._build_query(path, limit, columns))
         rows = query_job.result()
 
         return [dict(row) for row in rows]
 
+    def read_columnar(
+        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
+    ) -> ColumnarDataset:
+        """Read a BigQuery table or query result as Arrow column buffers."""
+        if not self._client:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        query_job = self._client.query(self._build_query(path, limit, columns))
+        return ColumnarDataset.from_arrow(query_job.result().to_arrow())
+
+    def aggregate(self, path: str, expressions: list[str]) -> list:
+        """Run one aggregate query in the database and return its result row."""
+        if not self._client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        rows = self._client.query(self._aggregate_query(path, expressions)).result()
+        return list(next(iter(rows)).values())
+
+    def max_timestamp(self, path: str, column: Optional[str]) -> Optional[Any]:
+        """``MAX(column)`` in BigQuery, or the table's last-modified time from its metadata."""
+        if column is not None:
+            return super().max_timestamp(path, column)
+        if not self._client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        if path.startswith("sql:"):
+            return None
+        return self._client.get_table(f"{self._project_id}.{self._dataset}.{path}").modified
+
     def list_tables(self) -> list[str]:
         """List tables in the connected dataset."""
         if not self._client:
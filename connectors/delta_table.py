@@ -1,6 +1,6 @@
 """Delta Lake table connector."""
 
-from typing import Optional
+from typing import Any, Optional
 
 from connectors.base import DataConnector
 
@@ -32,6 +32,7 @@ class DeltaTableConnector(DataConnector):
                     "spark.sql.catalog.spark_catalog",
                     "org.apache.spark.sql.delta.catalog.DeltaCatalog",
                 )
+                .config("spark.databricks.delta.optimizeMetadataQuery.enabled", "true")
                 .getOrCreate()
             )
         except ImportError:
@@ -47,10 +48,8 @@ class DeltaTableConnector(DataConnector):
         except Exception:
             return False
 
-    def read_data(
-        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
-    ) -> list[dict]:
-        """Read data from a Delta table."""
+    def read_dataframe(self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None) -> Any:
+        """Load a Delta table as a Spark DataFrame, leaving the data on the executors."""
         if not self._spark:
             raise RuntimeError("Not connected. Call connect() first.")
 
@@ -59,7 +58,30 @@ class DeltaTableConnector(DataConnector):
             df = df.select(*columns)
         if limit:
             df = df.limit(limit)
-        return [row.asDict() for row in df.collect()]
+        return df
+
+    def read_data(
+        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
+    ) -> list[dict]:
+        """Read data from a Delta table."""
+        return [row.asDict() for row in self.read_dataframe(path, limit, columns).collect()]
+
+    def max_timestamp(self, path: str, column: Optional[str]) -> Optional[Any]:
+        """Newest value of a column, or the table's last commit time, from the Delta transaction log.
+
+        ``MAX(column)`` is answered from the per-file statistics in the log
+        (Delta's metadata-only aggregate optimization) when they cover every
+        file, so no data files are read.
+        """
+        if not self._spark:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        from pyspark.sql import functions as F
+
+        table = path or self._path
+        if column is None:
+            return self._spark.sql(f"DESCRIBE DETAIL delta.`{table}`").first()["lastModified"]
+        return self._spark.read.format("delta").load(table).agg(F.max(column)).first()[0]
 
     def list_tables(self) -> list[str]:
         """List available Delta tables (catalog-based)."""
@@ -1,6 +1,6 @@
 """AWS Glue Data Catalog connector."""
 
-from typing import Optional
+from typing import Any, Optional
 
 from connectors.base import DataConnector
 
@@ -72,6 +72,14 @@ class GlueCatalogConnector(DataConnector):
             data = data[:limit]
         return data
 
+    def max_timestamp(self, path: str, column: Optional[str]) -> Optional[Any]:
+        """The table's last update time from the catalog; Glue keeps no timestamp column statistics."""
+        if not self._client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        if column is not None:
+            return None
+        return self._client.get_table(DatabaseName=self._database, Name=path)["Table"].get("UpdateTime")
+
     def list_tables(self) -> list[str]:
         """List tables in the configured Glue database."""
         if not self._client:
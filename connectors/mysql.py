@@ -2,12 +2,15 @@
 
 from typing import Optional
 
-from connectors.base import DataConnector
+from connectors.base import DataConnector, SQLPushdownMixin
+from engine.dataset import ColumnarDataset
 
 
-class MySQLConnector(DataConnector):
+class MySQLConnector(SQLPushdownMixin, DataConnector):
     """Connector for MySQL via mysql-connector-python."""
 
+    pushdown_dialect = "mysql"
+
     def __init__(self) -> None:
         self._connection = None
         self._database: str = ""
@@ -59,6 +62,16 @@ class MySQLConnector(DataConnector):
         except Exception:
             return False
 
+    def _build_query(self, path: str, limit: Optional[int], columns: Optional[list[str]]) -> str:
+        """Build the SELECT statement for a table read or pass through a 'sql:' query."""
+        if path.startswith("sql:"):
+            return path[4:]
+        cols = ", ".join(columns) if columns else "*"
+        query = f"SELECT {cols} FROM {path}"
+        if limit:
+            query += f" LIMIT {limit}"
+        return query
+
     def read_data(
         self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
     ) -> list[dict]:
@@ -71,22 +84,39 @@ class MySQLConnector(DataConnector):
             raise RuntimeError("Not connected. Call connect() first.")
 
         cursor = self._connection.cursor()
-
-        if path.startswith("sql:"):
-            query = path[4:]
-        else:
-            cols = ", ".join(columns) if columns else "*"
-            query = f"SELECT {cols} FROM {path}"
-            if limit:
-                query += f" LIMIT {limit}"
-
-        cursor.execute(query)
+        cursor.execute(self._build_query(path, limit, columns))
         col_names = [desc[0] for desc in cursor.description]
         rows = cursor.fetchall()
         cursor.close()
 
         return [{col_names[i]: row[i] for i in range(len(col_names))} for row in rows]
 
+    def read_columnar(
+        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
+    ) -> ColumnarDataset:
+        """Read a MySQL table or query straight into column arrays."""
+        if not self._connection:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        cursor = self._connection.cursor()
+        cursor.execute(self._build_query(path, limit, columns))
+        col_names = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+
+        return ColumnarDataset.from_batches(col_names, [rows] if rows else [])
+
+    def aggregate(self, path: str, expressions: list[str]) -> list:
+        """Run one aggregate query in the database and return its result row."""
+        if not self._connection:
+            raise RuntimeError("Not connected. Call connect() first.")
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(self._aggregate_query(path, expressions))
+            return list(cursor.fetchone())
+        finally:
+            cursor.close()
+
     def list_tables(self) -> list[str]:
         """List tables in the connected database."""
         if not self._connection:
@@ -2,12 +2,15 @@
 
 from typing import Optional
 
-from connectors.base import DataConnector
+from connectors.base import DataConnector, SQLPushdownMixin
+from engine.dataset import ColumnarDataset
 
 
-class PostgreSQLConnector(DataConnector):
+class PostgreSQLConnector(SQLPushdownMixin, DataConnector):
     """Connector for PostgreSQL via psycopg2."""
 
+    pushdown_dialect = "postgresql"
+
     def __init__(self, batch_size: int = 10000) -> None:
         self._connection = None
         self._schema: str = "public"
@@ -50,6 +53,16 @@ class PostgreSQLConnector(DataConnector):
         except Exception:
             return False
 
+    def _build_query(self, path: str, limit: Optional[int], columns: Optional[list[str]]) -> str:
+        """Build the SELECT statement for a table read or pass through a 'sql:' query."""
+        if path.startswith("sql:"):
+            return path[4:]
+        cols = ", ".join(columns) if columns else "*"
+        query = f"SELECT {cols} FROM {self._schema}.{path}"
+        if limit:
+            query += f" LIMIT {limit}"
+        return query
+
     def read_data(
         self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
     ) -> list[dict]:
@@ -62,16 +75,7 @@ class PostgreSQLConnector(DataConnector):
             raise RuntimeError("Not connected. Call connect() first.")
 
         cursor = self._connection.cursor()
-
-        if path.startswith("sql:"):
-            query = path[4:]
-        else:
-            cols = ", ".join(columns) if columns else "*"
-            query = f"SELECT {cols} FROM {self._schema}.{path}"
-            if limit:
-                query += f" LIMIT {limit}"
-
-        cursor.execute(query)
+        cursor.execute(self._build_query(path, limit, columns))
         col_names = [desc[0] for desc in cursor.description]
         results: list[dict] = []
         while True:
@@ -90,15 +94,7 @@ class PostgreSQLConnector(DataConnector):
             raise RuntimeError("Not connected. Call connect() first.")
 
         cursor = self._connection.cursor()
-        if path.startswith("sql:"):
-            query = path[4:]
-        else:
-            cols = ", ".join(columns) if columns else "*"
-            query = f"SELECT {cols} FROM {self._schema}.{path}"
-            if limit:
-                query += f" LIMIT {limit}"
-
-        cursor.execute(query)
+        cursor.execute(self._build_query(path, limit, columns))
         col_names = [desc[0] for desc in cursor.description]
         try:
             while True:
@@ -109,6 +105,32 @@ class PostgreSQLConnector(DataConnector):
         finally:
             cursor.close()
 
+    def read_columnar(
+        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
+    ) -> ColumnarDataset:
+        """Read a PostgreSQL table or query straight into column arrays, batch by batch."""
+        if not self._connection:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        cursor = self._connection.cursor()
+        cursor.execute(self._build_query(path, limit, columns))
+        col_names = [desc[0] for desc in cursor.description]
+        try:
+            return ColumnarDataset.from_batches(col_names, iter(lambda: cursor.fetchmany(self.batch_size), []))
+        finally:
+            cursor.close()
+
+    def aggregate(self, path: str, expressions: list[str]) -> list:
+        """Run one aggregate query in the database and return its result row."""
+        if not self._connection:
+            raise RuntimeError("Not connected. Call connect() first.")
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(self._aggregate_query(path, expressions))
+            return list(cursor.fetchone())
+        finally:
+            cursor.close()
+
     def list_tables(self) -> list[str]:
         """List tables in the connected database schema."""
         if not self._connection:
@@ -2,12 +2,15 @@
 
 from typing import Optional
 
-from connectors.base import DataConnector
+from connectors.base import DataConnector, SQLPushdownMixin
+from engine.dataset import ColumnarDataset
 
 
-class RedshiftConnector(DataConnector):
+class RedshiftConnector(SQLPushdownMixin, DataConnector):
     """Connector for AWS Redshift via psycopg2 (Redshift is PostgreSQL-compatible)."""
 
+    pushdown_dialect = "redshift"
+
     def __init__(self) -> None:
         self._connection = None
         self._schema: str = "public"
@@ -49,6 +52,16 @@ class RedshiftConnector(DataConnector):
         except Exception:
             return False
 
+    def _build_query(self, path: str, limit: Optional[int], columns: Optional[list[str]]) -> str:
+        """Build the SELECT statement for a table read or pass through a 'sql:' query."""
+        if path.startswith("sql:"):
+            return path[4:]
+        cols = ", ".join(columns) if columns else "*"
+        query = f"SELECT {cols} FROM {self._schema}.{path}"
+        if limit:
+            query += f" LIMIT {limit}"
+        return query
+
     def read_data(
         self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
     ) -> list[dict]:
@@ -61,21 +74,38 @@ class RedshiftConnector(DataConnector):
             raise RuntimeError("Not connected. Call connect() first.")
 
         cursor = self._connection.cursor()
+        cursor.execute(self._build_query(path, limit, columns))
+        col_names = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
 
-        if path.startswith("sql:"):
-            query = path[4:]
-        else:
-            cols = ", ".join(columns) if columns else "*"
-            query = f"SELECT {cols} FROM {self._schema}.{path}"
-            if limit:
-                query += f" LIMIT {limit}"
+        return [{col_names[i]: row[i] for i in range(len(col_names))} for row in rows]
 
-        cursor.execute(query)
+    def read_columnar(
+        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
+    ) -> ColumnarDataset:
+        """Read a Redshift table or query straight into column arrays."""
+        if not self._connection:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        cursor = self._connection.cursor()
+        cursor.execute(self._build_query(path, limit, columns))
         col_names = [desc[0] for desc in cursor.description]
         rows = cursor.fetchall()
         cursor.close()
 
-        return [{col_names[i]: row[i] for i in range(len(col_names))} for row in rows]
+        return ColumnarDataset.from_batches(col_names, [rows] if rows else [])
+
+    def aggregate(self, path: str, expressions: list[str]) -> list:
+        """Run one aggregate query in the database and return its result row."""
+        if not self._connection:
+            raise RuntimeError("Not connected. Call connect() first.")
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(self._aggregate_query(path, expressions))
+            return list(cursor.fetchone())
+        finally:
+            cursor.close()
 
     def list_tables(self) -> list[str]:
         """List tables in the connected Redshift schema."""
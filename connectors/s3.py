@@ -2,9 +2,10 @@
 
 import io
 import json
-from typing import Optional
+from typing import Any, Optional
 
 from connectors.base import DataConnector
+from engine.dataset import ColumnarDataset
 
 
 class S3Connector(DataConnector):
@@ -57,13 +58,7 @@ class S3Connector(DataConnector):
         Args:
             path: S3 key (relative to prefix).
         """
-        if not self._client:
-            raise RuntimeError("Not connected. Call connect() first.")
-
-        full_key = f"{self._prefix}/{path}".lstrip("/") if self._prefix else path
-        response = self._client.get_object(Bucket=self._bucket, Key=full_key)
-        content = response["Body"].read()
-
+        content, full_key = self._download(path)
         data = self._parse_content(content, full_key)
 
         if columns:
@@ -72,6 +67,57 @@ class S3Connector(DataConnector):
             data = data[:limit]
         return data
 
+    def read_columnar(
+        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
+    ) -> ColumnarDataset:
+        """Read a file from S3 as a column-oriented dataset.
+
+        Parquet files are loaded straight into Arrow buffers; other formats
+        go through :meth:`read_data`.
+        """
+        if not path.endswith(".parquet"):
+            return super().read_columnar(path, limit=limit, columns=columns)
+
+        import pyarrow.parquet as pq
+
+        content, _ = self._download(path)
+        table = pq.read_table(io.BytesIO(content), columns=columns)
+        if limit:
+            table = table.slice(0, limit)
+        return ColumnarDataset.from_arrow(table)
+
+    def max_timestamp(self, path: str, column: Optional[str]) -> Optional[Any]:
+        """Newest value of a Parquet timestamp column from its footer statistics, or the object's LastModified.
+
+        Only the Parquet footer is fetched (with ranged GETs), never the row data.
+        """
+        if not self._client:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        full_key = self._full_key(path)
+        if column is None:
+            return self._client.head_object(Bucket=self._bucket, Key=full_key)["LastModified"]
+        if not path.endswith(".parquet"):
+            return None
+
+        import pyarrow.parquet as pq
+
+        size = self._client.head_object(Bucket=self._bucket, Key=full_key)["ContentLength"]
+        source = io.BufferedReader(_S3RangeReader(self._client, self._bucket, full_key, size), buffer_size=65536)
+        return parquet_max_timestamp(pq.ParquetFile(source).metadata, column)
+
+    def _full_key(self, path: str) -> str:
+        return f"{self._prefix}/{path}".lstrip("/") if self._prefix else path
+
+    def _download(self, path: str) -> tuple[bytes, str]:
+        """Fetch an object's bytes, returning them with the full S3 key."""
+        if not self._client:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        full_key = self._full_key(path)
+        response = self._client.get_object(Bucket=self._bucket, Key=full_key)
+        return response["Body"].read(), full_key
+
     def _parse_content(self, content: bytes, key: str) -> list[dict]:
         """Parse file content based on extension."""
         if key.endswith(".csv"):
@@ -104,3 +150,64 @@ class S3Connector(DataConnector):
         if not data:
             return {}
         return {k: type(v).__name__ for k, v in data[0].items()}
+
+
+class _S3RangeReader(io.RawIOBase):
+    """Seekable read-only view of an S3 object that fetches only the byte ranges read."""
+
+    def __init__(self, client: Any, bucket: str, key: str, size: int) -> None:
+        self._client, self._bucket, self._key, self._size = client, bucket, key, size
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, buffer: Any) -> int:
+        end = min(self._pos + len(buffer), self._size)
+        if end <= self._pos:
+            return 0
+        response = self._client.get_object(Bucket=self._bucket, Key=self._key, Range=f"bytes={self._pos}-{end - 1}")
+        data = response["Body"].read()
+        buffer[: len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+def parquet_max_timestamp(metadata: Any, column: str) -> Optional[Any]:
+    """Newest value of a timestamp column from Parquet row-group statistics.
+
+    Args:
+        metadata: ``pyarrow.parquet.FileMetaData`` of the file.
+        column: Top-level column name.
+
+    Returns:
+        The largest row-group maximum, or None if the column is missing, is
+        not a timestamp, or a row group with values has no statistics.
+    """
+    import pyarrow as pa
+
+    schema = metadata.schema.to_arrow_schema()
+    if column not in schema.names or not pa.types.is_timestamp(schema.field(column).type):
+        return None
+    index = next(i for i in range(len(metadata.schema)) if metadata.schema.column(i).path == column)
+    newest = None
+    for group in range(metadata.num_row_groups):
+        chunk = metadata.row_group(group).column(index)
+        stats = chunk.statistics
+        if stats is None or not stats.has_min_max:
+            if stats is not None and stats.null_count == chunk.num_values:
+                continue  # all-null row group
+            return None
+        newest = stats.max if newest is None else max(newest, stats.max)
+    return newest
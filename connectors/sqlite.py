@@ -6,12 +6,15 @@ Uses sqlite3 stdlib module for zero-dependency local testing.
 import sqlite3
 from typing import Optional
 
-from connectors.base import DataConnector
+from connectors.base import DataConnector, SQLPushdownMixin
+from engine.dataset import ColumnarDataset
 
 
-class SQLiteConnector(DataConnector):
+class SQLiteConnector(SQLPushdownMixin, DataConnector):
     """SQLite connector following the DataConnector interface."""
 
+    pushdown_dialect = "sqlite"
+
     def __init__(self, batch_size: int = 10000) -> None:
         self._conn: Optional[sqlite3.Connection] = None
         self._db_path: str = ""
@@ -37,6 +40,14 @@ class SQLiteConnector(DataConnector):
         except sqlite3.Error:
             return False
 
+    def _build_query(self, path: str, limit: Optional[int], columns: Optional[list[str]]) -> str:
+        """Build the SELECT statement for a table read."""
+        cols = ", ".join(columns) if columns else "*"
+        query = f"SELECT {cols} FROM {path}"  # noqa: S608
+        if limit:
+            query += f" LIMIT {limit}"
+        return query
+
     def read_data(
         self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
     ) -> list[dict]:
@@ -53,12 +64,7 @@ class SQLiteConnector(DataConnector):
         if not self._conn:
             raise RuntimeError("Not connected. Call connect() first.")
 
-        cols = ", ".join(columns) if columns else "*"
-        query = f"SELECT {cols} FROM {path}"  # noqa: S608
-        if limit:
-            query += f" LIMIT {limit}"
-
-        cursor = self._conn.execute(query)
+        cursor = self._conn.execute(self._build_query(path, limit, columns))
         col_names = [desc[0] for desc in cursor.description]
         results: list[dict] = []
         while True:
@@ -78,12 +84,7 @@ class SQLiteConnector(DataConnector):
         if not self._conn:
             raise RuntimeError("Not connected. Call connect() first.")
 
-        cols = ", ".join(columns) if columns else "*"
-        query = f"SELECT {cols} FROM {path}"  # noqa: S608
-        if limit:
-            query += f" LIMIT {limit}"
-
-        cursor = self._conn.execute(query)
+        cursor = self._conn.execute(self._build_query(path, limit, columns))
         col_names = [desc[0] for desc in cursor.description]
         while True:
             batch = cursor.fetchmany(self.batch_size)
@@ -91,6 +92,23 @@ class SQLiteConnector(DataConnector):
                 break
             yield [dict(zip(col_names, row)) for row in batch]
 
+    def read_columnar(
+        self, path: str, limit: Optional[int] = None, columns: Optional[list[str]] = None
+    ) -> ColumnarDataset:
+        """Read a SQLite table straight into column arrays, batch by batch."""
+        if not self._conn:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        cursor = self._conn.execute(self._build_query(path, limit, columns))
+        col_names = [desc[0] for desc in cursor.description]
+        return ColumnarDataset.from_batches(col_names, iter(lambda: cursor.fetchmany(self.batch_size), []))
+
+    def aggregate(self, path: str, expressions: list[str]) -> list:
+        """Run one aggregate query in the database and return its result row."""
+        if not self._conn:
+            raise RuntimeError("Not connected. Call connect() first.")
+        return list(self._conn.execute(self._aggregate_query(path, expressions)).fetchone())
+
     def list_tables(self) -> list[str]:
         """List all tables in the SQLite database."""
         if not self._conn:
@@ -0,0 +1,206 @@
+"""Column-oriented dataset used by the rule engine.
+
+Rows are held as one array per column so that every rule reading a column
+shares a single copy instead of re-walking row dicts. Columns may be plain
+Python lists, NumPy arrays, or pyarrow arrays; pyarrow is optional and,
+when installed, lets connectors keep large tables in compact Arrow buffers
+and lets calculators use vectorized compute kernels.
+"""
+
+from collections import Counter
+from typing import Any, Iterable, Iterator, Optional
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional
+    pa = None
+
+VALUE_COUNTS_SAMPLE = 4096
+
+
+class ColumnarDataset:
+    """A table held as one value array per column."""
+
+    def __init__(self, columns: dict[str, Any], num_rows: int) -> None:
+        self.columns = columns
+        self.num_rows = num_rows
+        self._value_counts: dict[str, Optional[Counter]] = {}
+
+    @classmethod
+    def from_rows(cls, rows: list[dict], columns: Optional[Iterable[str]] = None) -> "ColumnarDataset":
+        """Project columns out of a list of row dicts (the legacy engine input).
+
+        Args:
+            rows: List of row dicts.
+            columns: Column names to project (duplicates are ignored). Defaults
+                to every key seen in the rows.
+
+        Returns:
+            ColumnarDataset holding the requested columns as Python lists.
+        """
+        if columns is None:
+            columns = (name for row in rows for name in row)
+        return cls({name: [row.get(name) for row in rows] for name in dict.fromkeys(columns)}, len(rows))
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> "ColumnarDataset":
+        """Wrap a pyarrow Table without copying its buffers."""
+        if pa is None:
+            raise RuntimeError("pyarrow package required")
+        return cls({name: table.column(name) for name in table.column_names}, table.num_rows)
+
+    @classmethod
+    def from_batches(cls, names: list[str], batches: Iterable[list[tuple]]) -> "ColumnarDataset":
+        """Build a dataset from batches of row tuples (e.g. DB-API ``fetchmany`` results).
+
+        Each batch is transposed straight into column chunks, so no per-row
+        dict is ever created. With pyarrow installed, chunks are converted to
+        Arrow arrays as they arrive to keep peak memory close to one batch.
+        """
+        chunks: dict[str, list] = {name: [] for name in names}
+        num_rows = 0
+        for batch in batches:
+            num_rows += len(batch)
+            for name, values in zip(names, zip(*batch)):
+                chunks[name].append(_to_arrow_chunk(list(values)))
+        return cls({name: _concat_chunks(parts) for name, parts in chunks.items()}, num_rows)
+
+    def column(self, name: str) -> list:
+        """Return the values of a column as a Python list, all-None if missing (like ``row.get``)."""
+        values = self.columns.get(name)
+        if values is None:
+            return [None] * self.num_rows
+        if isinstance(values, list):
+            return values
+        if hasattr(values, "to_pylist"):
+            return values.to_pylist()
+        return values.tolist()
+
+    def arrow_column(self, name: str) -> Optional[Any]:
+        """Return a column as a pyarrow array if it is Arrow- or NumPy-backed, else None.
+
+        Calculators use this to pick a vectorized code path and fall back to
+        :meth:`column` when it returns None.
+        """
+        values = self.columns.get(name)
+        if pa is None or values is None or isinstance(values, list):
+            return None
+        if isinstance(values, (pa.Array, pa.ChunkedArray)):
+            return values
+        return pa.array(values)
+
+    def split_arrow(self) -> tuple[Optional[Any], dict[str, list]]:
+        """Split columns into a pyarrow Table and the columns that must stay Python lists.
+
+        List columns are converted the same way :meth:`from_batches` converts
+        chunks, so mixed-type columns remain lists. Returns ``(None, columns)``
+        when pyarrow is not installed.
+        """
+        if pa is None:
+            return None, {name: self.column(name) for name in self.columns}
+        arrays: dict[str, Any] = {}
+        rest: dict[str, list] = {}
+        for name, values in self.columns.items():
+            if isinstance(values, list):
+                values = _to_arrow_chunk(values)
+            if isinstance(values, list):
+                rest[name] = values
+            else:
+                arrays[name] = values if isinstance(values, (pa.Array, pa.ChunkedArray)) else pa.array(values)
+        return pa.table(arrays) if arrays else None, rest
+
+    def value_counts(self, name: str) -> Optional[Counter]:
+        """Count each distinct value of a column, keyed by ``(type, value)``.
+
+        Keys carry the type so that ``1``, ``1.0`` and ``True`` stay apart,
+        as per-value type checks need. The result is memoized on the dataset,
+        so every rule on the same column of a batch shares one counting pass
+        and then only has to look at the distinct values. Returns None if
+        the column holds unhashable values (lists, dicts) or if a sample of
+        it is mostly distinct, where counting would cost more than it saves.
+        """
+        if name not in self._value_counts:
+            values = self.arrow_column(name)
+            if values is not None:
+                sample = values.slice(0, VALUE_COUNTS_SAMPLE).to_pylist()
+            else:
+                sample = self.column(name)[:VALUE_COUNTS_SAMPLE]
+            if not _is_repetitive(sample):
+                counts = None
+            elif values is not None:
+                import pyarrow.compute as pc
+
+                counts = Counter()
+                for entry in pc.value_counts(values).to_pylist():
+                    counts[(type(entry["values"]), entry["values"])] += entry["counts"]
+            else:
+                values = self.column(name)
+                try:
+                    counts = Counter(zip(map(type, values), values))
+                except TypeError:
+                    counts = None
+            self._value_counts[name] = counts
+        return self._value_counts[name]
+
+    def to_rows(self) -> list[dict]:
+        """Materialize the dataset as a list of row dicts."""
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*(self.column(n) for n in names))]
+
+    def iter_slices(self, size: int) -> Iterator["ColumnarDataset"]:
+        """Yield consecutive row slices of at most ``size`` rows."""
+        for start in range(0, self.num_rows, size):
+            stop = min(start + size, self.num_rows)
+            yield ColumnarDataset(
+                {name: _slice(values, start, stop) for name, values in self.columns.items()}, stop - start
+            )
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+
+def _is_repetitive(sample: list) -> bool:
+    """Whether a sample of values repeats enough (and is hashable) to be worth counting."""
+    try:
+        return len(set(zip(map(type, sample), sample))) <= len(sample) * 3 // 4
+    except TypeError:
+        return False
+
+
+def as_columnar(data: Any, columns: Iterable[str]) -> ColumnarDataset:
+    """Return data as a ColumnarDataset, projecting list[dict] input if needed."""
+    if isinstance(data, ColumnarDataset):
+        return data
+    return ColumnarDataset.from_rows(data, columns)
+
+
+def _slice(values: Any, start: int, stop: int) -> Any:
+    """Slice a list, NumPy array, or Arrow array by row range."""
+    if pa is not None and isinstance(values, (pa.Array, pa.ChunkedArray)):
+        return values.slice(start, stop - start)
+    return values[start:stop]
+
+
+def _to_arrow_chunk(values: list) -> Any:
+    """Convert a chunk of Python values to a flat Arrow array, or keep the list."""
+    if pa is None or len({type(v) for v in values if v is not None}) > 1:
+        return values  # mixed Python types (e.g. int and float) would be coerced by Arrow
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, OverflowError):
+        return values  # mixed or unsupported types stay as Python objects
+    if pa.types.is_nested(array.type):
+        return values  # structs/lists would not round-trip to identical Python values
+    return array
+
+
+def _concat_chunks(chunks: list) -> Any:
+    """Combine column chunks into one ChunkedArray, or a list if any chunk is not Arrow."""
+    arrow_types = {c.type for c in chunks if not isinstance(c, list) and not pa.types.is_null(c.type)}
+    if chunks and len(arrow_types) <= 1 and not any(isinstance(c, list) for c in chunks):
+        target = arrow_types.pop() if arrow_types else pa.null()
+        return pa.chunked_array([c.cast(target) for c in chunks], type=target)
+    values: list = []
+    for chunk in chunks:
+        values.extend(chunk if isinstance(chunk, list) else chunk.to_pylist())
+    return values
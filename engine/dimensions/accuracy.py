@@ -4,61 +4,156 @@ Validates data accuracy via regex patterns, value ranges, or reference lookups.
 """
 
 import re
-from typing import Optional
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Any, Iterable, Optional
 
+from engine.dataset import ColumnarDataset, as_columnar
+from engine.dimensions.base import DimensionCalculator
+from engine.patterns import compile_pattern
+from engine.reference import ValueSet, allowed_value_set, reference_values
 
-class AccuracyCalculator:
-    """Calculate data accuracy against expected patterns or ranges."""
 
-    def calculate(self, data: list[dict], column: Optional[str] = None, config: Optional[dict] = None) -> float:
-        """Calculate accuracy score for a column.
+@dataclass
+class AccuracyState:
+    """Prepared checks and running counts for one accuracy rule."""
 
-        Config options:
-            pattern: Regex pattern that values must match.
-            min_value: Minimum allowed numeric value.
-            max_value: Maximum allowed numeric value.
-            allowed_values: List of valid values.
+    column: Optional[str]
+    compiled: Optional[re.Pattern]
+    min_val: Optional[float]
+    max_val: Optional[float]
+    allowed: ValueSet
+    total: int = 0
+    accurate: int = 0
 
-        Returns:
-            Accuracy percentage (0-100).
-        """
-        if not data or not column:
-            return 0.0
 
-        cfg = config or {}
-        total = len(data)
-        accurate = 0
+class AccuracyCalculator(DimensionCalculator):
+    """Calculate data accuracy against expected patterns or ranges.
+
+    Config options:
+        pattern: Regex pattern that values must match.
+        min_value: Minimum allowed numeric value.
+        max_value: Maximum allowed numeric value.
+        allowed_values: List of valid values, or the reference column that
+            holds them: ``table``, ``column`` and ``source`` (or
+            ``source_type`` and ``source_config``) and optionally
+            ``ttl_seconds``, see ``engine.reference.reference_values``.
+
+    Pattern and allowed-value checks run once per distinct value of each
+    batch (see ``ColumnarDataset.value_counts``) with patterns compiled once
+    per process. Allowed values are hashed once per process and tested
+    against Arrow columns in one vectorized pass.
+    """
 
+    def shard_config(self, config: Optional[dict] = None) -> Optional[dict]:
+        """Load allowed values from their reference column once, in the parent, so shards get the list."""
+        if not isinstance((config or {}).get("allowed_values"), dict):
+            return config
+        return {**config, "allowed_values": list(reference_values(config["allowed_values"]).values)}
+
+    def init(self, column: Optional[str] = None, config: Optional[dict] = None) -> AccuracyState:
+        """Create empty state for an accuracy rule."""
+        cfg = config or {}
         pattern = cfg.get("pattern")
-        compiled = re.compile(pattern) if pattern else None
-        min_val = cfg.get("min_value")
-        max_val = cfg.get("max_value")
-        allowed = set(cfg.get("allowed_values", []))
-
-        for row in data:
-            value = row.get(column)
-            if value is None:
-                continue
-
-            if compiled:
-                if compiled.match(str(value)):
-                    accurate += 1
-            elif allowed:
-                if value in allowed:
-                    accurate += 1
-            elif min_val is not None or max_val is not None:
-                try:
-                    num = float(value)
-                    in_range = True
-                    if min_val is not None and num < min_val:
-                        in_range = False
-                    if max_val is not None and num > max_val:
-                        in_range = False
-                    if in_range:
-                        accurate += 1
-                except (ValueError, TypeError):
-                    pass
-            else:
-                accurate += 1  # No validation config = assume accurate
-
-        return (accurate / total) * 100.0 if total > 0 else 0.0
+        return AccuracyState(
+            column=column,
+            compiled=compile_pattern(pattern) if pattern else None,
+            min_val=cfg.get("min_value"),
+            max_val=cfg.get("max_value"),
+            allowed=_value_set(cfg.get("allowed_values", [])),
+        )
+
+    def update(self, state: AccuracyState, batch: list[dict] | ColumnarDataset) -> None:
+        """Count accurate values in a batch."""
+        if not state.column:
+            return
+        dataset = as_columnar(batch, [state.column])
+        state.total += len(dataset)
+        compiled, min_val, max_val, allowed = state.compiled, state.min_val, state.max_val, state.allowed
+
+        arrow_values = dataset.arrow_column(state.column)
+        if arrow_values is not None and not compiled and allowed:
+            accurate = allowed.count_in(arrow_values)
+            if accurate is not None:
+                state.accurate += accurate
+                return
+        if (
+            arrow_values is not None
+            and not compiled
+            and not allowed
+            and (min_val is not None or max_val is not None)
+            and all(bound is None or isinstance(bound, (int, float)) for bound in (min_val, max_val))
+            and _is_numeric(arrow_values)
+        ):
+            state.accurate += _count_in_range(arrow_values, min_val, max_val)
+            return
+
+        counts = dataset.value_counts(state.column) if compiled or allowed else None
+        if counts is None:
+            state.accurate += _count_accurate(state, zip(dataset.column(state.column), repeat(1)))
+        else:
+            state.accurate += _count_accurate(state, ((value, n) for (_, value), n in counts.items()))
+
+    def merge(self, state: AccuracyState, other: AccuracyState) -> AccuracyState:
+        """Combine counts from another shard."""
+        state.total += other.total
+        state.accurate += other.accurate
+        return state
+
+    def finalize(self, state: AccuracyState) -> tuple[float, dict]:
+        """Accuracy percentage (0-100)."""
+        return ((state.accurate / state.total) * 100.0 if state.total > 0 else 0.0), {}
+
+
+def _count_accurate(state: AccuracyState, pairs: Iterable[tuple[Any, int]]) -> int:
+    """Sum the counts of the values that pass the rule's pattern, allowed-value or range check."""
+    compiled, min_val, max_val, allowed = state.compiled, state.min_val, state.max_val, state.allowed
+    accurate = 0
+    for value, n in pairs:
+        if value is None:
+            continue
+        if compiled:
+            if compiled.match(str(value)):
+                accurate += n
+        elif allowed:
+            if value in allowed:
+                accurate += n
+        elif min_val is not None or max_val is not None:
+            try:
+                num = float(value)
+                if min_val is not None and num < min_val:
+                    continue
+                if max_val is not None and num > max_val:
+                    continue
+                accurate += n
+            except (ValueError, TypeError):
+                pass
+        else:
+            accurate += n  # No validation config = assume accurate
+    return accurate
+
+
+def _value_set(allowed: Any) -> ValueSet:
+    resolved = allowed_value_set(allowed)
+    return resolved if isinstance(resolved, ValueSet) else ValueSet(resolved)
+
+
+def _is_numeric(values) -> bool:
+    """Whether an Arrow column holds plain integers or floats."""
+    import pyarrow as pa
+
+    return pa.types.is_integer(values.type) or pa.types.is_floating(values.type)
+
+
+def _count_in_range(values, min_val: Optional[float], max_val: Optional[float]) -> int:
+    """Count non-null values that are neither below min_val nor above max_val (NaN counts as in range)."""
+    import pyarrow.compute as pc
+
+    non_null = len(values) - values.null_count
+    out_of_range = None
+    if min_val is not None:
+        out_of_range = pc.less(values, min_val)
+    if max_val is not None:
+        above = pc.greater(values, max_val)
+        out_of_range = above if out_of_range is None else pc.or_(out_of_range, above)
+    return non_null - (pc.sum(out_of_range).as_py() or 0)
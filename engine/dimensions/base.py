@@ -0,0 +1,84 @@
+"""Shared accumulator interface for dimension calculators.
+
+Every calculator is split into ``init`` (empty state for one rule),
+``update`` (fold in one batch of rows), ``merge`` (combine two states
+built from disjoint row sets) and ``finalize`` (score and details).
+``calculate`` runs them over a whole dataset, the streaming engine calls
+``update`` batch by batch, and parallel execution builds one state per
+shard and merges them, so results do not depend on how rows are split.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from engine.dataset import ColumnarDataset
+
+
+class DimensionCalculator(ABC):
+    """Base class for dimension calculators built on accumulator state."""
+
+    def required_columns(self, column: Optional[str] = None, config: Optional[dict] = None) -> list[str]:
+        """Columns read by this calculator."""
+        return [column] if column else []
+
+    def shard_config(self, config: Optional[dict] = None) -> Optional[dict]:
+        """Config to hand to every shard's ``init``, with run-time defaults pinned so shards agree."""
+        return config
+
+    @abstractmethod
+    def init(self, column: Optional[str] = None, config: Optional[dict] = None) -> Any:
+        """Create empty accumulator state for one rule."""
+        ...
+
+    @abstractmethod
+    def update(self, state: Any, batch: list[dict] | ColumnarDataset) -> None:
+        """Fold a batch of rows into the state."""
+        ...
+
+    @abstractmethod
+    def merge(self, state: Any, other: Any) -> Any:
+        """Fold ``other`` (built by ``init`` with the same rule) into ``state`` and return it."""
+        ...
+
+    @abstractmethod
+    def finalize(self, state: Any) -> tuple[float, dict]:
+        """Return the metric value (0-100) and details for the accumulated rows."""
+        ...
+
+    def measure(
+        self, data: list[dict] | ColumnarDataset, column: Optional[str] = None, config: Optional[dict] = None
+    ) -> tuple[float, dict]:
+        """Calculate the metric and details over a whole dataset.
+
+        Calculators keep no state between calls, so one instance can
+        measure from several threads at once.
+
+        Args:
+            data: List of row dicts or a ColumnarDataset.
+            column: Column name to check.
+            config: Optional dimension-specific config.
+
+        Returns:
+            Metric value (0-100) and details.
+        """
+        state = self.init(column, config)
+        if data:
+            self.update(state, data)
+        return self.finalize(state)
+
+    def calculate(
+        self, data: list[dict] | ColumnarDataset, column: Optional[str] = None, config: Optional[dict] = None
+    ) -> float:
+        """Calculate the metric over a whole dataset.
+
+        Args:
+            data: List of row dicts or a ColumnarDataset.
+            column: Column name to check.
+            config: Optional dimension-specific config.
+
+        Returns:
+            Metric value (0-100). Details are left on ``_last_details``, so
+            concurrent callers sharing an instance should use :meth:`measure`.
+        """
+        score, self._last_details = self.measure(data, column, config)
+        return score
@@ -3,36 +3,76 @@
 Measures the percentage of non-null/non-empty values in a column.
 """
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Optional
 
+from engine.dataset import ColumnarDataset, as_columnar
+from engine.dimensions.base import DimensionCalculator
 
-class CompletenessCalculator:
-    """Calculate data completeness (non-null ratio)."""
 
-    def calculate(self, data: list[dict], column: Optional[str] = None, config: Optional[dict] = None) -> float:
-        """Calculate completeness score for a column.
+@dataclass
+class CompletenessState:
+    """Running counts for one completeness rule."""
 
-        Args:
-            data: List of row dicts.
-            column: Column name to check.
-            config: Optional config (e.g., treat_empty_as_null: true).
+    column: Optional[str]
+    treat_empty: bool
+    total: int = 0
+    non_null: int = 0
 
-        Returns:
-            Completeness percentage (0-100).
-        """
-        if not data or not column:
-            return 0.0
 
-        treat_empty = (config or {}).get("treat_empty_as_null", True)
-        total = len(data)
-        non_null = 0
+class CompletenessCalculator(DimensionCalculator):
+    """Calculate data completeness (non-null ratio).
 
-        for row in data:
-            value = row.get(column)
-            if value is None:
-                continue
-            if treat_empty and isinstance(value, str) and value.strip() == "":
-                continue
-            non_null += 1
+    Config options:
+        treat_empty_as_null: Count empty/whitespace-only strings as null (default: True).
 
-        return (non_null / total) * 100.0 if total > 0 else 0.0
+    Arrow-backed columns are counted from their validity bitmaps, which
+    Arrow keeps a cached null count for, so no values are visited unless
+    ``treat_empty_as_null`` applies to a string column.
+    """
+
+    def init(self, column: Optional[str] = None, config: Optional[dict] = None) -> CompletenessState:
+        """Create empty state for a completeness rule."""
+        return CompletenessState(column, (config or {}).get("treat_empty_as_null", True))
+
+    def update(self, state: CompletenessState, batch: list[dict] | ColumnarDataset) -> None:
+        """Count non-null values in a batch."""
+        if not state.column:
+            return
+        dataset = as_columnar(batch, [state.column])
+        total = len(dataset)
+
+        arrow_values = dataset.arrow_column(state.column)
+        if arrow_values is not None:
+            non_null = total - arrow_values.null_count
+            if state.treat_empty:
+                non_null -= _count_blank_arrow(arrow_values)
+        else:
+            values = dataset.column(state.column)
+            non_null = total - values.count(None)
+            if state.treat_empty:
+                non_null -= sum(1 for value in values if isinstance(value, str) and value.strip() == "")
+
+        state.total += total
+        state.non_null += non_null
+
+    def merge(self, state: CompletenessState, other: CompletenessState) -> CompletenessState:
+        """Combine counts from another shard."""
+        state.total += other.total
+        state.non_null += other.non_null
+        return state
+
+    def finalize(self, state: CompletenessState) -> tuple[float, dict]:
+        """Completeness percentage (0-100)."""
+        return ((state.non_null / state.total) * 100.0 if state.total > 0 else 0.0), {}
+
+
+def _count_blank_arrow(values: Any) -> int:
+    """Count empty or whitespace-only strings in an Arrow column (same whitespace set as ``str.strip``)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if not (pa.types.is_string(values.type) or pa.types.is_large_string(values.type)):
+        return 0
+    blank = pc.or_(pc.utf8_is_space(values), pc.equal(pc.binary_length(values), 0))
+    return pc.sum(blank).as_py() or 0
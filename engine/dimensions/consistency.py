@@ -3,57 +3,130 @@
 Checks cross-column relationships and referential integrity.
 """
 
+from dataclasses import dataclass
 from typing import Optional
 
+from engine.dataset import ColumnarDataset, as_columnar
+from engine.dimensions.base import DimensionCalculator
+from engine.expressions import PYTHON_COMPARISONS, compile_expression
 
-class ConsistencyCalculator:
-    """Calculate data consistency (cross-column rules)."""
 
-    def calculate(self, data: list[dict], column: Optional[str] = None, config: Optional[dict] = None) -> float:
-        """Calculate consistency score.
+@dataclass
+class ConsistencyState:
+    """Running counts for one consistency rule."""
 
-        Config options:
-            rule: Expression like "start_date < end_date".
-            column_a: First column name.
-            column_b: Second column name.
-            operator: Comparison operator (lt, lte, gt, gte, eq, neq).
+    col_a: Optional[str]
+    col_b: Optional[str]
+    operator: str
+    rule: Optional[str] = None
+    total: int = 0
+    consistent: int = 0
 
-        Returns:
-            Consistency percentage (0-100).
-        """
-        if not data:
-            return 0.0
 
+class ConsistencyCalculator(DimensionCalculator):
+    """Calculate data consistency (cross-column rules).
+
+    Config options:
+        rule: Expression over the row's columns, like
+            "start_date < end_date and (discount is None or discount < price)"
+            (see ``engine.expressions`` for the syntax). Takes precedence
+            over column_a/column_b/operator.
+        column_a: First column name.
+        column_b: Second column name.
+        operator: Comparison operator (lt, lte, gt, gte, eq, neq).
+
+    The score is the percentage of rows for which the rule (or the
+    comparison) is true; rows where it is null are inconsistent.
+    """
+
+    def required_columns(self, column: Optional[str] = None, config: Optional[dict] = None) -> list[str]:
+        """Columns read by this calculator."""
         cfg = config or {}
-        col_a = cfg.get("column_a", column)
-        col_b = cfg.get("column_b")
-        operator = cfg.get("operator", "lt")
+        if cfg.get("rule"):
+            return compile_expression(cfg["rule"]).columns
+        return [c for c in (cfg.get("column_a", column), cfg.get("column_b")) if c]
+
+    def init(self, column: Optional[str] = None, config: Optional[dict] = None) -> ConsistencyState:
+        """Create empty state for a consistency rule, compiling its expression."""
+        cfg = config or {}
+        rule = cfg.get("rule") or None
+        if rule:
+            compile_expression(rule)  # reject invalid expressions before reading data
+        return ConsistencyState(cfg.get("column_a", column), cfg.get("column_b"), cfg.get("operator", "lt"), rule)
+
+    def update(self, state: ConsistencyState, batch: list[dict] | ColumnarDataset) -> None:
+        """Count consistent rows in a batch."""
+        if state.rule:
+            expression = compile_expression(state.rule)
+            dataset = as_columnar(batch, expression.columns)
+            state.total += len(dataset)
+            state.consistent += expression.count(dataset)
+            return
 
+        col_a, col_b, operator = state.col_a, state.col_b, state.operator
         if not col_a or not col_b:
-            return 0.0
+            return
 
-        total = len(data)
-        consistent = 0
+        dataset = as_columnar(batch, [col_a, col_b])
+        state.total += len(dataset)
+        consistent = _count_arrow(dataset.arrow_column(col_a), dataset.arrow_column(col_b), operator)
+        if consistent is not None:
+            state.consistent += consistent
+            return
 
-        for row in data:
-            val_a = row.get(col_a)
-            val_b = row.get(col_b)
+        compare = PYTHON_COMPARISONS.get(_OPERATOR_SYMBOLS.get(operator))
+        if compare is None:
+            return
+        consistent = 0
+        for val_a, val_b in zip(dataset.column(col_a), dataset.column(col_b)):
             if val_a is None or val_b is None:
                 continue
             try:
-                if operator == "lt" and val_a < val_b:
-                    consistent += 1
-                elif operator == "lte" and val_a <= val_b:
-                    consistent += 1
-                elif operator == "gt" and val_a > val_b:
-                    consistent += 1
-                elif operator == "gte" and val_a >= val_b:
-                    consistent += 1
-                elif operator == "eq" and val_a == val_b:
-                    consistent += 1
-                elif operator == "neq" and val_a != val_b:
+                if compare(val_a, val_b):
                     consistent += 1
             except TypeError:
                 pass
+        state.consistent += consistent
+
+    def merge(self, state: ConsistencyState, other: ConsistencyState) -> ConsistencyState:
+        """Combine counts from another shard."""
+        state.total += other.total
+        state.consistent += other.consistent
+        return state
+
+    def finalize(self, state: ConsistencyState) -> tuple[float, dict]:
+        """Consistency percentage (0-100)."""
+        return ((state.consistent / state.total) * 100.0 if state.total > 0 else 0.0), {}
+
+
+_OPERATOR_SYMBOLS = {"lt": "<", "lte": "<=", "gt": ">", "gte": ">=", "eq": "==", "neq": "!="}
+
+_ARROW_COMPARISONS = {
+    "lt": "less",
+    "lte": "less_equal",
+    "gt": "greater",
+    "gte": "greater_equal",
+    "eq": "equal",
+    "neq": "not_equal",
+}
+
+
+def _count_arrow(values_a, values_b, operator: str) -> Optional[int]:
+    """Count rows satisfying the comparison with Arrow kernels.
+
+    Returns None when either column is not Arrow-backed or the column types
+    differ, so the caller falls back to Python comparison semantics.
+    """
+    if values_a is None or values_b is None or values_a.type != values_b.type:
+        return None
+    if operator not in _ARROW_COMPARISONS:
+        return 0
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
 
-        return (consistent / total) * 100.0 if total > 0 else 0.0
+    try:
+        matches = pc.call_function(_ARROW_COMPARISONS[operator], [values_a, values_b])
+    except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+        return None
+    return pc.sum(matches).as_py() or 0
@@ -3,71 +3,168 @@
 Computes column statistics and returns a data quality readiness score.
 """
 
+import math
 from collections import Counter
-from typing import Optional
-
-
-class ProfilingCalculator:
-    """Calculate data profiling statistics and readiness score."""
-
-    def calculate(self, data: list[dict], column: Optional[str] = None, config: Optional[dict] = None) -> float:
-        """Calculate profiling score for a column.
-
-        Computes comprehensive column statistics (row count, nulls, distinct
-        values, min/max/mean, most common value, value distribution) and
-        returns a quality readiness score (0-100).
-
-        Args:
-            data: List of row dicts.
-            column: Column name to profile.
-            config: Optional config dict.
-
-        Returns:
-            Profiling readiness score (0-100).
-        """
-        if not data or not column:
-            return 0.0
-
-        row_count = len(data)
-        values = [row.get(column) for row in data]
-        null_count = sum(1 for v in values if v is None)
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from engine.dataset import ColumnarDataset, as_columnar
+from engine.dimensions.base import DimensionCalculator
+from engine.sketches import FrequentItems, HyperLogLog, Moments, QuantileSketch
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+@dataclass
+class ProfilingState:
+    """Bounded column sketches for one profiling rule."""
+
+    column: Optional[str]
+    exact_distinct_limit: int = 10000
+    row_count: int = 0
+    null_count: int = 0
+    distinct: Optional[set] = field(default_factory=set)
+    distinct_sketch: Optional[HyperLogLog] = None
+    frequent: FrequentItems = field(default_factory=FrequentItems)
+    moments: Moments = field(default_factory=Moments)
+    quantiles: QuantileSketch = field(default_factory=QuantileSketch)
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    types_present: set = field(default_factory=set)
+
+
+class ProfilingCalculator(DimensionCalculator):
+    """Calculate data profiling statistics and readiness score.
+
+    Computes comprehensive column statistics (row count, nulls, distinct
+    values, min/max/mean/stddev, percentiles, most common value, value
+    distribution) and returns a quality readiness score (0-100).
+
+    Config options:
+        exact_distinct_limit: Distinct values counted exactly before switching
+            to a HyperLogLog estimate (default: 10000).
+        top_k_capacity: Counters kept for the most common values (default:
+            ``exact_distinct_limit``). Counts are exact while the column has
+            no more distinct values than this; beyond it they are lower
+            bounds of a Misra-Gries summary, values less frequent than
+            ``row_count / top_k_capacity`` may be missing, and
+            ``most_common_approximate`` is True.
+        relative_accuracy: Relative error of the percentiles (default: 0.01).
+
+    Every statistic is kept in a bounded, mergeable sketch, so memory per
+    column does not grow with the row count. Distinct and most-common counts
+    are exact up to their limits and flagged in the details once they are
+    estimates (``distinct_count_approximate``, ``most_common_approximate``);
+    percentiles and the median are always estimates.
+    """
+
+    def init(self, column: Optional[str] = None, config: Optional[dict] = None) -> ProfilingState:
+        """Create empty state for a profiling rule."""
+        cfg = config or {}
+        exact_distinct_limit = cfg.get("exact_distinct_limit", 10000)
+        return ProfilingState(
+            column,
+            exact_distinct_limit=exact_distinct_limit,
+            frequent=FrequentItems(cfg.get("top_k_capacity", exact_distinct_limit)),
+            quantiles=QuantileSketch(cfg.get("relative_accuracy", 0.01)),
+        )
+
+    def update(self, state: ProfilingState, batch: list[dict] | ColumnarDataset) -> None:
+        """Fold a batch of values into the column sketches."""
+        if not state.column:
+            return
+        values = as_columnar(batch, [state.column]).column(state.column)
+        state.row_count += len(values)
         non_null_values = [v for v in values if v is not None]
-        non_null_count = len(non_null_values)
+        state.null_count += len(values) - len(non_null_values)
+        counts = Counter(non_null_values)
+        state.frequent.update(counts)
+        _add_distinct(state, counts)
+        state.types_present.update(type(v).__name__ for v in non_null_values)
+
+        numeric_values = [v for v in non_null_values if isinstance(v, (int, float))]
+        if numeric_values:
+            state.moments.update(numeric_values)
+            batch_min, batch_max = min(numeric_values), max(numeric_values)
+            state.min_value = batch_min if state.min_value is None else min(state.min_value, batch_min)
+            state.max_value = batch_max if state.max_value is None else max(state.max_value, batch_max)
+            if len(counts) * 4 < len(non_null_values):  # repetitive: bucket each distinct value once
+                for value, n in counts.items():
+                    if isinstance(value, (int, float)) and math.isfinite(value):
+                        state.quantiles.add(value, n)
+            else:
+                state.quantiles.add_many(numeric_values)
+            state.quantiles.compact()
+
+    def merge(self, state: ProfilingState, other: ProfilingState) -> ProfilingState:
+        """Combine column sketches from another shard."""
+        state.row_count += other.row_count
+        state.null_count += other.null_count
+        state.frequent.merge(other.frequent)
+        if other.distinct_sketch is not None:
+            _to_sketch(state)
+            state.distinct_sketch.merge(other.distinct_sketch)
+        else:
+            _add_distinct(state, other.distinct)
+        state.types_present |= other.types_present
+        state.moments.merge(other.moments)
+        state.quantiles.merge(other.quantiles)
+        state.quantiles.compact()
+        for bound, pick in (("min_value", min), ("max_value", max)):
+            ours, theirs = getattr(state, bound), getattr(other, bound)
+            if theirs is not None:
+                setattr(state, bound, theirs if ours is None else pick(ours, theirs))
+        return state
+
+    def finalize(self, state: ProfilingState) -> tuple[float, dict]:
+        """Readiness score (0-100) and the column profile."""
+        row_count = state.row_count
+        if row_count == 0:
+            return 0.0, {}
+
+        null_count = state.null_count
+        non_null_count = row_count - null_count
         null_percentage = (null_count / row_count) * 100.0 if row_count > 0 else 0.0
 
-        distinct_count = len(set(non_null_values))
+        if state.distinct_sketch is not None:
+            distinct_count = min(round(state.distinct_sketch.estimate()), non_null_count)
+        else:
+            distinct_count = len(state.distinct)
         distinct_percentage = (distinct_count / non_null_count) * 100.0 if non_null_count > 0 else 0.0
 
         # Numeric stats
-        numeric_values = [v for v in non_null_values if isinstance(v, (int, float))]
-        min_value = min(numeric_values) if numeric_values else None
-        max_value = max(numeric_values) if numeric_values else None
-        mean_value = sum(numeric_values) / len(numeric_values) if numeric_values else None
+        mean_value = state.moments.mean
+        variance = state.moments.variance
+        percentiles = None
+        if state.quantiles.count:
+            percentiles = {f"p{p}": _round(_percentile(state, p / 100)) for p in PERCENTILES}
 
         # Most common value
-        counter = Counter(non_null_values)
-        most_common_entry = counter.most_common(1)
+        most_common_entry = state.frequent.most_common(1)
         most_common = {"value": most_common_entry[0][0], "count": most_common_entry[0][1]} if most_common_entry else None
 
         # Value distribution (top 5)
-        value_distribution = [{"value": v, "count": c} for v, c in counter.most_common(5)]
+        value_distribution = [{"value": v, "count": c} for v, c in state.frequent.most_common(5)]
 
         # Mixed types detection
-        types_present = set(type(v).__name__ for v in non_null_values)
-        has_mixed_types = len(types_present) > 1
+        has_mixed_types = len(state.types_present) > 1
 
-        # Store details
-        self._last_details = {
+        details = {
             "row_count": row_count,
             "null_count": null_count,
             "null_percentage": round(null_percentage, 2),
             "distinct_count": distinct_count,
             "distinct_percentage": round(distinct_percentage, 2),
-            "min_value": min_value,
-            "max_value": max_value,
+            "min_value": state.min_value,
+            "max_value": state.max_value,
             "mean_value": round(mean_value, 2) if mean_value is not None else None,
+            "stddev_value": _round(math.sqrt(variance)) if variance is not None else None,
+            "median_value": percentiles["p50"] if percentiles else None,
+            "percentiles": percentiles,
+            "distinct_count_approximate": state.distinct_sketch is not None,
             "most_common": most_common,
             "value_distribution": value_distribution,
+            "most_common_approximate": state.frequent.error > 0,
             "has_mixed_types": has_mixed_types,
         }
 
@@ -86,4 +183,37 @@ class ProfilingCalculator:
         if has_mixed_types:
             score -= 10.0
 
-        return max(score, 0.0)
+        return max(score, 0.0), details
+
+
+def _add_distinct(state: ProfilingState, values: Iterable) -> None:
+    """Count values as distinct keys, exactly until the limit and then with HyperLogLog."""
+    if state.distinct_sketch is not None:
+        state.distinct_sketch.add_many(values)
+        return
+    state.distinct.update(values)
+    if len(state.distinct) > state.exact_distinct_limit:
+        _to_sketch(state)
+
+
+def _to_sketch(state: ProfilingState) -> None:
+    """Replace the exact distinct set with a HyperLogLog sketch of it."""
+    if state.distinct_sketch is None:
+        state.distinct_sketch = HyperLogLog()
+        state.distinct_sketch.add_many(state.distinct)
+        state.distinct = None
+
+
+def _percentile(state: ProfilingState, q: float) -> float:
+    """Sketch percentile, clamped to the exact min/max."""
+    estimate = state.quantiles.quantile(q)
+    low, high = state.min_value, state.max_value
+    if low is not None and math.isfinite(low):
+        estimate = max(estimate, low)
+    if high is not None and math.isfinite(high):
+        estimate = min(estimate, high)
+    return estimate
+
+
+def _round(value: float) -> float:
+    return round(value, 2) if math.isfinite(value) else value
@@ -0,0 +1,143 @@
+"""Referential integrity dimension calculator.
+
+Checks that every key of a column exists in a reference column, e.g.
+``orders.customer_id`` in ``customers.customer_id``.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from engine.dataset import ColumnarDataset, as_columnar
+from engine.dimensions.base import DimensionCalculator
+from engine.reference import KeyIndex, load_index, reference_index
+
+
+@dataclass
+class ReferentialIntegrityState:
+    """Reference index handle and running counts for one referential integrity rule."""
+
+    column: Optional[str]
+    reference: dict
+    handle: str
+    sample_size: int
+    total: int = 0
+    nulls: int = 0
+    found: int = 0
+    missing_sample: list = field(default_factory=list)
+
+
+class ReferentialIntegrityCalculator(DimensionCalculator):
+    """Calculate referential integrity against a reference column.
+
+    Config options:
+        reference: The referenced ``table`` and ``column`` and their source:
+            ``source`` (a name resolved by the application, see
+            ``engine.reference.set_source_resolver``) or ``source_type`` and
+            ``source_config``. Optional ``cache_dir`` and ``ttl_seconds``
+            (maximum index age, default 3600) control the cached index.
+        sample_size: Number of missing keys to report (default: 10).
+
+    The score is the percentage of non-null keys found in the reference
+    column; as with SQL foreign keys, null keys reference nothing and are
+    not checked. The reference column is indexed once and the index is
+    shared by every rule, shard and run that uses it until the table's data
+    version changes or the index outlives ``ttl_seconds`` (see
+    ``engine.reference``); keys are streamed from the checked table and
+    probed a batch at a time.
+    """
+
+    def shard_config(self, config: Optional[dict] = None) -> dict:
+        """Build the reference index once, in the parent, so shards only load it."""
+        cfg = dict(config or {})
+        cfg["index"], _ = reference_index(_reference(cfg))
+        return cfg
+
+    def init(self, column: Optional[str] = None, config: Optional[dict] = None) -> ReferentialIntegrityState:
+        """Create empty state for a referential integrity rule, building the reference index if needed."""
+        cfg = config or {}
+        reference = _reference(cfg)
+        handle = cfg.get("index") or reference_index(reference)[0]
+        return ReferentialIntegrityState(column, reference, handle, cfg.get("sample_size", 10))
+
+    def update(self, state: ReferentialIntegrityState, batch: list[dict] | ColumnarDataset) -> None:
+        """Probe a batch of keys against the reference index."""
+        if not state.column:
+            return
+        dataset = as_columnar(batch, [state.column])
+        state.total += len(dataset)
+        index = _index(state)
+
+        values = dataset.arrow_column(state.column)
+        if values is not None:
+            keys = values.drop_null()
+            if hasattr(keys, "combine_chunks"):
+                keys = keys.combine_chunks()
+            found = index.find_array(keys)
+            if found is not None:
+                state.nulls += len(values) - len(keys)
+                state.found += int(found.sum())
+                if len(state.missing_sample) < state.sample_size and not found.all():
+                    _add_missing(state, keys.to_numpy(zero_copy_only=False)[~found].tolist())
+                return
+
+        counts = dataset.value_counts(state.column)
+        if counts is None:
+            keyed = [(value, 1) for value in dataset.column(state.column) if value is not None]
+        else:
+            keyed = [(value, n) for (_, value), n in counts.items() if value is not None]
+        state.nulls += len(dataset) - sum(n for _, n in keyed)
+        missing = []
+        for (value, n), hit in zip(keyed, index.find([value for value, _ in keyed])):
+            if hit:
+                state.found += n
+            elif len(missing) < state.sample_size:
+                missing.append(value)
+        _add_missing(state, missing)
+
+    def merge(self, state: ReferentialIntegrityState, other: ReferentialIntegrityState) -> ReferentialIntegrityState:
+        """Combine counts from another shard."""
+        state.total += other.total
+        state.nulls += other.nulls
+        state.found += other.found
+        _add_missing(state, other.missing_sample)
+        return state
+
+    def finalize(self, state: ReferentialIntegrityState) -> tuple[float, dict]:
+        """Percentage (0-100) of non-null keys found in the reference column."""
+        checked = state.total - state.nulls
+        if state.total == 0:
+            score = 0.0
+        else:
+            score = (state.found / checked) * 100.0 if checked > 0 else 100.0
+        details = {
+            "checked_keys": checked,
+            "missing_keys": checked - state.found,
+            "null_keys": state.nulls,
+            "reference_keys": len(_index(state)),
+            "sample_missing": state.missing_sample,
+        }
+        return score, details
+
+
+def _reference(cfg: dict) -> dict:
+    reference = cfg.get("reference")
+    if not reference or not reference.get("table") or not reference.get("column"):
+        raise ValueError("referential_integrity rules need a reference table and column")
+    return reference
+
+
+def _index(state: ReferentialIntegrityState) -> KeyIndex:
+    """The state's reference index, rebuilt in this process if it was only held in another's memory."""
+    try:
+        return load_index(state.handle)
+    except ValueError:
+        state.handle, index = reference_index(state.reference)
+        return index
+
+
+def _add_missing(state: ReferentialIntegrityState, values: list[Any]) -> None:
+    for value in values:
+        if len(state.missing_sample) >= state.sample_size:
+            break
+        if value not in state.missing_sample:
+            state.missing_sample.append(value)
@@ -3,49 +3,242 @@
 Checks how recent the data is relative to a freshness threshold.
 """
 
+import math
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
+from engine.dataset import ColumnarDataset, as_columnar, pa
+from engine.dimensions.base import DimensionCalculator
 
-class TimelinessCalculator:
-    """Calculate data timeliness (freshness)."""
+MICROSECOND = timedelta(microseconds=1)
+EPOCH = datetime(1970, 1, 1)
 
-    def calculate(self, data: list[dict], column: Optional[str] = None, config: Optional[dict] = None) -> float:
-        """Calculate timeliness score for a timestamp column.
+# Ages are histogrammed in log-spaced buckets 1% apart (of 1 + age in seconds),
+# so the age percentiles need a few thousand counters whatever the row count.
+AGE_BUCKET_STEP = math.log(1.01)
+HOUR_SECONDS = 3600.0
+AGE_CHUNK_ROWS = 8192
 
-        Config options:
-            max_age_hours: Maximum allowed age in hours (default: 24).
-            reference_time: ISO timestamp to compare against (default: now).
 
-        Returns:
-            Timeliness percentage (0-100). 100 = all records within freshness SLA.
-        """
-        if not data or not column:
-            return 0.0
+@dataclass
+class TimelinessState:
+    """Reference time, threshold, running counts and age histogram for one timeliness rule."""
+
+    column: Optional[str]
+    ref_time: datetime
+    threshold: timedelta
+    max_only: bool = False
+    total: int = 0
+    timely: int = 0
+    min_age_us: Optional[int] = None
+    max_age_us: Optional[int] = None
+    age_buckets: Counter = field(default_factory=Counter)
+
+
+class TimelinessCalculator(DimensionCalculator):
+    """Calculate data timeliness (freshness).
+
+    Config options:
+        max_age_hours: Maximum allowed age in hours (default: 24).
+        reference_time: ISO timestamp to compare against (default: now).
+        mode: "all" (default) scores every record; "max_only" scores only
+            the newest timestamp, which the rule engine can read from source
+            metadata (see :meth:`update_newest`) instead of scanning rows.
+
+    The score is the percentage of records within the freshness SLA.
+    ``details`` reports the maximum lag and the median and 99th percentile
+    age (in hours, percentiles within 1%) of the parseable timestamps. In
+    ``max_only`` mode the score is 100 if the newest timestamp is within the
+    SLA and 0 otherwise, and ``details`` reports its lag.
+
+    Arrow timestamp columns are compared as int64 epoch microseconds
+    against an int64 cutoff. Other columns compute each distinct value's
+    age once per batch, and ISO strings are parsed through a process-wide
+    cache so timestamps repeated across batches are parsed once.
+    """
+
+    def shard_config(self, config: Optional[dict] = None) -> dict:
+        """Pin the default reference time so every shard measures age from the same instant."""
+        cfg = dict(config or {})
+        cfg.setdefault("reference_time", datetime.now(timezone.utc).isoformat())
+        return cfg
 
+    def init(self, column: Optional[str] = None, config: Optional[dict] = None) -> TimelinessState:
+        """Create empty state for a timeliness rule, fixing the reference time."""
         cfg = config or {}
         max_age_hours = cfg.get("max_age_hours", 24)
         ref_time_str = cfg.get("reference_time")
         ref_time = datetime.fromisoformat(ref_time_str) if ref_time_str else datetime.now(timezone.utc)
-        threshold = timedelta(hours=max_age_hours)
+        return TimelinessState(column, ref_time, timedelta(hours=max_age_hours), cfg.get("mode") == "max_only")
+
+    def update(self, state: TimelinessState, batch: list[dict] | ColumnarDataset) -> None:
+        """Count timely values in a batch."""
+        if not state.column:
+            return
+        dataset = as_columnar(batch, [state.column])
+        state.total += len(dataset)
+        if _update_arrow(state, dataset.arrow_column(state.column)):
+            return
+        counts = dataset.value_counts(state.column)
+        if counts is None:
+            _update_values(state, dataset.column(state.column))
+        else:
+            _update_counts(state, counts)
+
+    def update_newest(self, state: TimelinessState, newest: Any) -> None:
+        """Fold the newest timestamp of the data, as reported by source metadata, instead of its rows.
+
+        Args:
+            state: State of a ``max_only`` rule.
+            newest: Newest timestamp (datetime or ISO string); None when unknown.
+        """
+        age = _age(state.ref_time, newest) if newest is not None else None
+        if age is not None:
+            _fold_ages(state, age // MICROSECOND, age // MICROSECOND)
+
+    def merge(self, state: TimelinessState, other: TimelinessState) -> TimelinessState:
+        """Combine counts from another shard (both must share the reference time fixed by ``init``)."""
+        state.total += other.total
+        state.timely += other.timely
+        if other.max_age_us is not None:
+            _fold_ages(state, other.min_age_us, other.max_age_us)
+        state.age_buckets.update(other.age_buckets)
+        return state
+
+    def finalize(self, state: TimelinessState) -> tuple[float, dict]:
+        """Timeliness percentage (0-100) and the age distribution."""
+        if state.max_only:
+            if state.min_age_us is None:
+                return 0.0, {}
+            score = 100.0 if state.min_age_us <= state.threshold // MICROSECOND else 0.0
+            return score, {"lag_hours": round(state.min_age_us / 1e6 / HOUR_SECONDS, 4)}
+        score = (state.timely / state.total) * 100.0 if state.total > 0 else 0.0
+        if state.max_age_us is None:
+            return score, {}
+        details = {
+            "max_lag_hours": round(state.max_age_us / 1e6 / HOUR_SECONDS, 4),
+            "p50_age_hours": round(_age_percentile(state.age_buckets, 0.50) / HOUR_SECONDS, 4),
+            "p99_age_hours": round(_age_percentile(state.age_buckets, 0.99) / HOUR_SECONDS, 4),
+        }
+        return score, details
+
+
+@lru_cache(maxsize=65536)
+def _parse_timestamp(text: str) -> Optional[datetime]:
+    """Parse an ISO timestamp once per process, or None if it is not one."""
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
 
-        total = len(data)
-        timely = 0
 
-        for row in data:
-            value = row.get(column)
-            if value is None:
-                continue
+def _age(ref_time: datetime, value: Any) -> Optional[timedelta]:
+    """Age of ``value`` at the reference time, or None if it has no comparable timestamp."""
+    try:
+        if isinstance(value, str):
+            ts = _parse_timestamp(value)
+        elif isinstance(value, datetime):
+            ts = value
+        else:
+            return None
+        return ref_time - ts if ts is not None else None
+    except TypeError:  # naive vs. aware
+        return None
+
+
+def _age_bucket(age_seconds: float) -> int:
+    """Log-spaced histogram bucket of an age, signed so future timestamps sort first."""
+    bucket = math.ceil(math.log(abs(age_seconds) + 1.0) / AGE_BUCKET_STEP)
+    return -bucket if age_seconds < 0 else bucket
+
+
+def _age_percentile(buckets: Counter, fraction: float) -> float:
+    """Nearest-rank percentile of the histogrammed ages, in seconds (the bucket's upper edge)."""
+    rank = max(1, math.ceil(fraction * sum(buckets.values())))
+    seen = 0
+    for bucket in sorted(buckets):
+        seen += buckets[bucket]
+        if seen >= rank:
+            return math.copysign(math.expm1(abs(bucket) * AGE_BUCKET_STEP), bucket)
+    return 0.0
+
+
+def _update_counts(state: TimelinessState, counts: Counter) -> None:
+    """Fold a batch's value counts into the state, computing each distinct value's age once."""
+    ref_time, threshold = state.ref_time, state.threshold
+    ages = [(age, n) for (_, value), n in counts.items() if (age := _age(ref_time, value)) is not None]
+    if not ages:
+        return
+    state.timely += sum(n for age, n in ages if age <= threshold)
+    _fold_ages(state, min(age for age, _ in ages) // MICROSECOND, max(age for age, _ in ages) // MICROSECOND)
+    for age, n in ages:
+        state.age_buckets[_age_bucket(age.total_seconds())] += n
+
+
+def _update_values(state: TimelinessState, values: list) -> None:
+    """Fold a batch of mostly distinct values into the state, a cache-sized chunk at a time."""
+    ref_time, parse = state.ref_time, datetime.fromisoformat
+    for start in range(0, len(values), AGE_CHUNK_ROWS):
+        ages = []
+        append = ages.append
+        for value in values[start : start + AGE_CHUNK_ROWS]:  # _age, inlined: this loop runs once per row
             try:
                 if isinstance(value, str):
-                    ts = datetime.fromisoformat(value)
+                    append(ref_time - parse(value))
                 elif isinstance(value, datetime):
-                    ts = value
-                else:
-                    continue
-                if (ref_time - ts) <= threshold:
-                    timely += 1
+                    append(ref_time - value)
             except (ValueError, TypeError):
                 pass
+        if not ages:
+            continue
+        if pa is not None:
+            _update_age_array(state, pa.array(ages, pa.duration("us")).cast(pa.int64()))
+            continue
+        threshold = state.threshold
+        state.timely += sum(1 for age in ages if age <= threshold)
+        _fold_ages(state, min(ages) // MICROSECOND, max(ages) // MICROSECOND)
+        state.age_buckets.update(_age_bucket(age.total_seconds()) for age in ages)
+
+
+def _update_arrow(state: TimelinessState, values: Any) -> bool:
+    """Vectorized update for Arrow timestamp columns; returns False if ``values`` is not one."""
+    if values is None or not pa.types.is_timestamp(values.type) or values.type.unit == "ns":
+        return False  # nanosecond values become pandas Timestamps on the row path
+    if (values.type.tz is None) != (state.ref_time.utcoffset() is None):
+        return True  # naive vs. aware: nothing is comparable, as on the row path
+    import pyarrow.compute as pc
+
+    ref_time = state.ref_time
+    if ref_time.utcoffset() is not None:
+        ref_time = ref_time.astimezone(timezone.utc).replace(tzinfo=None)
+    ref_us = (ref_time - EPOCH) // MICROSECOND
+    epoch_us = pc.cast(pc.cast(values, pa.timestamp("us", values.type.tz)), pa.int64())
+    _update_age_array(state, pc.drop_null(pc.subtract(pa.scalar(ref_us, pa.int64()), epoch_us)))
+    return True
+
+
+def _update_age_array(state: TimelinessState, ages_us: Any) -> None:
+    """Fold an int64 Arrow array of non-null ages in microseconds into the state."""
+    if len(ages_us) == 0:
+        return
+    import pyarrow.compute as pc
+
+    state.timely += pc.sum(pc.less_equal(ages_us, state.threshold // MICROSECOND)).as_py() or 0
+    bounds = pc.min_max(ages_us).as_py()
+    _fold_ages(state, bounds["min"], bounds["max"])
+    seconds = pc.divide(pc.cast(ages_us, pa.float64()), 1e6)
+    magnitude = pc.ceil(pc.divide(pc.ln(pc.add(pc.abs(seconds), 1.0)), AGE_BUCKET_STEP))
+    for entry in pc.value_counts(pc.cast(pc.multiply(pc.sign(seconds), magnitude), pa.int64())).to_pylist():
+        state.age_buckets[entry["values"]] += entry["counts"]
+
 
-        return (timely / total) * 100.0 if total > 0 else 0.0
+def _fold_ages(state: TimelinessState, min_age_us: int, max_age_us: int) -> None:
+    """Widen the state's age range (newest and oldest timestamp) to include another one."""
+    if state.max_age_us is None:
+        state.min_age_us, state.max_age_us = min_age_us, max_age_us
+    else:
+        state.min_age_us = min(state.min_age_us, min_age_us)
+        state.max_age_us = max(state.max_age_us, max_age_us)
@@ -3,34 +3,139 @@
 Measures the percentage of unique (non-duplicate) values in a column.
 """
 
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
 
+from engine.dataset import ColumnarDataset, as_columnar
+from engine.dimensions.base import DimensionCalculator
+from engine.sketches import HyperLogLog
+from engine.spill import SpilledKeyCounter
 
-class UniquenessCalculator:
-    """Calculate data uniqueness (distinct ratio)."""
+KEY_BATCH_ROWS = 65536
 
-    def calculate(self, data: list[dict], column: Optional[str] = None, config: Optional[dict] = None) -> float:
-        """Calculate uniqueness score for a column.
 
-        Args:
-            data: List of row dicts.
-            column: Column name to check.
-            config: Optional config (e.g., composite_keys for multi-column uniqueness).
+@dataclass
+class UniquenessState:
+    """Running key tracking for one uniqueness rule (set, sketch, or spill counter)."""
 
-        Returns:
-            Uniqueness percentage (0-100).
-        """
-        if not data:
-            return 0.0
+    columns: list[str]
+    total: int = 0
+    seen: Optional[set] = None
+    sketch: Optional[HyperLogLog] = None
+    spill: Optional[SpilledKeyCounter] = None
+    memory_limit_mb: float = 512
+    details: dict = field(default_factory=dict)
 
-        columns = (config or {}).get("composite_keys", [column] if column else [])
-        if not columns:
-            return 0.0
 
-        total = len(data)
-        seen: set[tuple] = set()
-        for row in data:
-            key = tuple(row.get(c) for c in columns)
-            seen.add(key)
+class UniquenessCalculator(DimensionCalculator):
+    """Calculate data uniqueness (distinct ratio).
 
-        return (len(seen) / total) * 100.0 if total > 0 else 0.0
+    Config options:
+        composite_keys: Columns that together form the key.
+        approximate: Estimate the distinct count with a HyperLogLog sketch
+            instead of an exact set (default: False).
+        precision: HyperLogLog precision, 4-18 (default: 14, ~0.8% error).
+        spill_to_disk: Count keys exactly via hash-partitioned bucket files
+            instead of an in-memory set (default: False).
+        memory_limit_mb: Memory budget for spill_to_disk counting (default: 512).
+        sample_size: Max duplicate keys reported in details (default: 10).
+        spill_dir: Directory for bucket files (default: system temp dir).
+    """
+
+    def required_columns(self, column: Optional[str] = None, config: Optional[dict] = None) -> list[str]:
+        """Columns read by this calculator."""
+        return list((config or {}).get("composite_keys", [column] if column else []))
+
+    def init(self, column: Optional[str] = None, config: Optional[dict] = None) -> UniquenessState:
+        """Create empty state for a uniqueness rule."""
+        cfg = config or {}
+        state = UniquenessState(self.required_columns(column, cfg))
+        if cfg.get("approximate"):
+            state.sketch = HyperLogLog(cfg.get("precision", 14))
+        elif cfg.get("spill_to_disk"):
+            state.memory_limit_mb = cfg.get("memory_limit_mb", 512)
+            state.spill = SpilledKeyCounter(state.memory_limit_mb, cfg.get("sample_size", 10), cfg.get("spill_dir"))
+        else:
+            state.seen = set()
+        return state
+
+    def update(self, state: UniquenessState, batch: list[dict] | ColumnarDataset) -> None:
+        """Track the keys of a batch."""
+        if not state.columns:
+            return
+        dataset = as_columnar(batch, state.columns)
+        state.total += len(dataset)
+
+        if state.sketch is not None:
+            for keys in _iter_keys(dataset, state.columns):
+                state.sketch.add_many(keys)
+        elif state.spill is not None:
+            for keys in _iter_keys(dataset, state.columns):
+                state.spill.add_many(keys)
+        else:
+            arrow_values = dataset.arrow_column(state.columns[0]) if len(state.columns) == 1 else None
+            if arrow_values is not None and not _has_nan(arrow_values):
+                import pyarrow.compute as pc
+
+                state.seen.update(pc.unique(arrow_values).to_pylist())
+            elif len(state.columns) == 1:
+                state.seen.update(dataset.column(state.columns[0]))
+            else:
+                state.seen.update(zip(*(dataset.column(c) for c in state.columns)))
+
+    def merge(self, state: UniquenessState, other: UniquenessState) -> UniquenessState:
+        """Combine keys from another shard (set union, register max, or bucket files)."""
+        state.total += other.total
+        if state.sketch is not None:
+            state.sketch.merge(other.sketch)
+        elif state.spill is not None:
+            state.spill.merge(other.spill)
+        else:
+            state.seen |= other.seen
+        return state
+
+    def finalize(self, state: UniquenessState) -> tuple[float, dict]:
+        """Uniqueness percentage (0-100) and mode-specific details."""
+        if state.sketch is not None:
+            estimate = state.sketch.estimate()
+            details = {
+                "method": "hyperloglog",
+                "estimated_distinct": round(estimate),
+                "precision": state.sketch.precision,
+                "relative_error": round(state.sketch.relative_error, 6),
+            }
+            return (min((estimate / state.total) * 100.0, 100.0) if state.total > 0 else 0.0), details
+
+        if state.spill is not None:
+            with state.spill:
+                stats = state.spill.finish()
+            distinct = stats.distinct_keys
+            details = {
+                "method": "spill_to_disk",
+                "distinct_count": distinct,
+                "duplicate_keys": stats.duplicate_keys,
+                "duplicate_rows": stats.total_keys - distinct,
+                "sample_duplicates": stats.sample_duplicates,
+                "memory_limit_mb": state.memory_limit_mb,
+            }
+            return ((distinct / state.total) * 100.0 if state.total > 0 else 0.0), details
+
+        distinct = len(state.seen) if state.seen is not None else 0
+        return ((distinct / state.total) * 100.0 if state.total > 0 else 0.0), {}
+
+
+def _iter_keys(dataset: ColumnarDataset, columns: list[str]) -> Iterator[Any]:
+    """Yield the keys of a dataset one bounded slice at a time."""
+    for batch in dataset.iter_slices(KEY_BATCH_ROWS):
+        if len(columns) == 1:
+            yield batch.column(columns[0])
+        else:
+            yield zip(*(batch.column(c) for c in columns))
+
+
+def _has_nan(values: Any) -> bool:
+    """Whether a float Arrow column holds NaN (which Arrow dedups but Python sets do not)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    return pa.types.is_floating(values.type) and bool(pc.any(pc.is_nan(values)).as_py())
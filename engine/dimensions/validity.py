@@ -4,7 +4,15 @@ Validates data against schema constraints, types, and format rules.
 """
 
 import re
-from typing import Optional
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Any, Iterable, Optional
+
+from engine.dataset import ColumnarDataset, as_columnar
+from engine.dimensions.base import DimensionCalculator
+from engine.formats import ARROW_PATTERNS
+from engine.patterns import compile_pattern
+from engine.reference import ValueSet, allowed_value_set, reference_values
 
 BUILTIN_FORMATS = {
     "email": r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$",
@@ -14,64 +22,129 @@ BUILTIN_FORMATS = {
     "date_iso": r"^\d{4}-\d{2}-\d{2}$",
 }
 
+TYPE_MAP = {"str": str, "int": int, "float": (int, float), "bool": bool}
 
-class ValidityCalculator:
-    """Calculate data validity against schema/format rules."""
-
-    def calculate(self, data: list[dict], column: Optional[str] = None, config: Optional[dict] = None) -> float:
-        """Calculate validity score for a column.
-
-        Config options:
-            expected_type: Python type name (str, int, float, bool).
-            format: Built-in format name or custom regex.
-            allowed_values: List of valid values.
-            not_null: Whether nulls are invalid (default: False).
-
-        Returns:
-            Validity percentage (0-100).
-        """
-        if not data or not column:
-            return 0.0
-
-        cfg = config or {}
-        expected_type = cfg.get("expected_type")
-        fmt = cfg.get("format")
-        allowed = cfg.get("allowed_values")
-        not_null = cfg.get("not_null", False)
-
-        pattern = None
-        if fmt:
-            regex = BUILTIN_FORMATS.get(fmt, fmt)
-            pattern = re.compile(regex)
-
-        type_map = {"str": str, "int": int, "float": (int, float), "bool": bool}
 
-        total = len(data)
-        valid = 0
+@dataclass
+class ValidityState:
+    """Prepared checks and running counts for one validity rule."""
 
-        for row in data:
-            value = row.get(column)
+    column: Optional[str]
+    expected_type: Any
+    pattern: Optional[re.Pattern]
+    allowed: Any
+    not_null: bool
+    arrow_pattern: Optional[str] = None
+    total: int = 0
+    valid: int = 0
 
-            if value is None:
-                if not not_null:
-                    valid += 1
-                continue
 
-            is_valid = True
+class ValidityCalculator(DimensionCalculator):
+    """Calculate data validity against schema/format rules.
 
-            if expected_type and expected_type in type_map:
-                if not isinstance(value, type_map[expected_type]):
-                    is_valid = False
+    Config options:
+        expected_type: Python type name (str, int, float, bool).
+        format: Built-in format name or custom regex.
+        allowed_values: List of valid values, or the reference column that
+            holds them (see ``AccuracyCalculator``).
+        not_null: Whether nulls are invalid (default: False).
 
-            if pattern and is_valid:
-                if not pattern.match(str(value)):
-                    is_valid = False
+    Format checks run once per distinct value of each batch (see
+    ``ColumnarDataset.value_counts``) with patterns compiled once per process.
+    Builtin formats on Arrow string columns are checked in one vectorized
+    pass with the RE2 patterns from ``engine.formats``, and allowed values,
+    hashed once per process, with one vectorized membership test.
+    """
 
-            if allowed is not None and is_valid:
-                if value not in allowed:
-                    is_valid = False
+    def shard_config(self, config: Optional[dict] = None) -> Optional[dict]:
+        """Load allowed values from their reference column once, in the parent, so shards get the list."""
+        if not isinstance((config or {}).get("allowed_values"), dict):
+            return config
+        return {**config, "allowed_values": list(reference_values(config["allowed_values"]).values)}
 
-            if is_valid:
-                valid += 1
-
-        return (valid / total) * 100.0 if total > 0 else 0.0
+    def init(self, column: Optional[str] = None, config: Optional[dict] = None) -> ValidityState:
+        """Create empty state for a validity rule."""
+        cfg = config or {}
+        fmt = cfg.get("format")
+        return ValidityState(
+            column=column,
+            expected_type=TYPE_MAP.get(cfg.get("expected_type")) if cfg.get("expected_type") else None,
+            pattern=compile_pattern(BUILTIN_FORMATS.get(fmt, fmt)) if fmt else None,
+            allowed=allowed_value_set(cfg.get("allowed_values")),
+            not_null=cfg.get("not_null", False),
+            arrow_pattern=ARROW_PATTERNS.get(fmt) if fmt else None,
+        )
+
+    def update(self, state: ValidityState, batch: list[dict] | ColumnarDataset) -> None:
+        """Count valid values in a batch."""
+        if not state.column:
+            return
+        dataset = as_columnar(batch, [state.column])
+        state.total += len(dataset)
+        if state.arrow_pattern and state.expected_type in (None, str) and state.allowed is None:
+            valid = _count_valid_arrow(state, dataset.arrow_column(state.column))
+            if valid is not None:
+                state.valid += valid
+                return
+        if isinstance(state.allowed, ValueSet) and state.expected_type is None and state.pattern is None:
+            valid = _count_allowed_arrow(state, dataset.arrow_column(state.column))
+            if valid is not None:
+                state.valid += valid
+                return
+        counts = dataset.value_counts(state.column) if state.pattern or state.allowed is not None else None
+        if counts is None:
+            state.valid += _count_valid(state, zip(dataset.column(state.column), repeat(1)))
+        else:
+            state.valid += _count_valid(state, ((value, n) for (_, value), n in counts.items()))
+
+    def merge(self, state: ValidityState, other: ValidityState) -> ValidityState:
+        """Combine counts from another shard."""
+        state.total += other.total
+        state.valid += other.valid
+        return state
+
+    def finalize(self, state: ValidityState) -> tuple[float, dict]:
+        """Validity percentage (0-100)."""
+        return ((state.valid / state.total) * 100.0 if state.total > 0 else 0.0), {}
+
+
+def _count_valid(state: ValidityState, pairs: Iterable[tuple[Any, int]]) -> int:
+    """Sum the counts of the values that pass the rule's null, type, format and allowed-value checks."""
+    expected_type, pattern, allowed, not_null = state.expected_type, state.pattern, state.allowed, state.not_null
+    valid = 0
+    for value, n in pairs:
+        if value is None:
+            if not not_null:
+                valid += n
+            continue
+        if expected_type and not isinstance(value, expected_type):
+            continue
+        if pattern and not pattern.match(str(value)):
+            continue
+        if allowed is not None and value not in allowed:
+            continue
+        valid += n
+    return valid
+
+
+def _count_valid_arrow(state: ValidityState, values: Any) -> Optional[int]:
+    """Count valid values of an Arrow string column with the format's RE2 pattern, or None if not applicable."""
+    if values is None:
+        return None
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if not (pa.types.is_string(values.type) or pa.types.is_large_string(values.type)):
+        return None
+    matched = pc.sum(pc.match_substring_regex(values, state.arrow_pattern)).as_py() or 0
+    return matched + (0 if state.not_null else values.null_count)
+
+
+def _count_allowed_arrow(state: ValidityState, values: Any) -> Optional[int]:
+    """Count valid values of an Arrow column with a vectorized allowed-value test, or None if not applicable."""
+    if values is None:
+        return None
+    allowed = state.allowed.count_in(values)
+    if allowed is None:
+        return None
+    return allowed + (0 if state.not_null else values.null_count)
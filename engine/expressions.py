@@ -0,0 +1,615 @@
+"""Safe cross-column expressions for consistency rules.
+
+A consistency rule's ``rule`` is an expression over a row's columns, e.g.::
+
+    start_date <= end_date and (discount is None or discount < price * 0.5)
+
+It is parsed once with :mod:`ast`, accepting only this subset of Python:
+
+- column names, ``col("any name")``, and string, number, bool and None literals
+- arithmetic ``+ - * / %`` and unary ``-``
+- comparisons ``< <= > >= == !=`` (chains such as ``a < b < c`` included)
+  and ``in``/``not in`` a list of literals
+- ``and``, ``or``, ``not`` and ``x if condition else y``
+- null tests ``x is None`` and ``x is not None``
+- the functions in ``FUNCTIONS``
+
+Values follow SQL null semantics: an operation on a null is null, ``and``,
+``or`` and ``not`` use three-valued logic, and a row satisfies the
+expression only when it evaluates to true. Operations Python cannot
+perform on a row's values (comparing a string with a number, dividing by
+zero) are null rather than errors.
+
+:class:`Expression` evaluates a batch a column at a time: with Arrow
+kernels when every column it reads is Arrow-backed, otherwise in Python.
+Arrow kernels are only applied to types on which they give Python's
+answer; if any part of the expression does not qualify, the batch is
+evaluated in Python. ``engine.pushdown`` translates expressions to SQL.
+"""
+
+import ast
+import operator
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from engine.dataset import ColumnarDataset, pa
+
+DAY = timedelta(days=1)
+DAY_US = 86_400_000_000
+
+# Function name -> (minimum, maximum) number of arguments (None: any number).
+FUNCTIONS: dict[str, tuple[int, Optional[int]]] = {
+    "coalesce": (1, None),
+    "abs": (1, 1),
+    "length": (1, 1),
+    "date": (1, 1),
+    "year": (1, 1),
+    "month": (1, 1),
+    "day": (1, 1),
+    "days_between": (2, 2),
+}
+
+PYTHON_ARITHMETIC: dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "%": operator.mod,
+}
+
+PYTHON_COMPARISONS: dict[str, Callable[[Any, Any], Any]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_ARROW_ARITHMETIC = {"+": "add_checked", "-": "subtract_checked", "*": "multiply_checked"}
+_ARROW_COMPARISONS = {
+    "<": "less",
+    "<=": "less_equal",
+    ">": "greater",
+    ">=": "greater_equal",
+    "==": "equal",
+    "!=": "not_equal",
+}
+_BINARY_OPS = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/", ast.Mod: "%"}
+_COMPARE_OPS = {ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "==", ast.NotEq: "!="}
+
+# Errors that make a row's value null instead of failing the check.
+_VALUE_ERRORS = (TypeError, ValueError, ArithmeticError)
+
+
+class _Unsupported(Exception):
+    """An Arrow kernel would not give Python's answer; the batch is evaluated in Python."""
+
+
+class Node(ABC):
+    """Node of a parsed expression.
+
+    ``python`` evaluates it over Python column lists; ``arrow`` over Arrow
+    arrays, returning an array or scalar or raising ``_Unsupported``.
+    """
+
+    @abstractmethod
+    def children(self) -> tuple["Node", ...]:
+        """Operand nodes, in evaluation order."""
+
+    @abstractmethod
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        """Value of the node for each of ``num_rows`` rows of Python column lists."""
+
+    @abstractmethod
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        """Value of the node over Arrow arrays; raises ``_Unsupported`` where Arrow would differ from Python."""
+
+
+@dataclass(frozen=True)
+class Column(Node):
+    name: str
+
+    def children(self) -> tuple[Node, ...]:
+        return ()
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        return columns[self.name]
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        return columns[self.name]
+
+
+@dataclass(frozen=True)
+class Literal(Node):
+    value: Any
+
+    def children(self) -> tuple[Node, ...]:
+        return ()
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        return [self.value] * num_rows
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        return pa.scalar(self.value)
+
+
+@dataclass(frozen=True)
+class Negate(Node):
+    operand: Node
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.operand,)
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        return _map(operator.neg, self.operand.python(columns, num_rows))
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        import pyarrow.compute as pc
+
+        value, _ = _numeric(self.operand.arrow(columns), pa.scalar(0))
+        return pc.negate_checked(value)
+
+
+@dataclass(frozen=True)
+class Arithmetic(Node):
+    op: str
+    left: Node
+    right: Node
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.left, self.right)
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        fn = PYTHON_ARITHMETIC[self.op]
+        return _map(fn, self.left.python(columns, num_rows), self.right.python(columns, num_rows))
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        import pyarrow.compute as pc
+
+        left, right = _numeric(self.left.arrow(columns), self.right.arrow(columns))
+        if self.op == "/":
+            left, right = pc.cast(left, pa.float64()), pc.cast(right, pa.float64())  # safe: exact or raises
+            return pc.if_else(pc.equal(right, 0.0), pa.scalar(None, pa.float64()), pc.divide(left, right))
+        if self.op not in _ARROW_ARITHMETIC:
+            raise _Unsupported  # Arrow has no modulo with Python's sign rules
+        return pc.call_function(_ARROW_ARITHMETIC[self.op], [left, right])
+
+
+@dataclass(frozen=True)
+class Compare(Node):
+    op: str
+    left: Node
+    right: Node
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.left, self.right)
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        fn = PYTHON_COMPARISONS[self.op]
+        return _map(fn, self.left.python(columns, num_rows), self.right.python(columns, num_rows))
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        import pyarrow.compute as pc
+
+        left, right = _unify(self.left.arrow(columns), self.right.arrow(columns))
+        return pc.call_function(_ARROW_COMPARISONS[self.op], [left, right])
+
+
+@dataclass(frozen=True)
+class Logical(Node):
+    op: str  # "and" or "or"
+    operands: tuple[Node, ...]
+
+    def children(self) -> tuple[Node, ...]:
+        return self.operands
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        decisive = self.op == "or"  # the operand value that decides the result
+        results = []
+        for values in zip(*(operand.python(columns, num_rows) for operand in self.operands)):
+            result: Optional[bool] = not decisive
+            for value in values:
+                if value is None:
+                    result = None
+                elif bool(value) is decisive:
+                    result = decisive
+                    break
+            results.append(result)
+        return results
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        import pyarrow.compute as pc
+
+        kernel = pc.and_kleene if self.op == "and" else pc.or_kleene
+        result = _boolean(self.operands[0].arrow(columns))
+        for operand in self.operands[1:]:
+            result = kernel(result, _boolean(operand.arrow(columns)))
+        return result
+
+
+@dataclass(frozen=True)
+class Not(Node):
+    operand: Node
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.operand,)
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        return [None if value is None else not value for value in self.operand.python(columns, num_rows)]
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        import pyarrow.compute as pc
+
+        return pc.invert(_boolean(self.operand.arrow(columns)))
+
+
+@dataclass(frozen=True)
+class IsNull(Node):
+    operand: Node
+    negated: bool = False
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.operand,)
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        return [(value is None) is not self.negated for value in self.operand.python(columns, num_rows)]
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        import pyarrow.compute as pc
+
+        value = self.operand.arrow(columns)
+        return pc.is_valid(value) if self.negated else pc.is_null(value)
+
+
+@dataclass(frozen=True)
+class InList(Node):
+    operand: Node
+    values: tuple
+    negated: bool = False
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.operand,)
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        values, negated = self.values, self.negated
+        return [
+            None if value is None else (value in values) is not negated
+            for value in self.operand.python(columns, num_rows)
+        ]
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        import pyarrow.compute as pc
+
+        value = self.operand.arrow(columns)
+        if isinstance(value, pa.Scalar):
+            raise _Unsupported
+        value_set = pa.array(list(self.values))
+        if value_set.type != value.type:
+            if not pa.types.is_null(value_set.type) and not _same_kind(value_set.type, value.type):
+                raise _Unsupported  # e.g. 1 in ("1",): Arrow would cast, Python compares by type
+            value_set = pc.cast(value_set, value.type)
+        found = pc.if_else(pc.is_valid(value), pc.is_in(value, value_set=value_set), pa.scalar(None, pa.bool_()))
+        return pc.invert(found) if self.negated else found
+
+
+@dataclass(frozen=True)
+class IfElse(Node):
+    condition: Node
+    then: Node
+    otherwise: Node
+
+    def children(self) -> tuple[Node, ...]:
+        return (self.condition, self.then, self.otherwise)
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        return [
+            then if condition else otherwise
+            for condition, then, otherwise in zip(
+                self.condition.python(columns, num_rows),
+                self.then.python(columns, num_rows),
+                self.otherwise.python(columns, num_rows),
+            )
+        ]
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        import pyarrow.compute as pc
+
+        condition = pc.fill_null(_boolean(self.condition.arrow(columns)), False)
+        then, otherwise = _unify(self.then.arrow(columns), self.otherwise.arrow(columns))
+        return pc.if_else(condition, then, otherwise)
+
+
+@dataclass(frozen=True)
+class Call(Node):
+    function: str
+    args: tuple[Node, ...]
+
+    def children(self) -> tuple[Node, ...]:
+        return self.args
+
+    def python(self, columns: dict[str, list], num_rows: int) -> list:
+        args = [arg.python(columns, num_rows) for arg in self.args]
+        if self.function == "coalesce":
+            return [next((value for value in values if value is not None), None) for values in zip(*args)]
+        return _map(_PYTHON_FUNCTIONS[self.function], *args)
+
+    def arrow(self, columns: dict[str, Any]) -> Any:
+        import pyarrow.compute as pc
+
+        args = [arg.arrow(columns) for arg in self.args]
+        if self.function == "coalesce":
+            common = args[0]
+            for arg in args[1:]:
+                common, _ = _unify(common, arg)
+            return pc.coalesce(*(_unify(common, arg)[1] for arg in args))
+        value = args[0]
+        if self.function == "abs":
+            return pc.abs_checked(_numeric(value, pa.scalar(0))[0])
+        if self.function == "length":
+            if not (pa.types.is_string(value.type) or pa.types.is_large_string(value.type)):
+                raise _Unsupported
+            return pc.utf8_length(value)
+        if self.function == "days_between":
+            return _arrow_days_between(args[0], args[1])
+        if not _naive_temporal(value.type):
+            raise _Unsupported
+        if self.function == "date":
+            return value if pa.types.is_date32(value.type) else pc.floor_temporal(value, unit="day").cast(pa.date32())
+        return pc.call_function(self.function, [value])  # year, month, day
+
+
+class Expression:
+    """A parsed expression, ready to count the rows of each batch that satisfy it.
+
+    Attributes:
+        text: The expression as written in the rule.
+        root: Root node of the parsed expression.
+        columns: Names of the columns it reads, in first-seen order.
+    """
+
+    def __init__(self, text: str, root: Node) -> None:
+        self.text = text
+        self.root = root
+        self.columns = list(dict.fromkeys(_column_names(root)))
+
+    def evaluate(self, dataset: ColumnarDataset) -> list:
+        """Value of the expression for each row of a batch, in Python."""
+        columns = {name: dataset.column(name) for name in self.columns}
+        return self.root.python(columns, len(dataset))
+
+    def count(self, dataset: ColumnarDataset) -> int:
+        """Number of rows of a batch for which the expression is true."""
+        if pa is not None:
+            arrays = {name: dataset.arrow_column(name) for name in self.columns}
+            if all(array is not None for array in arrays.values()):
+                try:
+                    return _count_true(self.root.arrow(arrays), len(dataset))
+                except (_Unsupported, pa.ArrowException, ArithmeticError):
+                    pass
+        return sum(1 for value in self.evaluate(dataset) if value)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(text: str) -> Expression:
+    """Parse an expression once per process.
+
+    Raises:
+        ValueError: If the text is not an expression in the supported subset.
+    """
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {text!r}: {e.msg}") from None
+    return Expression(text, _parse(tree.body))
+
+
+def _parse(node: ast.AST) -> Node:
+    """Convert a Python AST node into an expression node, rejecting anything outside the subset."""
+    if isinstance(node, ast.Name):
+        return Column(node.id)
+    if isinstance(node, ast.Constant):
+        return Literal(_literal_value(node))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return Not(_parse(node.operand))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        folded = _negative_literal(node)
+        return Literal(folded.value) if isinstance(folded, ast.Constant) else Negate(_parse(node.operand))
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        return Arithmetic(_BINARY_OPS[type(node.op)], _parse(node.left), _parse(node.right))
+    if isinstance(node, ast.BoolOp):
+        return Logical("and" if isinstance(node.op, ast.And) else "or", tuple(_parse(value) for value in node.values))
+    if isinstance(node, ast.Compare):
+        left = node.left
+        parts = []
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(_parse_comparison(left, op, right))
+            left = right
+        return parts[0] if len(parts) == 1 else Logical("and", tuple(parts))
+    if isinstance(node, ast.IfExp):
+        return IfElse(_parse(node.test), _parse(node.body), _parse(node.orelse))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        return _parse_call(node.func.id, node.args)
+    raise ValueError(f"Unsupported syntax in expression: {ast.unparse(node)!r}")
+
+
+def _parse_comparison(left: ast.AST, op: ast.cmpop, right: ast.AST) -> Node:
+    if type(op) in _COMPARE_OPS:
+        return Compare(_COMPARE_OPS[type(op)], _parse(left), _parse(right))
+    if isinstance(op, (ast.Is, ast.IsNot)):
+        if not (isinstance(right, ast.Constant) and right.value is None):
+            raise ValueError("'is' and 'is not' only compare with None")
+        return IsNull(_parse(left), negated=isinstance(op, ast.IsNot))
+    if isinstance(op, (ast.In, ast.NotIn)):
+        if not isinstance(right, (ast.List, ast.Tuple, ast.Set)):
+            raise ValueError("'in' needs a list of literals")
+        values = tuple(_literal_value(_negative_literal(element)) for element in right.elts)
+        if None in values:
+            raise ValueError("'in' lists cannot contain None")
+        return InList(_parse(left), values, negated=isinstance(op, ast.NotIn))
+    raise ValueError(f"Unsupported comparison in expression: {type(op).__name__}")
+
+
+def _parse_call(name: str, args: list[ast.AST]) -> Node:
+    if name == "col":
+        if len(args) != 1 or not isinstance(args[0], ast.Constant) or not isinstance(args[0].value, str):
+            raise ValueError("col() takes one column name string")
+        return Column(args[0].value)
+    if name not in FUNCTIONS:
+        raise ValueError(f"Unknown function in expression: {name}()")
+    low, high = FUNCTIONS[name]
+    if len(args) < low or (high is not None and len(args) > high):
+        raise ValueError(f"Wrong number of arguments for {name}()")
+    return Call(name, tuple(_parse(arg) for arg in args))
+
+
+def _negative_literal(node: ast.AST) -> ast.AST:
+    """Fold ``-<number>`` into a constant, as written in ``in`` lists."""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+        if isinstance(node.operand.value, (int, float)) and not isinstance(node.operand.value, bool):
+            return ast.Constant(-node.operand.value)
+    return node
+
+
+def _literal_value(node: ast.AST) -> Any:
+    if not isinstance(node, ast.Constant) or not isinstance(node.value, (type(None), bool, int, float, str)):
+        raise ValueError(f"Unsupported literal in expression: {ast.unparse(node)!r}")
+    return node.value
+
+
+def _column_names(node: Node) -> list[str]:
+    if isinstance(node, Column):
+        return [node.name]
+    return [name for child in node.children() for name in _column_names(child)]
+
+
+def _map(fn: Callable[..., Any], *columns: list) -> list:
+    """Apply ``fn`` row by row; rows with a null argument or a failing value are null."""
+    results = []
+    append = results.append
+    for values in zip(*columns):
+        if None in values:
+            append(None)
+            continue
+        try:
+            append(fn(*values))
+        except _VALUE_ERRORS:
+            append(None)
+    return results
+
+
+def _temporal(value: Any) -> date:
+    """A date or datetime value, parsing ISO strings."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if isinstance(value, date):
+        return value
+    raise TypeError(f"not a date: {value!r}")
+
+
+def _to_date(value: Any) -> date:
+    value = _temporal(value)
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _length(value: Any) -> int:
+    if not isinstance(value, str):
+        raise TypeError(f"not a string: {value!r}")
+    return len(value)
+
+
+_PYTHON_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "abs": abs,
+    "length": _length,
+    "date": _to_date,
+    "year": lambda value: _temporal(value).year,
+    "month": lambda value: _temporal(value).month,
+    "day": lambda value: _temporal(value).day,
+    "days_between": lambda start, end: (_temporal(end) - _temporal(start)) / DAY,
+}
+
+
+def _count_true(result: Any, num_rows: int) -> int:
+    import pyarrow.compute as pc
+
+    if not pa.types.is_boolean(result.type):
+        raise _Unsupported  # truthiness of other types is left to Python
+    if isinstance(result, pa.Scalar):
+        return num_rows if result.as_py() else 0
+    return pc.sum(result).as_py() or 0
+
+
+def _boolean(value: Any) -> Any:
+    if not pa.types.is_boolean(value.type):
+        raise _Unsupported
+    return value
+
+
+def _same_kind(left: Any, right: Any) -> bool:
+    """Whether values of two Arrow types compare in Arrow as they do in Python."""
+    return (pa.types.is_integer(left) and pa.types.is_integer(right)) or (_is_text(left) and _is_text(right))
+
+
+def _is_text(arrow_type: Any) -> bool:
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+
+def _unify(left: Any, right: Any) -> tuple[Any, Any]:
+    """Cast two Arrow operands to one type on which Arrow kernels agree with Python."""
+    import pyarrow.compute as pc
+
+    lt, rt = left.type, right.type
+    if lt == rt:
+        return left, right
+    if pa.types.is_null(lt):
+        return pc.cast(left, rt), right
+    if pa.types.is_null(rt):
+        return left, pc.cast(right, lt)
+    if pa.types.is_integer(lt) and pa.types.is_integer(rt):
+        return pc.cast(left, pa.int64()), pc.cast(right, pa.int64())
+    if _is_number(lt) and _is_number(rt):  # integers must convert to float64 exactly, or the cast raises
+        return pc.cast(left, pa.float64()), pc.cast(right, pa.float64())
+    if _is_text(lt) and _is_text(rt):
+        return pc.cast(left, pa.large_string()), pc.cast(right, pa.large_string())
+    raise _Unsupported
+
+
+def _is_number(arrow_type: Any) -> bool:
+    return pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type)
+
+
+def _numeric(left: Any, right: Any) -> tuple[Any, Any]:
+    """Unify two numeric operands as int64 or float64, where Arrow arithmetic matches Python's."""
+    import pyarrow.compute as pc
+
+    left, right = _unify(left, right)
+    if pa.types.is_integer(left.type):
+        target = pa.int64()
+    elif pa.types.is_floating(left.type):
+        target = pa.float64()
+    else:
+        raise _Unsupported
+    return pc.cast(left, target), pc.cast(right, target)
+
+
+def _naive_temporal(arrow_type: Any) -> bool:
+    """Dates and naive timestamps that convert to Python datetimes exactly."""
+    if pa.types.is_date32(arrow_type):
+        return True
+    return pa.types.is_timestamp(arrow_type) and arrow_type.tz is None and arrow_type.unit != "ns"
+
+
+def _arrow_days_between(start: Any, end: Any) -> Any:
+    import pyarrow.compute as pc
+
+    if start.type != end.type or not _naive_temporal(start.type):
+        raise _Unsupported
+    if pa.types.is_date32(start.type):
+        days = pc.subtract_checked(pc.cast(end, pa.int32()), pc.cast(start, pa.int32()))
+        return pc.cast(days, pa.float64())
+    start_us = pc.cast(pc.cast(start, pa.timestamp("us")), pa.int64())
+    end_us = pc.cast(pc.cast(end, pa.timestamp("us")), pa.int64())
+    return pc.divide(pc.cast(pc.subtract_checked(end_us, start_us), pa.float64()), float(DAY_US))
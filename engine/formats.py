@@ -0,0 +1,29 @@
+"""Vectorized validators for the builtin validity formats.
+
+``ARROW_PATTERNS`` holds RE2 spellings of the patterns in
+``engine.dimensions.validity.BUILTIN_FORMATS`` for
+``pyarrow.compute.match_substring_regex``, so Arrow string columns are
+validated in one C++ pass without converting values to Python objects.
+
+Each RE2 pattern accepts exactly the strings that ``re.match`` accepts for
+the Python pattern, including Python's regex quirks: ``\\d`` matches any
+Unicode decimal digit (``\\p{Nd}``), ``\\s`` matches every character for
+which ``str.isspace()`` is true, and ``$`` also matches before a single
+trailing newline.
+"""
+
+# Every character for which str.isspace() is true, i.e. Python's Unicode \s.
+PYTHON_WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+    "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+
+_RE2_SPACE = "".join(f"\\x{{{ord(c):x}}}" for c in PYTHON_WHITESPACE)
+
+ARROW_PATTERNS: dict[str, str] = {
+    "email": r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\n?$",
+    "phone": r"^\+?[1-9]\p{Nd}{6,14}\n?$",
+    "url": rf"^https?://[^{_RE2_SPACE}]+\n?$",
+    "uuid": r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\n?$",
+    "date_iso": r"^\p{Nd}{4}-\p{Nd}{2}-\p{Nd}{2}\n?$",
+}
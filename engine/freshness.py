@@ -0,0 +1,65 @@
+"""Metadata-only freshness checks.
+
+Timeliness rules with ``mode: max_only`` only need the newest timestamp of
+a column (or, for a rule without a column, the table's last-modified time).
+Connectors report it from metadata through ``DataConnector.max_timestamp``:
+SQL ``MAX()``, Parquet footer statistics, the Delta transaction log, or
+Glue/BigQuery/object-store table metadata. Rules the connector cannot
+answer are scanned with the rest, where the calculator keeps the newest
+timestamp of the rows it reads.
+"""
+
+from typing import Any, Callable
+
+from engine.rule_engine import DIMENSION_CALCULATORS, CompiledRule, DQCheckResult, RuleDefinition, compile_rules
+
+
+def is_max_only(rule: RuleDefinition | CompiledRule) -> bool:
+    """Whether a rule only needs the newest timestamp of its column."""
+    return rule.dimension == "timeliness" and (rule.config or {}).get("mode") == "max_only"
+
+
+def run_checks_with_metadata(
+    rules: list[RuleDefinition],
+    connector: Any,
+    path: str,
+    run_rest: Callable[[list[RuleDefinition]], list[DQCheckResult]],
+) -> list[DQCheckResult]:
+    """Answer ``max_only`` freshness rules from source metadata and the remaining rules with ``run_rest``.
+
+    Args:
+        rules: List of rules to evaluate.
+        connector: Connected DataConnector for the source.
+        path: Table name or file path.
+        run_rest: Evaluates the rules metadata cannot answer, returning results in order.
+            It is not called when every rule was answered.
+
+    Returns:
+        List of DQCheckResult objects, in rule order.
+    """
+    calculator = DIMENSION_CALCULATORS["timeliness"]
+    compiled = compile_rules(rules).rules
+    measured: dict[tuple, tuple[float, dict]] = {}
+    for rule in compiled:
+        if not is_max_only(rule) or rule.key in measured:
+            continue
+        try:
+            newest = connector.max_timestamp(path, rule.column)
+        except Exception:  # unreadable metadata: scan instead
+            newest = None
+        if newest is None:
+            continue
+        state = calculator.init(rule.column, rule.config)
+        calculator.update_newest(state, newest)
+        measured[rule.key] = calculator.finalize(state)
+
+    rest = [definition for definition, rule in zip(rules, compiled) if rule.key not in measured]
+    scanned = iter(run_rest(rest) if rest else [])
+    results: list[DQCheckResult] = []
+    for rule in compiled:
+        if rule.key in measured:
+            metric_value, details = measured[rule.key]
+            results.append(rule.result(metric_value, dict(details)))
+        else:
+            results.append(next(scanned))
+    return results
@@ -0,0 +1,127 @@
+"""Multi-process rule execution.
+
+Batches of rows are evaluated in a process pool, each worker building its
+own accumulator states, and the partial states are merged back in the
+parent so results match a single-process run. With pyarrow installed,
+each batch's columns are written once to an Arrow IPC file that workers
+memory-map, so column buffers are shared through the page cache instead
+of being pickled through the pool's pipes. Columns that cannot be
+represented in Arrow (mixed Python types) are pickled with the task.
+
+Metrics can also be split into groups that are evaluated as separate
+tasks over the same shared batch, so a wide table (e.g. every column of a
+profile) is measured in parallel across columns as well as across batches.
+"""
+
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Iterable, Optional
+
+from engine.dataset import ColumnarDataset, as_columnar, pa
+from engine.rule_engine import DIMENSION_CALCULATORS
+
+# Metric spec sent to workers: rule key -> (dimension, column, config).
+Specs = dict[tuple, tuple[str, Optional[str], dict]]
+
+
+def accumulate_parallel(
+    specs: Specs, columns: list[str], batches: Iterable[Any], workers: int, spec_groups: int = 1
+) -> dict[tuple, Any]:
+    """Accumulate every metric over ``batches`` using a pool of ``workers`` processes.
+
+    Args:
+        specs: Metrics to compute, keyed by rule key.
+        columns: Columns read by the metrics (projected from list[dict] batches).
+        batches: Iterable of list[dict] or ColumnarDataset batches.
+        workers: Number of worker processes.
+        spec_groups: Number of tasks each batch's metrics are split into.
+
+    Returns:
+        Merged accumulator state per rule key, ready for ``finalize``.
+    """
+    specs = {
+        key: (dimension, column, DIMENSION_CALCULATORS[dimension].shard_config(config))
+        for key, (dimension, column, config) in specs.items()
+    }
+    groups = _group_specs(specs, spec_groups)
+    states: dict[tuple, Any] = {}
+    pending: deque[tuple[Future, Optional[str]]] = deque()
+    spool = tempfile.mkdtemp(prefix="dq-shards-")
+
+    def collect() -> None:
+        future, path = pending.popleft()
+        partial = future.result()
+        if path:  # only the batch's last task carries the path; the tasks before it are done
+            os.remove(path)
+        for key, state in partial.items():
+            if key in states:
+                DIMENSION_CALCULATORS[specs[key][0]].merge(states[key], state)
+            else:
+                states[key] = state
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for index, batch in enumerate(batches):
+                if not batch:
+                    continue
+                path, (rest, num_rows) = _share(as_columnar(batch, columns), os.path.join(spool, f"{index}.arrow"))
+                for position, (group, needed) in enumerate(groups):
+                    payload = ({name: values for name, values in rest.items() if name in needed}, num_rows)
+                    future = pool.submit(_accumulate_shard, group, path, payload)
+                    pending.append((future, path if position == len(groups) - 1 else None))
+                while len(pending) > 2 * workers:  # bound the tasks held in flight
+                    collect()
+            while pending:
+                collect()
+    finally:
+        shutil.rmtree(spool, ignore_errors=True)
+
+    for key, (dimension, column, config) in specs.items():
+        if key not in states:
+            states[key] = DIMENSION_CALCULATORS[dimension].init(column, config)
+    return states
+
+
+def _group_specs(specs: Specs, count: int) -> list[tuple[Specs, set[str]]]:
+    """Deal the metrics round-robin into at most ``count`` groups, each with the columns it reads."""
+    items = list(specs.items())
+    groups = []
+    for start in range(max(1, min(count, len(items)))):
+        group = dict(items[start :: max(1, count)])
+        needed = {
+            name
+            for dimension, column, config in group.values()
+            for name in DIMENSION_CALCULATORS[dimension].required_columns(column, config)
+        }
+        groups.append((group, needed))
+    return groups
+
+
+def _share(dataset: ColumnarDataset, path: str) -> tuple[Optional[str], tuple[dict[str, list], int]]:
+    """Write the Arrow-representable columns to an IPC file; return it and the leftover columns."""
+    table, rest = dataset.split_arrow()
+    if table is None:
+        return None, (rest, dataset.num_rows)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return path, (rest, dataset.num_rows)
+
+
+def _accumulate_shard(specs: Specs, path: Optional[str], payload: tuple[dict[str, list], int]) -> dict[tuple, Any]:
+    """Worker entry point: build and update fresh states for one shard."""
+    columns, num_rows = payload
+    columns = dict(columns)
+    if path:
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()  # zero-copy views of the mapped file
+        columns.update({name: table.column(name) for name in table.column_names})
+    dataset = ColumnarDataset(columns, num_rows)
+
+    states = {}
+    for key, (dimension, column, config) in specs.items():
+        calculator = DIMENSION_CALCULATORS[dimension]
+        states[key] = calculator.init(column, config)
+        calculator.update(states[key], dataset)
+    return states
@@ -0,0 +1,17 @@
+"""Process-wide compiled pattern cache for format and pattern rules.
+
+Every rule that validates values against a regex goes through
+:func:`compile_pattern`, so a pattern is compiled once per process however
+many rules, runs or batches use it. Calculators combine it with
+``ColumnarDataset.value_counts`` so each pattern runs once per distinct
+value of a batch rather than once per row.
+"""
+
+import re
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compiled regex for a pattern string, shared by every rule that uses it."""
+    return re.compile(pattern)
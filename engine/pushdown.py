@@ -0,0 +1,460 @@
+"""Push dimension metrics down into SQL for relational connectors.
+
+Rules whose metric is a plain row count are compiled into one aggregate
+query (``SELECT COUNT(*), SUM(CASE ...), COUNT(DISTINCT ...) ...``) that
+runs in the source database, so only a single row of counters crosses the
+network. A rule is only pushed down when the database computes the same
+count as the Python calculator would, which depends on the column types
+from ``get_schema`` and on the dialect's text semantics (collation, pad
+spaces). Anything else falls back to streaming rows through the calculators.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from engine.expressions import (
+    Arithmetic,
+    Call,
+    Column,
+    Compare,
+    IfElse,
+    InList,
+    IsNull,
+    Literal,
+    Logical,
+    Negate,
+    Node,
+    Not,
+    compile_expression,
+)
+from engine.formats import PYTHON_WHITESPACE
+from engine.rule_engine import (
+    DIMENSION_CALCULATORS,
+    DQCheckResult,
+    RuleDefinition,
+    compile_rules,
+    rule_key,
+    run_checks_streaming,
+)
+
+SQL_OPERATORS = {"lt": "<", "lte": "<=", "gt": ">", "gte": ">=", "eq": "=", "neq": "<>"}
+_EXPRESSION_OPERATORS = {"<": "lt", "<=": "lte", ">": "gt", ">=": "gte", "==": "eq", "!=": "neq"}
+
+_NUMERIC_TYPE = re.compile(
+    r"^((tiny|small|medium|big)?int(eger)?\d*|numeric|decimal|bignumeric"
+    r"|real|float\d*|double( precision)?|number|money)$"
+)
+
+
+@dataclass(frozen=True)
+class SQLDialect:
+    """SQL spelling and text semantics of one database.
+
+    Attributes:
+        quote: Opening and closing identifier quote characters.
+        blank: Condition (``{}`` = column) true for empty/whitespace-only text.
+        backslash_escapes: Whether backslashes escape characters in string literals.
+        text_equality: Whether ``=`` and ``DISTINCT`` on text match Python
+            equality (case- and trailing-space-sensitive by default).
+        text_ordering: Whether ``<``/``>`` on text match Python code-point order.
+        dynamic_typing: Whether any column may hold text regardless of its
+            declared type (SQLite), so blank checks apply to every column.
+        float_type: Type name for casting to a double-precision float.
+    """
+
+    quote: str
+    blank: str
+    backslash_escapes: bool = False
+    text_equality: bool = True
+    text_ordering: bool = False
+    dynamic_typing: bool = False
+    float_type: str = "DOUBLE PRECISION"
+
+
+# Blank tests trim every character str.strip() removes, as the Python calculator does, not just
+# ASCII spaces. The templates are str.format()ed with the column, so literal braces are doubled.
+_WHITESPACE_CODES = [ord(char) for char in PYTHON_WHITESPACE]
+_POSTGRES_BLANK = "BTRIM({}, " + " || ".join(f"CHR({code})" for code in _WHITESPACE_CODES) + ") = ''"
+_SQLITE_BLANK = "TRIM({}, char(" + ", ".join(map(str, _WHITESPACE_CODES)) + ")) = ''"
+_MYSQL_BLANK = "{} REGEXP '^[" + "".join(f"\\\\x{{{{{code:x}}}}}" for code in _WHITESPACE_CODES) + "]*$'"
+_SQL_SERVER_BLANK = "TRIM(" + " + ".join(f"NCHAR({code})" for code in _WHITESPACE_CODES) + " FROM {}) = ''"
+_BIGQUERY_BLANK = "TRIM({}, '" + "".join(f"\\u{code:04x}" for code in _WHITESPACE_CODES) + "') = ''"
+_REDSHIFT_BLANK = "BTRIM({}, '" + PYTHON_WHITESPACE + "') = ''"  # Redshift's CHR() only spells ASCII
+
+_POSTGRES = SQLDialect('""', _POSTGRES_BLANK)
+
+DIALECTS = {
+    "sqlite": SQLDialect('""', _SQLITE_BLANK, text_ordering=True, dynamic_typing=True, float_type="REAL"),
+    "postgresql": _POSTGRES,
+    "redshift": SQLDialect('""', _REDSHIFT_BLANK),
+    "mysql": SQLDialect("``", _MYSQL_BLANK, backslash_escapes=True, text_equality=False, float_type="DOUBLE"),
+    "sql_server": SQLDialect("[]", _SQL_SERVER_BLANK, text_equality=False, float_type="FLOAT"),
+    "bigquery": SQLDialect("``", _BIGQUERY_BLANK, backslash_escapes=True, text_ordering=True, float_type="FLOAT64"),
+}
+
+
+@dataclass
+class PushdownPlan:
+    """One aggregate query plus the rules it cannot answer.
+
+    ``expressions[0]`` is ``COUNT(*)``; ``slots`` maps a rule key to the
+    index of the expression counting its passing rows.
+    """
+
+    expressions: list[str] = field(default_factory=lambda: ["COUNT(*)"])
+    slots: dict[tuple, int] = field(default_factory=dict)
+    fallback: list[RuleDefinition] = field(default_factory=list)
+
+    def measure(self, row: list) -> dict[tuple, tuple[float, dict]]:
+        """Turn the aggregate result row into (metric value, details) per rule key."""
+        total = int(row[0] or 0)
+        return {
+            key: (((int(row[index] or 0) / total) * 100.0 if total > 0 else 0.0), {})
+            for key, index in self.slots.items()
+        }
+
+
+def plan_pushdown(rules: list[RuleDefinition], schema: dict[str, str], dialect: SQLDialect) -> PushdownPlan:
+    """Compile every rule that can be pushed down into a single aggregate query.
+
+    Args:
+        rules: Rules to evaluate.
+        schema: Column name -> database type, from the connector's ``get_schema``.
+        dialect: SQL dialect of the source.
+
+    Returns:
+        PushdownPlan whose ``fallback`` lists the rules left for the Python calculators.
+    """
+    plan = PushdownPlan()
+    for rule in rules:
+        key = rule_key(rule)
+        if key in plan.slots:
+            continue
+        compiler = _COMPILERS.get(rule.dimension)
+        expression = compiler(rule.column, rule.config or {}, schema, dialect) if compiler else None
+        if expression is None:
+            plan.fallback.append(rule)
+        else:
+            plan.slots[key] = len(plan.expressions)
+            plan.expressions.append(expression)
+    return plan
+
+
+def run_checks_pushdown(
+    rules: list[RuleDefinition], connector: Any, path: str, workers: int = 1
+) -> list[DQCheckResult]:
+    """Run rules against a relational table, pushing down what the database can count.
+
+    Args:
+        rules: Rules to evaluate.
+        connector: Connected connector with a ``pushdown_dialect``.
+        path: Table name (or ``sql:`` query) to check.
+        workers: Processes used for the rules that fall back to streaming.
+
+    Returns:
+        List of DQCheckResult objects, in rule order.
+
+    Raises:
+        ValueError: If the table has no rows.
+    """
+    schema = connector.get_schema(path)
+    plan = plan_pushdown(rules, schema, DIALECTS[connector.pushdown_dialect])
+    row = connector.aggregate(path, plan.expressions)
+    if not row[0]:
+        raise ValueError("No data found in source")
+    measured = plan.measure(row)
+
+    fallback = [rule for rule in plan.fallback if rule.dimension in DIMENSION_CALCULATORS]
+    streamed = iter([])
+    if fallback:
+        columns = [
+            name
+            for rule in fallback
+            for name in DIMENSION_CALCULATORS[rule.dimension].required_columns(rule.column, rule.config)
+            if name in schema
+        ]
+        batches = connector.read_data_iterator(path, columns=list(dict.fromkeys(columns)) or None)
+        streamed = iter(run_checks_streaming(fallback, batches, workers))
+
+    results: list[DQCheckResult] = []
+    for rule in compile_rules(rules).rules:
+        if rule.calculator is None:
+            results.append(rule.unknown_dimension_result())
+        elif rule.key in measured:
+            metric_value, details = measured[rule.key]
+            results.append(rule.result(metric_value, dict(details)))
+        else:
+            results.append(next(streamed))
+    return results
+
+
+def _completeness(column: Optional[str], cfg: dict, schema: dict, dialect: SQLDialect) -> Optional[str]:
+    if column not in schema:
+        return None
+    family = _type_family(schema[column])
+    if family is None and not dialect.dynamic_typing:
+        return None
+    col = quote_identifier(column, dialect)
+    if cfg.get("treat_empty_as_null", True) and (family == "text" or dialect.dynamic_typing):
+        return _count_if(f"{col} IS NOT NULL AND NOT ({dialect.blank.format(col)})")
+    return f"COUNT({col})"
+
+
+def _uniqueness(column: Optional[str], cfg: dict, schema: dict, dialect: SQLDialect) -> Optional[str]:
+    keys = cfg.get("composite_keys", [column] if column else [])
+    if cfg.get("approximate") or cfg.get("spill_to_disk") or len(keys) != 1 or keys[0] not in schema:
+        return None
+    if not _comparable(_type_family(schema[keys[0]]), dialect, ordering=False):
+        return None
+    col = quote_identifier(keys[0], dialect)
+    return f"(COUNT(DISTINCT {col}) + MAX(CASE WHEN {col} IS NULL THEN 1 ELSE 0 END))"  # NULL is one key
+
+
+def _accuracy(column: Optional[str], cfg: dict, schema: dict, dialect: SQLDialect) -> Optional[str]:
+    if column not in schema or cfg.get("pattern"):
+        return None
+    family = _type_family(schema[column])
+    col = quote_identifier(column, dialect)
+    allowed = cfg.get("allowed_values", [])
+    if isinstance(allowed, dict):
+        return None  # values from a reference column are tested by the Python calculator
+    if allowed:
+        values = _in_list(allowed, family, dialect)
+        return _count_if(f"{col} IN ({values})") if values else None
+    min_val, max_val = cfg.get("min_value"), cfg.get("max_value")
+    if min_val is None and max_val is None:
+        return f"COUNT({col})"  # no validation config: every non-null value is accurate
+    if family != "numeric":
+        return None
+    conditions = [f"{col} IS NOT NULL"]
+    for bound, op in ((min_val, "<"), (max_val, ">")):
+        if bound is not None:
+            literal = _literal(bound, dialect)
+            if literal is None or isinstance(bound, str):
+                return None
+            conditions.append(f"NOT ({col} {op} {literal})")
+    return _count_if(" AND ".join(conditions))
+
+
+def _validity(column: Optional[str], cfg: dict, schema: dict, dialect: SQLDialect) -> Optional[str]:
+    if column not in schema or cfg.get("expected_type") or cfg.get("format"):
+        return None
+    col = quote_identifier(column, dialect)
+    null_score = "0" if cfg.get("not_null", False) else "1"
+    allowed = cfg.get("allowed_values")
+    if allowed is None:
+        return f"SUM(CASE WHEN {col} IS NULL THEN {null_score} ELSE 1 END)"
+    if not isinstance(allowed, (list, tuple)):
+        return None  # e.g. a string, where Python ``in`` tests substrings
+    if not allowed:
+        return f"SUM(CASE WHEN {col} IS NULL THEN {null_score} ELSE 0 END)"
+    values = _in_list(allowed, _type_family(schema[column]), dialect)
+    if values is None:
+        return None
+    return f"SUM(CASE WHEN {col} IS NULL THEN {null_score} WHEN {col} IN ({values}) THEN 1 ELSE 0 END)"
+
+
+def _consistency(column: Optional[str], cfg: dict, schema: dict, dialect: SQLDialect) -> Optional[str]:
+    if cfg.get("rule"):
+        condition = expression_sql(cfg["rule"], schema, dialect)
+        return _count_if(condition) if condition is not None else None
+    col_a, col_b, operator = cfg.get("column_a", column), cfg.get("column_b"), cfg.get("operator", "lt")
+    if col_a not in schema or col_b not in schema or operator not in SQL_OPERATORS:
+        return None
+    family = _type_family(schema[col_a])
+    if family != _type_family(schema[col_b]) or (family == "temporal" and schema[col_a] != schema[col_b]):
+        return None  # Python raises TypeError (not consistent) where SQL would coerce
+    if not _comparable(family, dialect, ordering=operator not in ("eq", "neq")):
+        return None
+    a, b = quote_identifier(col_a, dialect), quote_identifier(col_b, dialect)
+    return _count_if(f"{a} {SQL_OPERATORS[operator]} {b}")
+
+
+_COMPILERS: dict[str, Callable[[Optional[str], dict, dict, SQLDialect], Optional[str]]] = {
+    "completeness": _completeness,
+    "uniqueness": _uniqueness,
+    "accuracy": _accuracy,
+    "validity": _validity,
+    "consistency": _consistency,
+}
+
+
+def expression_sql(text: str, schema: dict[str, str], dialect: SQLDialect) -> Optional[str]:
+    """Translate a consistency expression into a SQL condition that is true for the same rows.
+
+    Args:
+        text: Expression in the ``engine.expressions`` syntax.
+        schema: Column name -> database type, from the connector's ``get_schema``.
+        dialect: SQL dialect of the source.
+
+    Returns:
+        The condition, or None if the database could disagree with Python
+        on some row (e.g. ``%`` on negative numbers, implicit type coercion,
+        collation-dependent text comparison).
+    """
+    try:
+        sql, kind = _expression_sql(compile_expression(text).root, schema, dialect)
+    except _Untranslatable:
+        return None
+    return sql if kind == _PREDICATE else None
+
+
+class _Untranslatable(Exception):
+    """Part of an expression has no SQL translation with Python's semantics."""
+
+
+# Kind of a translated predicate (comparison, null test, boolean logic); other
+# kinds are (type family, database type name) of a column, literal or value.
+_PREDICATE = ("predicate", None)
+_NULL = ("null", None)
+
+
+def _expression_sql(node: Node, schema: dict, dialect: SQLDialect) -> tuple[str, tuple]:
+    """SQL for one expression node and the kind of value it produces."""
+    if isinstance(node, Column):
+        family = _type_family(schema.get(node.name)) if node.name in schema else None
+        if family is None:
+            raise _Untranslatable
+        return quote_identifier(node.name, dialect), (family, schema[node.name].lower())
+    if isinstance(node, Literal):
+        if node.value is None:
+            return "NULL", _NULL
+        literal = None if isinstance(node.value, bool) else _literal(node.value, dialect)
+        if literal is None:
+            raise _Untranslatable
+        return literal, ("text" if isinstance(node.value, str) else "numeric", None)
+    if isinstance(node, (Negate, Arithmetic)) or (isinstance(node, Call) and node.function == "abs"):
+        operands = [_expression_sql(child, schema, dialect) for child in node.children()]
+        if any(kind[0] not in ("numeric", "null") for _, kind in operands):
+            raise _Untranslatable
+        values = [sql for sql, _ in operands]
+        if isinstance(node, Negate):
+            return f"(-{values[0]})", ("numeric", None)
+        if isinstance(node, Call):
+            return f"ABS({values[0]})", ("numeric", None)
+        if node.op == "/":  # true division, null (not an error) on zero
+            left, right = (f"CAST({value} AS {dialect.float_type})" for value in values)
+            return f"({left} / NULLIF({right}, 0))", ("numeric", None)
+        if node.op == "%":
+            raise _Untranslatable  # SQL takes the sign of the dividend, Python of the divisor
+        return f"({values[0]} {node.op} {values[1]})", ("numeric", None)
+    if isinstance(node, Compare):
+        (left, left_kind), (right, right_kind) = (_expression_sql(child, schema, dialect) for child in node.children())
+        _check_comparable(left_kind, right_kind, dialect, ordering=node.op not in ("==", "!="))
+        return f"({left} {SQL_OPERATORS[_EXPRESSION_OPERATORS[node.op]]} {right})", _PREDICATE
+    if isinstance(node, (Logical, Not)):
+        operands = [_expression_sql(child, schema, dialect) for child in node.children()]
+        if any(kind != _PREDICATE for _, kind in operands):
+            raise _Untranslatable  # a bare column's truthiness has no portable spelling
+        if isinstance(node, Not):
+            return f"(NOT {operands[0][0]})", _PREDICATE
+        return "(" + f" {node.op.upper()} ".join(sql for sql, _ in operands) + ")", _PREDICATE
+    if isinstance(node, IsNull):
+        operand, _ = _expression_sql(node.operand, schema, dialect)
+        return f"({operand} IS {'NOT ' if node.negated else ''}NULL)", _PREDICATE
+    if isinstance(node, InList):
+        operand, (family, _) = _expression_sql(node.operand, schema, dialect)
+        values = _in_list(list(node.values), family, dialect) if node.values else None
+        if values is None:
+            raise _Untranslatable
+        return f"({operand} {'NOT ' if node.negated else ''}IN ({values}))", _PREDICATE
+    if isinstance(node, IfElse):
+        condition, condition_kind = _expression_sql(node.condition, schema, dialect)
+        (then, then_kind), (otherwise, otherwise_kind) = (
+            _expression_sql(child, schema, dialect) for child in (node.then, node.otherwise)
+        )
+        if condition_kind != _PREDICATE or _PREDICATE in (then_kind, otherwise_kind):
+            raise _Untranslatable
+        kind = _common_kind(then_kind, otherwise_kind)
+        return f"(CASE WHEN {condition} THEN {then} ELSE {otherwise} END)", kind
+    if isinstance(node, Call) and node.function == "coalesce":
+        operands = [_expression_sql(arg, schema, dialect) for arg in node.args]
+        kind = _NULL
+        for _, operand_kind in operands:
+            if operand_kind == _PREDICATE:
+                raise _Untranslatable
+            kind = _common_kind(kind, operand_kind)
+        return f"COALESCE({', '.join(sql for sql, _ in operands)})", kind
+    raise _Untranslatable  # length and the date functions are spelled differently by every database
+
+
+def _common_kind(left: tuple, right: tuple) -> tuple:
+    """Kind of a value that is either ``left`` or ``right`` (CASE, COALESCE)."""
+    if left == _NULL:
+        return right
+    if right == _NULL or left == right:
+        return left
+    if left[0] == right[0] and left[0] in ("numeric", "text"):
+        return (left[0], None)
+    raise _Untranslatable
+
+
+def _check_comparable(left: tuple, right: tuple, dialect: SQLDialect, ordering: bool) -> None:
+    """Raise unless SQL compares values of the two kinds as Python does."""
+    if _NULL in (left, right):
+        return  # null either way
+    if _PREDICATE in (left, right) or left[0] != right[0]:
+        raise _Untranslatable  # Python raises TypeError (null) where SQL would coerce
+    if left[0] == "temporal" and (left[1] is None or left[1] != right[1]):
+        raise _Untranslatable
+    if not _comparable(left[0], dialect, ordering):
+        raise _Untranslatable
+
+
+def _type_family(type_name: Optional[str]) -> Optional[str]:
+    """Classify a database type as text, numeric, temporal or bool (None if unknown)."""
+    name = (type_name or "").lower().split("(")[0].strip()
+    if any(word in name for word in ("char", "text", "string", "clob")):
+        return "text"
+    if name in ("bool", "boolean", "bit"):
+        return "bool"
+    if _NUMERIC_TYPE.match(name):
+        return "numeric"
+    if name.startswith(("date", "time")):
+        return "temporal"
+    return None
+
+
+def _comparable(family: Optional[str], dialect: SQLDialect, ordering: bool) -> bool:
+    """Whether SQL comparisons on a type family agree with Python's."""
+    if family == "text":
+        return dialect.text_ordering if ordering else dialect.text_equality
+    return family is not None and not (ordering and family == "bool")
+
+
+def _count_if(condition: str) -> str:
+    return f"SUM(CASE WHEN {condition} THEN 1 ELSE 0 END)"
+
+
+def quote_identifier(name: str, dialect: SQLDialect) -> str:
+    """Quote a column or table name for the dialect, doubling embedded closing quotes."""
+    opening, closing = dialect.quote
+    return f"{opening}{name.replace(closing, closing * 2)}{closing}"
+
+
+def _literal(value: Any, dialect: SQLDialect) -> Optional[str]:
+    """Render a string or finite number as a SQL literal, or None if it cannot be inlined safely."""
+    if isinstance(value, str):
+        if "\x00" in value:
+            return None
+        if dialect.backslash_escapes:
+            value = value.replace("\\", "\\\\")
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, float) and math.isfinite(value):
+        return repr(value)
+    return None
+
+
+def _in_list(values: list, family: Optional[str], dialect: SQLDialect) -> Optional[str]:
+    """Literal list for ``IN`` when every value has the column's type (so SQL does not coerce)."""
+    if family == "text" and dialect.text_equality and all(isinstance(v, str) for v in values):
+        literals = [_literal(v, dialect) for v in values]
+    elif family == "numeric" and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        literals = [_literal(v, dialect) for v in values]
+    else:
+        return None
+    return None if None in literals else ", ".join(literals)
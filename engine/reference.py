@@ -0,0 +1,469 @@
+"""Cached lookup indexes over reference columns.
+
+Referential integrity rules check that every key of a column exists in a
+reference column, usually of another table or source (``orders.customer_id``
+in ``customers.customer_id``). The reference column is read once into a
+:class:`KeyIndex` and cached on disk, keyed by source, table, column and the
+table's data version (see ``DataConnector.data_version``), so every rule,
+worker process and run that checks against the same column shares it:
+
+- integer keys are held as a sorted int64 array and probed with a
+  vectorized binary search;
+- other keys are held as the sorted 64-bit stable hashes of the keys, so a
+  missing key is only reported present on a hash collision (a chance of
+  about ``len(index) / 2**64`` per probe);
+- without NumPy, the keys are held in a frozenset, cached in process only.
+
+Index files are NumPy arrays that are memory-mapped on load, so worker
+processes share one copy through the page cache; a process drops its
+mapping when the file's metadata shows another process rebuilt it, and a
+rebuild for a new data version deletes the files of older versions of the
+same column. A cached index is
+rebuilt when the table's data version changes, and in any case once it is
+older than its TTL (``ttl_seconds``, default one hour): only a
+last-modified stamp (file mtime, Delta version, catalog metadata) reliably
+changes with the data, while the count/min/max fingerprint relational
+sources fall back to misses in-place updates that keep those values.
+Looking up the version queries the reference source whenever a rule is
+initialised, which for that fingerprint is a full-table aggregate.
+
+Accuracy and validity rules can likewise take their ``allowed_values``
+from a reference column: :func:`reference_values` loads the column's
+distinct values into a :class:`ValueSet`, hashed once and kept in an
+in-process LRU cache under the same key and expiry rules, and inline
+value lists are hashed once per process by :func:`allowed_value_set`.
+
+Reference sources are either given inline (``source_type`` and
+``source_config``) or by name (``source``), resolved to a connector by the
+function the application registers with :func:`set_source_resolver`.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from engine.sketches import stable_hash64
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+DEFAULT_TTL_SECONDS = 3600
+MAX_LOADED_INDEXES = 8
+MAX_CACHED_VALUE_SETS = 32
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+_INT_TYPES = {int, bool}
+
+_source_resolver: Optional[Callable[[str], Any]] = None
+_loaded: "OrderedDict[str, KeyIndex]" = OrderedDict()  # index path (or cache key) -> index, least recent first
+_value_sets: "OrderedDict[str, tuple[float, ValueSet]]" = OrderedDict()  # cache key -> (loaded at, values)
+_cache_lock = threading.Lock()  # guards both caches; indexes and value sets are read outside it
+
+
+def set_source_resolver(resolver: Optional[Callable[[str], Any]]) -> None:
+    """Register how named reference sources are opened.
+
+    Args:
+        resolver: Called with a reference's ``source`` name; returns a
+            connected DataConnector, which is closed after the index is read.
+    """
+    global _source_resolver
+    _source_resolver = resolver
+
+
+class KeyIndex:
+    """Membership index over the distinct non-null keys of a reference column.
+
+    Attributes:
+        kind: "int" (sorted int64 keys), "hash" (sorted uint64 key hashes)
+            or "set" (a frozenset of keys, when NumPy is not installed).
+        keys: The sorted array or the frozenset.
+    """
+
+    def __init__(self, kind: str, keys: Any, built_at: Optional[float] = None) -> None:
+        self.kind = kind
+        self.keys = keys
+        self.built_at = time.time() if built_at is None else built_at
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, batches: Iterable[Sequence]) -> "KeyIndex":
+        """Index the keys of batches of reference values (nulls are ignored)."""
+        if np is None:
+            return cls("set", frozenset(value for batch in batches for value in batch if value is not None))
+        chunks: list = []
+        kind = "int"
+        for batch in batches:
+            values = [value for value in batch if value is not None]
+            if kind == "int":
+                try:
+                    if not set(map(type, values)) <= _INT_TYPES:
+                        raise TypeError
+                    chunks.append(np.array(values, dtype=np.int64))
+                    continue
+                except (TypeError, OverflowError):  # other keys, or integers beyond int64
+                    kind = "hash"
+                    chunks = [_hashes(chunk.tolist()) for chunk in chunks]
+            chunks.append(_hashes(values))
+        dtype = np.int64 if kind == "int" else np.uint64
+        return cls(kind, _sorted_distinct(np.concatenate(chunks)) if chunks else np.empty(0, dtype=dtype))
+
+    def find(self, values: Sequence) -> list[bool]:
+        """Whether each (non-null) value is a key of the index."""
+        if self.kind == "set":
+            return [value in self.keys for value in values]
+        if self.kind == "hash":
+            return _sorted_contains(self.keys, _hashes(values)).tolist()
+        found = [False] * len(values)
+        positions = [i for i, value in enumerate(values) if _is_int_key(value)]
+        probes = np.array([int(values[i]) for i in positions], dtype=np.int64)
+        for i, hit in zip(positions, _sorted_contains(self.keys, probes).tolist()):
+            found[i] = hit
+        return found
+
+    def find_array(self, values: Any) -> Optional[Any]:
+        """Vectorized :meth:`find` for a null-free Arrow integer array; None if it cannot be probed directly."""
+        import pyarrow as pa
+
+        if self.kind != "int" or not pa.types.is_integer(values.type):
+            return None
+        try:
+            probes = values.cast(pa.int64()).to_numpy(zero_copy_only=False)
+        except pa.ArrowInvalid:  # uint64 keys beyond int64 cannot be in an int64 index
+            return None
+        return _sorted_contains(self.keys, probes)
+
+    def save(self, path: str) -> None:
+        """Write the index atomically to ``path`` (a .npy file)."""
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "wb") as f:
+            np.save(f, self.keys)
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str, kind: str, built_at: Optional[float] = None) -> "KeyIndex":
+        """Memory-map an index written by :meth:`save` (``built_at`` as recorded when it was saved)."""
+        return cls(kind, np.load(path, mmap_mode="r"), built_at)
+
+
+class ValueSet:
+    """Hashed set of allowed values, tested like Python ``in`` (so ``1``, ``1.0`` and ``True`` are equal).
+
+    Attributes:
+        values: The distinct non-null values.
+    """
+
+    def __init__(self, values: Iterable) -> None:
+        self.values = frozenset(value for value in values if value is not None)
+        self._arrow: dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            return value in self.values
+        except TypeError:  # unhashable values are never allowed values
+            return False
+
+    def count_in(self, values: Any) -> Optional[int]:
+        """Number of values of an Arrow column in the set, or None if its type is not vectorized."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        value_type = values.type
+        if pa.types.is_string(value_type) or pa.types.is_large_string(value_type):
+            family = "string"
+        elif pa.types.is_integer(value_type):
+            family, value_type = "int", pa.int64()
+        elif pa.types.is_floating(value_type):
+            family, value_type = "float", pa.float64()
+        elif pa.types.is_boolean(value_type):
+            family = "bool"
+        else:
+            return None
+        if family not in self._arrow:
+            self._arrow[family] = _arrow_value_set(self.values, family)
+        try:
+            values = values.cast(value_type)
+        except pa.ArrowInvalid:  # uint64 beyond int64
+            return None
+        return pc.sum(pc.is_in(values, value_set=self._arrow[family].cast(values.type))).as_py() or 0
+
+
+def allowed_value_set(allowed: Any) -> Any:
+    """Resolve an ``allowed_values`` config for membership tests.
+
+    Args:
+        allowed: A list of values, or a reference column mapping (as for
+            :func:`reference_values`). Anything else is returned unchanged.
+
+    Returns:
+        A ValueSet (shared by every rule with the same values), or ``allowed``.
+    """
+    if isinstance(allowed, dict):
+        return reference_values(allowed)
+    if isinstance(allowed, (list, tuple, set, frozenset)):
+        try:
+            return _inline_value_set(tuple(allowed))
+        except TypeError:  # unhashable values: not cached
+            return ValueSet(allowed)
+    return allowed
+
+
+@lru_cache(maxsize=256)
+def _inline_value_set(values: tuple) -> ValueSet:
+    return ValueSet(values)
+
+
+def reference_values(reference: dict) -> ValueSet:
+    """Return the distinct values of a reference column, loading and caching them if needed.
+
+    Args:
+        reference: ``table`` and ``column``, the source (``source``, or
+            ``source_type`` and ``source_config``), and optionally
+            ``ttl_seconds``.
+
+    Returns:
+        The cached ValueSet, reloaded when the table's data version changes
+        and in any case once it is older than ``ttl_seconds`` (default one
+        hour), since a version fingerprint can miss in-place updates.
+    """
+    table, column = reference["table"], reference["column"]
+    connector = _open_source(reference)
+    try:
+        version = connector.data_version(table, column)
+        key = _cache_key(reference, version)
+        with _cache_lock:
+            cached = _value_sets.get(key)
+        if cached is None or _expired(reference, cached[0]):
+            values = ValueSet(value for batch in _read_column(connector, table, column) for value in batch)
+            cached = (time.time(), values)
+    finally:
+        if hasattr(connector, "close"):
+            connector.close()
+    with _cache_lock:
+        _value_sets[key] = cached
+        _value_sets.move_to_end(key)
+        while len(_value_sets) > MAX_CACHED_VALUE_SETS:
+            _value_sets.popitem(last=False)
+    return cached[1]
+
+
+def reference_index(reference: dict) -> tuple[str, KeyIndex]:
+    """Return the index of a reference column, building and caching it if needed.
+
+    Args:
+        reference: ``table`` and ``column``, the source (``source``, or
+            ``source_type`` and ``source_config``), and optionally
+            ``cache_dir`` and ``ttl_seconds``.
+
+    Returns:
+        ``(handle, index)``: pass the handle to :func:`load_index` to get the
+        index again, e.g. in a worker process.
+    """
+    table, column = reference["table"], reference["column"]
+    connector = _open_source(reference)
+    try:
+        version = connector.data_version(table, column)
+        key = _cache_key(reference, version)
+        if np is None:
+            with _cache_lock:
+                cached = _loaded.get(key)
+            if cached is None or _expired(reference, cached.built_at):
+                cached = KeyIndex.build(_read_column(connector, table, column))
+                _remember(key, cached)
+            return key, cached
+
+        directory = _cache_dir(reference)
+        path = os.path.join(directory, f"{key}.npy")
+        meta = _read_meta(path)
+        if meta is None or _expired(reference, meta["built_at"]):
+            index = KeyIndex.build(_read_column(connector, table, column))
+            os.makedirs(directory, exist_ok=True)
+            index.save(path)
+            _write_meta(path, {"kind": index.kind, "built_at": index.built_at, "keys": len(index)})
+            _remove_superseded(directory, key)
+    finally:
+        if hasattr(connector, "close"):
+            connector.close()
+    return path, load_index(path)
+
+
+def load_index(handle: str) -> KeyIndex:
+    """Index for a handle returned by :func:`reference_index`, loaded once per process and build.
+
+    The index file's metadata is read on every call, so an index another
+    process has rebuilt since is mapped again rather than served stale.
+    """
+    if np is None:
+        with _cache_lock:
+            index = _loaded.get(handle)
+        if index is None:
+            raise ValueError(f"Reference index not found: {handle}")
+        return index
+    meta = _read_meta(handle)
+    if meta is None:
+        raise ValueError(f"Reference index not found: {handle}")
+    with _cache_lock:
+        index = _loaded.get(handle)
+        if index is not None and index.built_at == meta["built_at"]:
+            _loaded.move_to_end(handle)
+            return index
+    try:
+        index = KeyIndex.load(handle, meta["kind"], meta["built_at"])
+    except FileNotFoundError:  # superseded by a newer data version and removed
+        raise ValueError(f"Reference index not found: {handle}") from None
+    _remember(handle, index)
+    return index
+
+
+def _remember(handle: str, index: KeyIndex) -> None:
+    with _cache_lock:
+        _loaded[handle] = index
+        _loaded.move_to_end(handle)
+        while len(_loaded) > MAX_LOADED_INDEXES:
+            _loaded.popitem(last=False)
+
+
+def _open_source(reference: dict) -> Any:
+    """Connected connector for the reference's source."""
+    if reference.get("source_type"):
+        from connectors import get_connector
+
+        connector = get_connector(reference["source_type"])()
+        connector.connect(reference.get("source_config") or {})
+        return connector
+    if reference.get("source") is None:
+        raise ValueError("Reference needs a source, or a source_type and source_config")
+    if _source_resolver is None:
+        raise ValueError(f"No source resolver registered for reference source {reference['source']!r}")
+    return _source_resolver(reference["source"])
+
+
+def _read_column(connector: Any, table: str, column: str) -> Iterable[list]:
+    for batch in connector.read_data_iterator(table, columns=[column]):
+        yield [row.get(column) for row in batch]
+
+
+def _cache_key(reference: dict, version: Optional[str]) -> str:
+    """``{identity}-{version}`` digests of the reference column and its data version.
+
+    Connection settings are never written out. Keys of the same column share
+    the identity prefix, so index files of older versions can be found.
+    """
+    source = reference.get("source")
+    if source is None:
+        source = [reference["source_type"], reference.get("source_config") or {}]
+    return f"{_digest([source, reference['table'], reference['column']], 24)}-{_digest(version, 16)}"
+
+
+def _digest(value: Any, length: int) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:length]
+
+
+def _remove_superseded(directory: str, key: str) -> None:
+    """Delete the index files of other data versions of the reference column ``key`` identifies.
+
+    Processes that mapped a removed file keep reading it until they unmap it.
+    """
+    identity = key.split("-")[0]
+    for name in os.listdir(directory):
+        if name.startswith(f"{identity}-") and not name.startswith(key) and not name.endswith(".tmp"):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:  # removed by another process, or still open on Windows
+                pass
+
+
+def _expired(reference: dict, built_at: float) -> bool:
+    """Whether a cached reference is older than its TTL (and must be reloaded even if its data version matches)."""
+    return time.time() - built_at > reference.get("ttl_seconds", DEFAULT_TTL_SECONDS)
+
+
+def _cache_dir(reference: dict) -> str:
+    return (
+        reference.get("cache_dir")
+        or os.environ.get("DQ_REFERENCE_CACHE_DIR")
+        or os.path.join(tempfile.gettempdir(), "dq-reference")
+    )
+
+
+def _read_meta(path: str) -> Optional[dict]:
+    try:
+        with open(f"{path}.json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(path: str, meta: dict) -> None:
+    partial = f"{path}.json.{os.getpid()}.tmp"
+    with open(partial, "w") as f:
+        json.dump(meta, f)
+    os.replace(partial, f"{path}.json")
+
+
+def _is_int_key(value: Any) -> bool:
+    """Whether a value equals an int64 (so it can be looked up in an int index, as in a Python set)."""
+    if isinstance(value, float):
+        if not value.is_integer():
+            return False
+        value = int(value)
+    return isinstance(value, int) and INT64_MIN <= value <= INT64_MAX
+
+
+def _arrow_value_set(values: frozenset, family: str) -> Any:
+    """Arrow array of the values that equal (in Python) some value of a column of the given type family."""
+    import pyarrow as pa
+
+    if family == "string":
+        return pa.array([value for value in values if isinstance(value, str)], pa.string())
+    numbers = [value for value in values if isinstance(value, (int, float)) and value == value]  # NaN equals nothing
+    if family == "int":
+        ints = {int(value) for value in numbers if _is_int_key(value)}
+        return pa.array(sorted(ints), pa.int64())
+    if family == "float":
+        return pa.array(sorted({float(value) for value in numbers if _is_exact_float(value)}), pa.float64())
+    return pa.array(sorted({bool(value) for value in numbers if value in (0, 1)}), pa.bool_())
+
+
+def _is_exact_float(value: Any) -> bool:
+    """Whether a number converts to a float that compares equal to it (as Python does for large ints)."""
+    try:
+        return float(value) == value
+    except OverflowError:
+        return False
+
+
+def _hashes(values: Sequence) -> Any:
+    return np.fromiter((stable_hash64(value) for value in values), dtype=np.uint64, count=len(values))
+
+
+def _sorted_distinct(keys: Any) -> Any:
+    """Sorted distinct keys (sort and drop repeats: faster than np.unique, which may hash first)."""
+    keys.sort()
+    if len(keys) > 1:
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return keys
+
+
+def _sorted_contains(keys: Any, probes: Any) -> Any:
+    """Boolean array: whether each probe is in the sorted ``keys``."""
+    if len(keys) == 0:
+        return np.zeros(len(probes), dtype=bool)
+    order = np.argsort(probes, kind="stable")  # probing in key order keeps the binary searches cache-friendly
+    ordered = probes[order]
+    positions = np.minimum(np.searchsorted(keys, ordered), len(keys) - 1)
+    found = np.empty(len(probes), dtype=bool)
+    found[order] = keys[positions] == ordered
+    return found
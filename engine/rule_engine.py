@@ -1,19 +1,38 @@
-"""DQ Rule Engine — parses, loads, and evaluates data quality rules."""
+"""DQ Rule Engine — parses, loads, and evaluates data quality rules.
 
+Rules are compiled into an immutable :class:`RulePlan` before they run:
+each :class:`CompiledRule` is bound to its calculator and threshold test,
+holds its own copy of the config, and knows the metric it shares with
+identical rules. A plan can be reused across runs and threads; nothing it
+references keeps per-run state (calculators keep their state in the
+objects ``init`` returns).
+"""
+
+import copy
+import json
+import operator
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Optional
 
 import yaml
 
+from engine.dataset import ColumnarDataset, as_columnar
 from engine.dimensions.accuracy import AccuracyCalculator
+from engine.dimensions.base import DimensionCalculator
 from engine.dimensions.completeness import CompletenessCalculator
 from engine.dimensions.consistency import ConsistencyCalculator
 from engine.dimensions.timeliness import TimelinessCalculator
 from engine.dimensions.uniqueness import UniquenessCalculator
 from engine.dimensions.profiling import ProfilingCalculator
+from engine.dimensions.referential_integrity import ReferentialIntegrityCalculator
 from engine.dimensions.validity import ValidityCalculator
 
+# Rows per accumulator update. Large batches are cut to this size so that
+# per-batch caches shared by rules (e.g. column value counts) stay small.
+STREAM_SLICE_ROWS = 65536
+
 
 @dataclass
 class RuleDefinition:
@@ -26,6 +45,7 @@ class RuleDefinition:
     threshold: Optional[float] = None
     config: dict = field(default_factory=dict)
     severity: str = "warning"
+    rule_id: Optional[str] = None  # ID of the stored rule, carried to its result
 
 
 @dataclass
@@ -39,6 +59,7 @@ class DQCheckResult:
     threshold: Optional[float]
     passed: bool
     details: dict = field(default_factory=dict)
+    rule_id: Optional[str] = None
 
 
 DIMENSION_CALCULATORS = {
@@ -49,8 +70,127 @@ DIMENSION_CALCULATORS = {
     "timeliness": TimelinessCalculator(),
     "validity": ValidityCalculator(),
     "profiling": ProfilingCalculator(),
+    "referential_integrity": ReferentialIntegrityCalculator(),
 }
 
+# Threshold tests by rule operator: passed = test(metric_value, threshold).
+THRESHOLD_OPERATORS: dict[str, Callable[[float, float], bool]] = {
+    "gte": operator.ge,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "lt": operator.lt,
+    "eq": lambda value, threshold: abs(value - threshold) < 0.001,
+}
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A rule bound to its calculator and threshold test.
+
+    Attributes:
+        name: Rule name.
+        dimension: Dimension name.
+        column: Checked column, if any.
+        threshold: Threshold applied to the metric value, if any.
+        config: Private copy of the rule config.
+        key: Identity of the metric (see ``rule_key``).
+        calculator: The dimension's calculator; None for unknown dimensions.
+        passes: Threshold test, called with the metric value.
+        columns: Columns the calculator reads.
+        rule_id: ID of the stored rule, if any.
+    """
+
+    name: str
+    dimension: str
+    column: Optional[str]
+    threshold: Optional[float]
+    config: dict
+    key: tuple
+    calculator: Optional[DimensionCalculator]
+    passes: Callable[[float], bool]
+    columns: tuple[str, ...]
+    rule_id: Optional[str] = None
+
+    def result(self, metric_value: float, details: dict) -> DQCheckResult:
+        """Apply the threshold to a metric value."""
+        return DQCheckResult(
+            rule_name=self.name,
+            dimension=self.dimension,
+            column=self.column,
+            metric_value=round(metric_value, 4),
+            threshold=self.threshold,
+            passed=self.passes(metric_value),
+            details=details,
+            rule_id=self.rule_id,
+        )
+
+    def unknown_dimension_result(self) -> DQCheckResult:
+        """Result for a rule whose dimension has no calculator."""
+        return DQCheckResult(
+            rule_name=self.name,
+            dimension=self.dimension,
+            column=self.column,
+            metric_value=0.0,
+            threshold=self.threshold,
+            passed=False,
+            details={"error": f"Unknown dimension: {self.dimension}"},
+            rule_id=self.rule_id,
+        )
+
+
+@dataclass(frozen=True)
+class RulePlan:
+    """Compiled rules with their distinct metrics.
+
+    Attributes:
+        rules: Compiled rules, in rule order.
+        specs: ``(dimension, column, config)`` of each distinct metric of the
+            known dimensions, by metric key.
+        columns: Columns read by the metrics, in first-use order.
+    """
+
+    rules: tuple[CompiledRule, ...]
+    specs: Mapping[tuple, tuple[str, Optional[str], dict]]
+    columns: tuple[str, ...]
+
+
+def compile_rule(rule: RuleDefinition) -> CompiledRule:
+    """Bind a rule to its calculator and threshold test.
+
+    The config is deep-copied, so later changes to ``rule`` do not reach
+    the compiled rule.
+    """
+    config = copy.deepcopy(rule.config or {})
+    calculator = DIMENSION_CALCULATORS.get(rule.dimension)
+    return CompiledRule(
+        name=rule.name,
+        dimension=rule.dimension,
+        column=rule.column,
+        threshold=rule.threshold,
+        config=config,
+        key=rule_key(rule),
+        calculator=calculator,
+        passes=_threshold_test(rule.operator, rule.threshold),
+        columns=tuple(calculator.required_columns(rule.column, config)) if calculator else (),
+        rule_id=rule.rule_id,
+    )
+
+
+def compile_rules(rules: Iterable[RuleDefinition]) -> RulePlan:
+    """Compile rules into a plan that runs them in one pass (see :func:`run_checks_streaming`).
+
+    Args:
+        rules: Rules to compile.
+
+    Returns:
+        RulePlan; pass it instead of the rules to skip compiling on every run.
+    """
+    compiled = tuple(compile_rule(rule) for rule in rules)
+    known = [rule for rule in compiled if rule.calculator is not None]
+    specs = {rule.key: (rule.dimension, rule.column, rule.config) for rule in known}
+    columns = tuple(dict.fromkeys(name for rule in known for name in rule.columns))
+    return RulePlan(compiled, MappingProxyType(specs), columns)
+
 
 def load_rules_from_yaml(path: str | Path) -> list[RuleDefinition]:
     """Load rule definitions from a YAML file.
@@ -80,65 +220,120 @@ def load_rules_from_yaml(path: str | Path) -> list[RuleDefinition]:
     return rules
 
 
-def evaluate_rule(rule: RuleDefinition, data: Any) -> DQCheckResult:
+def _threshold_test(op: Optional[str], threshold: Optional[float]) -> Callable[[float], bool]:
+    """Threshold test of a rule (rules without a threshold, or with an unknown operator, always pass)."""
+    test = THRESHOLD_OPERATORS.get(op or "gte")
+    if threshold is None or test is None:
+        return lambda metric_value: True
+    return lambda metric_value: test(metric_value, threshold)
+
+
+def rule_key(rule: RuleDefinition) -> tuple:
+    """Identity of the metric a rule computes (rules sharing it share one accumulator)."""
+    return (rule.dimension, rule.column, json.dumps(rule.config, sort_keys=True, default=str))
+
+
+def evaluate_rule(rule: RuleDefinition | CompiledRule, data: Any) -> DQCheckResult:
     """Evaluate a single rule against a dataset.
 
     Args:
-        rule: The rule definition to evaluate.
-        data: The dataset (list of dicts for non-Spark, DataFrame for Spark).
+        rule: The rule definition to evaluate, or a compiled rule.
+        data: The dataset (list of dicts or ColumnarDataset for non-Spark, DataFrame for Spark).
 
     Returns:
         DQCheckResult with metric value and pass/fail status.
     """
-    calculator = DIMENSION_CALCULATORS.get(rule.dimension)
-    if not calculator:
-        return DQCheckResult(
-            rule_name=rule.name,
-            dimension=rule.dimension,
-            column=rule.column,
-            metric_value=0.0,
-            threshold=rule.threshold,
-            passed=False,
-            details={"error": f"Unknown dimension: {rule.dimension}"},
-        )
+    compiled = rule if isinstance(rule, CompiledRule) else compile_rule(rule)
+    calculator = compiled.calculator
+    if calculator is None:
+        return compiled.unknown_dimension_result()
 
-    metric_value = calculator.calculate(data, rule.column, rule.config)
-
-    passed = True
-    if rule.threshold is not None:
-        op = rule.operator or "gte"
-        if op == "gte":
-            passed = metric_value >= rule.threshold
-        elif op == "lte":
-            passed = metric_value <= rule.threshold
-        elif op == "eq":
-            passed = abs(metric_value - rule.threshold) < 0.001
-        elif op == "gt":
-            passed = metric_value > rule.threshold
-        elif op == "lt":
-            passed = metric_value < rule.threshold
-
-    details = getattr(calculator, "_last_details", {})
-
-    return DQCheckResult(
-        rule_name=rule.name,
-        dimension=rule.dimension,
-        column=rule.column,
-        metric_value=round(metric_value, 4),
-        threshold=rule.threshold,
-        passed=passed,
-        details=details,
-    )
+    return compiled.result(*calculator.measure(data, compiled.column, compiled.config))
+
+
+def run_checks_streaming(
+    rules: list[RuleDefinition] | RulePlan,
+    batches: Iterable[list[dict] | ColumnarDataset],
+    workers: int = 1,
+    spec_groups: int = 1,
+) -> list[DQCheckResult]:
+    """Run all rules over a stream of row batches.
+
+    Each distinct rule metric keeps one accumulator that is updated batch by
+    batch, so memory is bounded by the batch size (plus whatever state a
+    metric needs, e.g. the key set of an exact uniqueness check). Rules with
+    the same dimension, column and config share one accumulator.
+
+    Args:
+        rules: List of rules to evaluate, or their compiled plan.
+        batches: Iterable of list[dict] or ColumnarDataset batches, e.g. from
+            a connector's ``read_data_iterator``.
+        workers: Number of processes; above 1, batches are evaluated in a
+            process pool and the partial accumulators merged.
+        spec_groups: With ``workers`` above 1, split each batch's metrics into
+            this many pool tasks, so wide rule sets also run in parallel
+            across columns.
+
+    Returns:
+        List of DQCheckResult objects, in rule order.
+    """
+    plan = rules if isinstance(rules, RulePlan) else compile_rules(rules)
+    columns = list(plan.columns)
+    if workers > 1:
+        from engine.parallel import accumulate_parallel
 
+        states = accumulate_parallel(dict(plan.specs), columns, batches, workers, spec_groups)
+    else:
+        specs = plan.specs.items()
+        states = {key: DIMENSION_CALCULATORS[dim].init(column, config) for key, (dim, column, config) in specs}
+        updates = [(DIMENSION_CALCULATORS[key[0]].update, state) for key, state in states.items()]
+        for batch in batches:
+            if not batch:
+                continue
+            for dataset in as_columnar(batch, columns).iter_slices(STREAM_SLICE_ROWS):
+                for update, state in updates:
+                    update(state, dataset)
 
-def run_checks(rules: list[RuleDefinition], data: Any) -> list[DQCheckResult]:
+    measured = {key: DIMENSION_CALCULATORS[key[0]].finalize(state) for key, state in states.items()}
+    results: list[DQCheckResult] = []
+    for rule in plan.rules:
+        if rule.calculator is None:
+            results.append(rule.unknown_dimension_result())
+            continue
+        metric_value, details = measured[rule.key]
+        results.append(rule.result(metric_value, dict(details)))
+    return results
+
+
+def run_checks(
+    rules: list[RuleDefinition] | RulePlan, data: Any, fused: bool = True, workers: int = 1
+) -> list[DQCheckResult]:
     """Run all rules against a dataset and return results.
 
     Args:
-        rules: List of rules to evaluate.
+        rules: List of rules to evaluate, or their compiled plan.
         data: The dataset.
+        fused: Evaluate list[dict]/ColumnarDataset input as a single fused plan
+            (one projection per column, shared metrics for identical rules)
+            by streaming it as one batch. Set to False to evaluate each rule
+            independently.
+        workers: Number of processes for fused evaluation; the rows are split
+            into one contiguous shard per worker.
 
     Returns:
         List of DQCheckResult objects.
     """
-    return [evaluate_rule(rule, data) for rule in rules]
+    plan = rules if isinstance(rules, RulePlan) else compile_rules(rules)
+    if fused and isinstance(data, (list, ColumnarDataset)):
+        return run_checks_streaming(plan, split_shards(data, workers), workers)
+    return [evaluate_rule(rule, data) for rule in plan.rules]
+
+
+def split_shards(data: list[dict] | ColumnarDataset, workers: int) -> Iterable[list[dict] | ColumnarDataset]:
+    """Split data into one contiguous row range per worker (the whole data for one worker)."""
+    if workers <= 1:
+        return [data]
+    size = max(1, -(-len(data) // workers))
+    if isinstance(data, ColumnarDataset):
+        return data.iter_slices(size)
+    return (data[start : start + size] for start in range(0, len(data), size))
@@ -0,0 +1,286 @@
+"""Fixed-memory sketches for approximate data quality metrics.
+
+Sketch state is independent of row count and can be merged, so the same
+sketch can be fed batch by batch or combined across workers.
+"""
+
+import hashlib
+import heapq
+import math
+import struct
+from collections import Counter
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+
+_FLOAT = struct.Struct("<d")
+
+
+def stable_hash64(value: Any) -> int:
+    """Hash a value to 64 bits, identically in every process.
+
+    Numbers that compare equal (``1``, ``1.0``, ``True``) hash alike so that
+    sketches agree with Python set semantics.
+    """
+    kind = type(value)
+    if kind is str:  # fast paths for the common scalar types; the NUL tag never starts a text form
+        data = b"\x00s" + value.encode("utf-8", "surrogatepass")
+    elif kind is float and not value.is_integer():
+        data = b"\x00f" + _FLOAT.pack(value)
+    elif kind is tuple:
+        data = ("(" + ",".join(_canonical(v) for v in value) + ")").encode("utf-8", "surrogatepass")
+    else:
+        data = _canonical(value).encode("utf-8", "surrogatepass")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _canonical(value: Any) -> str:
+    """Type-tagged text form of a value used as hash input."""
+    if isinstance(value, int) or (isinstance(value, float) and value.is_integer()):
+        return f"n:{int(value)}"
+    return f"{type(value).__name__}:{value!r}"
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count estimator.
+
+    Uses ``2 ** precision`` one-byte registers, so memory is fixed by the
+    precision (16 KB at the default of 14) regardless of how many values
+    are added.
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = bytearray(self.num_registers)
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the estimate (1.04 / sqrt(m))."""
+        return 1.04 / math.sqrt(self.num_registers)
+
+    def add(self, value: Any) -> None:
+        """Add one value (tuples are treated as composite keys)."""
+        self._add_hash(stable_hash64(value))
+
+    def add_many(self, values: Iterable[Any]) -> None:
+        """Add every value from an iterable."""
+        for value in values:
+            self._add_hash(stable_hash64(value))
+
+    def _add_hash(self, hashed: int) -> None:
+        p = self.precision
+        index = hashed >> (64 - p)
+        remainder = hashed & ((1 << (64 - p)) - 1)
+        rank = (64 - p) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values added."""
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting for small cardinalities
+        return raw
+
+
+class FrequentItems:
+    """Misra-Gries heavy-hitter summary for top-k value counts.
+
+    Keeps at most ``capacity`` counters. While a column has no more than
+    ``capacity`` distinct values the counts are exact; beyond that each
+    reported count undercounts the true one by at most :attr:`error`, and
+    every value more frequent than ``total / capacity`` is retained.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.counts: Counter = Counter()
+        self.error = 0
+
+    def update(self, counts: Mapping[Any, int]) -> None:
+        """Add exact (or summarized) value counts, e.g. a batch's Counter."""
+        self.counts.update(counts)
+        if len(self.counts) > self.capacity:
+            self._trim()
+
+    def merge(self, other: "FrequentItems") -> "FrequentItems":
+        """Fold another summary into this one (Agarwal et al. mergeable summaries)."""
+        self.error += other.error
+        self.update(other.counts)
+        return self
+
+    def most_common(self, n: int) -> list[tuple[Any, int]]:
+        """The ``n`` most frequent values with their (lower-bound) counts."""
+        return self.counts.most_common(n)
+
+    def _trim(self) -> None:
+        # Subtracting the (capacity+1)-th largest count from every counter
+        # leaves at most ``capacity`` positive ones.
+        cut = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        self.counts = Counter({value: count - cut for value, count in self.counts.items() if count > cut})
+        self.error += cut
+
+
+class Moments:
+    """Streaming count, mean and variance (Welford), mergeable across batches (Chan et al.).
+
+    Infinite and NaN floats are summed apart from the finite values, since
+    Welford's update would turn an infinite mean into NaN. With any of them
+    present the mean is their sum (``inf``, ``-inf`` or NaN, as
+    ``sum(values) / count`` gives) and the variance is NaN.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0  # every value, finite or not
+        self.finite_count = 0
+        self.finite_mean = 0.0
+        self.m2 = 0.0
+        self.nonfinite_sum = 0.0
+
+    def update(self, values: Sequence[float]) -> None:
+        """Fold a batch of numbers in (batch moments are computed in two passes, then merged)."""
+        if not values:
+            return
+        batch = Moments()
+        finite = [v for v in values if not (isinstance(v, float) and not math.isfinite(v))]
+        if len(finite) < len(values):
+            batch.nonfinite_sum = sum(v for v in values if isinstance(v, float) and not math.isfinite(v))
+        batch.count = len(values)
+        if finite:
+            batch.finite_count = len(finite)
+            batch.finite_mean = sum(finite) / batch.finite_count
+            batch.m2 = sum((v - batch.finite_mean) * (v - batch.finite_mean) for v in finite)
+        self.merge(batch)
+
+    def merge(self, other: "Moments") -> "Moments":
+        """Fold another set of moments into this one."""
+        if other.count == 0:
+            return self
+        self.count += other.count
+        self.nonfinite_sum += other.nonfinite_sum
+        if other.finite_count:
+            total = self.finite_count + other.finite_count
+            delta = other.finite_mean - self.finite_mean
+            self.finite_mean += delta * other.finite_count / total
+            self.m2 += other.m2 + delta * delta * self.finite_count * other.finite_count / total
+            self.finite_count = total
+        return self
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of the values, or None if empty."""
+        if not self.count:
+            return None
+        return self.nonfinite_sum if self.count > self.finite_count else self.finite_mean
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Population variance, or None if empty."""
+        if not self.count:
+            return None
+        return math.nan if self.count > self.finite_count else self.m2 / self.finite_count
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch (DDSketch-style logarithmic buckets).
+
+    Every quantile estimate is within ``relative_accuracy`` of the true
+    value. Bucket counts add, so sketches merge exactly and the result does
+    not depend on the order values arrive in. At most ``max_buckets`` buckets
+    are kept per sign; beyond that the values nearest zero share a bucket.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Counter = Counter()
+        self.negative: Counter = Counter()
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a finite number ``count`` times."""
+        if value > 0:
+            self.positive[math.ceil(math.log(value) / self._log_gamma)] += count
+        elif value < 0:
+            self.negative[math.ceil(math.log(-value) / self._log_gamma)] += count
+        else:
+            self.zero_count += count
+        self.count += count
+
+    def add_many(self, values: Iterable[float]) -> None:
+        """Add every finite number from an iterable."""
+        log, ceil, log_gamma, inf = math.log, math.ceil, self._log_gamma, math.inf
+        positive, negative, zeros = [], [], 0
+        for value in values:
+            if 0 < value < inf:
+                positive.append(value)
+            elif -inf < value < 0:
+                negative.append(-value)
+            elif value == 0:
+                zeros += 1
+        self.positive.update([ceil(log(v) / log_gamma) for v in positive])
+        self.negative.update([ceil(log(v) / log_gamma) for v in negative])
+        self.zero_count += zeros
+        self.count += len(positive) + len(negative) + zeros
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold another sketch with the same accuracy into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge quantile sketches with different accuracy")
+        self.positive.update(other.positive)
+        self.negative.update(other.negative)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def compact(self) -> None:
+        """Collapse the buckets nearest zero so each sign keeps at most ``max_buckets``."""
+        for store in (self.positive, self.negative):
+            if len(store) > self.max_buckets:
+                keys = sorted(store)
+                floor = keys[-self.max_buckets]
+                store[floor] += sum(store.pop(key) for key in keys[: -self.max_buckets])
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile ``q`` (0-1), or None if empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+    def _value(self, key: int) -> float:
+        """Representative magnitude of a bucket, within the relative accuracy of all its values."""
+        return 2 * self.gamma**key / (self.gamma + 1)
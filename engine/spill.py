@@ -0,0 +1,173 @@
+"""Exact distinct/duplicate key counting that spills to disk.
+
+Keys are hash-partitioned into bucket files, then each bucket is counted
+in memory on its own. A bucket whose in-memory count would outgrow the
+memory budget is re-partitioned with a different hash salt, so the
+working set stays bounded by the budget whatever the table size.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+FANOUT = 64
+MAX_DEPTH = 6
+ENTRY_OVERHEAD_BYTES = 120  # dict slot + bytes object header + int counter, per distinct key
+_LENGTH = struct.Struct("<I")
+
+
+@dataclass
+class SpillStats:
+    """Distinct/duplicate counts produced by a SpilledKeyCounter."""
+
+    total_keys: int = 0
+    distinct_keys: int = 0
+    duplicate_keys: int = 0
+    sample_duplicates: list = field(default_factory=list)
+
+
+class SpilledKeyCounter:
+    """Count distinct and duplicated keys under a fixed memory budget."""
+
+    def __init__(self, memory_limit_mb: float = 512, sample_size: int = 10, directory: Optional[str] = None) -> None:
+        self.memory_limit_bytes = int(memory_limit_mb * 1024 * 1024)
+        self.sample_size = sample_size
+        self._dir = tempfile.mkdtemp(prefix="dq-spill-", dir=directory)
+        self._writers = _open_partitions(self._dir, "p0")
+        self._total = 0
+
+    def add_many(self, keys: Iterable[Any]) -> None:
+        """Append keys to their partition files."""
+        for key in keys:
+            record = _encode(key)
+            self._writers[_partition(record, 0)].write(_LENGTH.pack(len(record)) + record)
+            self._total += 1
+
+    def merge(self, other: "SpilledKeyCounter") -> None:
+        """Absorb another counter's bucket files (both must be on the same filesystem) and close it."""
+        for ours, theirs in zip(self._writers, _close_partitions(other._writers)):
+            with open(theirs, "rb") as f:
+                shutil.copyfileobj(f, ours)
+        self._total += other._total
+        other.close()
+
+    def finish(self) -> SpillStats:
+        """Count every partition and return the combined statistics."""
+        stats = SpillStats(total_keys=self._total)
+        paths = _close_partitions(self._writers)
+        for path in paths:
+            self._count(path, 0, stats)
+        return stats
+
+    def _count(self, path: str, depth: int, stats: SpillStats) -> None:
+        counts: dict[bytes, int] = {}
+        used = 0
+        for record in _read_records(path):
+            if record in counts:
+                counts[record] += 1
+                continue
+            counts[record] = 1
+            used += len(record) + ENTRY_OVERHEAD_BYTES
+            if used > self.memory_limit_bytes and depth < MAX_DEPTH:
+                counts.clear()
+                for child in self._split(path, depth + 1):
+                    self._count(child, depth + 1, stats)
+                return
+        os.remove(path)
+
+        stats.distinct_keys += len(counts)
+        for record, count in counts.items():
+            if count > 1:
+                stats.duplicate_keys += 1
+                if len(stats.sample_duplicates) < self.sample_size:
+                    stats.sample_duplicates.append({"key": _json_safe(pickle.loads(record)), "count": count})
+
+    def _split(self, path: str, depth: int) -> list[str]:
+        writers = _open_partitions(self._dir, f"{os.path.basename(path)}-{depth}")
+        for record in _read_records(path):
+            writers[_partition(record, depth)].write(_LENGTH.pack(len(record)) + record)
+        os.remove(path)
+        return _close_partitions(writers)
+
+    def close(self) -> None:
+        """Remove all spill files."""
+        for writer in self._writers:
+            writer.close()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __getstate__(self) -> dict:
+        """Flush and close bucket files so the counter can be sent to another process."""
+        state = self.__dict__.copy()
+        state["_writers"] = _close_partitions(self._writers)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        paths = state.pop("_writers")
+        self.__dict__.update(state)
+        self._writers = [open(path, "ab") for path in paths]
+
+    def __enter__(self) -> "SpilledKeyCounter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _normalize(key: Any) -> Any:
+    """Map numbers that compare equal (1, 1.0, True) to one form so they pickle identically."""
+    if isinstance(key, tuple):
+        return tuple(_normalize(v) for v in key)
+    if isinstance(key, int) or (isinstance(key, float) and key.is_integer()):
+        return int(key)
+    return key
+
+
+def _encode(key: Any) -> bytes:
+    """Serialize a key so that equal keys give equal bytes.
+
+    The pickler runs in fast mode: its memo would otherwise encode the
+    second of two equal but distinct objects in a tuple (``(a, b)`` with
+    ``a == b``, ``a is not b``) differently from a repeated one (``(a, a)``).
+    """
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.fast = True
+    pickler.dump(_normalize(key))
+    return buffer.getvalue()
+
+
+def _json_safe(key: Any) -> Any:
+    """Render a key for result details (tuples as lists, non-JSON scalars as strings)."""
+    if isinstance(key, tuple):
+        return [_json_safe(v) for v in key]
+    if key is None or isinstance(key, (str, int, float, bool)):
+        return key
+    return str(key)
+
+
+def _partition(record: bytes, depth: int) -> int:
+    salt = depth.to_bytes(8, "little")
+    return int.from_bytes(hashlib.blake2b(record, digest_size=8, salt=salt).digest(), "little") % FANOUT
+
+
+def _open_partitions(directory: str, prefix: str) -> list[BinaryIO]:
+    return [open(os.path.join(directory, f"{prefix}-{i}"), "wb") for i in range(FANOUT)]
+
+
+def _close_partitions(writers: list[BinaryIO]) -> list[str]:
+    for writer in writers:
+        writer.close()
+    return [writer.name for writer in writers]
+
+
+def _read_records(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while header := f.read(_LENGTH.size):
+            (length,) = _LENGTH.unpack(header)
+            yield f.read(length)
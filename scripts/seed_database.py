@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
+from api.migrations import upgrade_schema
 from api.models.database import Base, DataSource, Rule, Schedule
 
 DATABASE_URL = os.environ.get(
@@ -74,6 +75,7 @@ def main() -> None:
     """Seed the database with sources, rules, and schedules."""
     engine = create_engine(DATABASE_URL)
     Base.metadata.create_all(engine)
+    upgrade_schema(engine)
 
     with Session(engine) as session:
         # Clear existing test data
@@ -8,21 +8,26 @@ writes results back.
 import json
 import sys
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from connectors.base import DataConnector
 
 
 def run_dq_checks(job_config: dict) -> dict:
     """Execute DQ checks based on job configuration.
 
     Args:
-        job_config: Dict with keys: source_type, source_config, rules, output_path.
+        job_config: Dict with keys: source_type, source_config, rules, output_path,
+            and optionally workers (number of local processes, default 1) and
+            engine ("spark" to aggregate Spark-readable sources on the executors,
+            the default, or "local" to evaluate on the driver).
 
     Returns:
         Dict with run results summary.
     """
-    from engine.rule_engine import RuleDefinition, run_checks
-
-    # Load data via connector
-    data = _load_data(job_config)
+    from engine.freshness import run_checks_with_metadata
+    from engine.rule_engine import DQCheckResult, RuleDefinition, run_checks
 
     # Parse rules
     rules = [
@@ -38,8 +43,22 @@ def run_dq_checks(job_config: dict) -> dict:
         for r in job_config.get("rules", [])
     ]
 
-    # Run checks
-    results = run_checks(rules, data)
+    # Run checks: freshness-only rules from source metadata, the rest in one
+    # Spark aggregate job when the source is a DataFrame, otherwise on the
+    # driver over a columnar copy of the data
+    connector = _get_connector(job_config)
+    path = job_config.get("data_path", "")
+    limit = job_config.get("sample_limit")
+
+    def run_rest(rest: list[RuleDefinition]) -> list[DQCheckResult]:
+        if job_config.get("engine", "spark") == "spark" and hasattr(connector, "read_dataframe"):
+            from spark.native import run_checks_spark
+
+            return run_checks_spark(rest, connector.read_dataframe(path, limit=limit))
+        data = connector.read_columnar(path, limit=limit)
+        return run_checks(rest, data, workers=job_config.get("workers", 1))
+
+    results = run_checks_with_metadata(rules, connector, path, run_rest)
 
     # Summarize
     passed = sum(1 for r in results if r.passed)
@@ -64,11 +83,10 @@ def run_dq_checks(job_config: dict) -> dict:
     return summary
 
 
-def _load_data(job_config: dict) -> list[dict]:
-    """Load data from the configured source."""
+def _get_connector(job_config: dict) -> "DataConnector":
+    """Connect to the configured source."""
     source_type = job_config.get("source_type", "")
     source_config = job_config.get("source_config", {})
-    path = job_config.get("data_path", "")
 
     if source_type == "adls_gen2":
         from connectors.adls_gen2 import ADLSGen2Connector
@@ -83,7 +101,7 @@ def _load_data(job_config: dict) -> list[dict]:
         raise ValueError(f"Unsupported source type: {source_type}")
 
     connector.connect(source_config)
-    return connector.read_data(path, limit=job_config.get("sample_limit"))
+    return connector
 
 
 if __name__ == "__main__":
@@ -0,0 +1,223 @@
+"""Spark-native rule evaluation.
+
+Each rule is translated into Spark aggregate expressions, and every rule
+is evaluated in a single ``DataFrame.agg()`` job, so executors do the
+counting and only one row of metric counters reaches the driver. Rules
+without a Spark translation (timeliness, profiling, mismatched types)
+stream just the columns they read to the driver with ``toLocalIterator``
+and go through the Python calculators.
+
+Regex rules use Spark's Java regex engine, anchored at the start like
+``re.match``. Builtin formats and blank-string checks are spelled to match
+Python's semantics instead: the Java spellings of
+``engine.formats.ARROW_PATTERNS`` (``\\p{Nd}`` for ``\\d``, Python's
+whitespace set for ``\\s``, ``\\z`` for the end, since Java's ``$`` also
+matches before any final line terminator).
+"""
+
+import operator
+from typing import Any, Callable, Iterator, Optional
+
+from engine.formats import ARROW_PATTERNS, PYTHON_WHITESPACE
+from engine.rule_engine import (
+    DIMENSION_CALCULATORS,
+    DQCheckResult,
+    RuleDefinition,
+    compile_rules,
+    rule_key,
+    run_checks_streaming,
+)
+
+COMPARISONS: dict[str, Callable[[Any, Any], Any]] = {
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "eq": operator.eq,
+    "neq": operator.ne,
+}
+
+# Spark type names whose Python values pass isinstance() for each validity expected_type.
+_PYTHON_TYPES = {
+    "str": ("StringType",),
+    "int": ("ByteType", "ShortType", "IntegerType", "LongType", "BooleanType"),
+    "float": ("ByteType", "ShortType", "IntegerType", "LongType", "BooleanType", "FloatType", "DoubleType"),
+    "bool": ("BooleanType",),
+}
+
+_NUMERIC_TYPES = ("ByteType", "ShortType", "IntegerType", "LongType", "FloatType", "DoubleType", "DecimalType")
+
+FALLBACK_BATCH_ROWS = 10000
+
+# The RE2 spellings are Java syntax too (\x{..}, \p{Nd}); only the end anchor differs.
+_JAVA_FORMATS = {name: pattern.removesuffix("$") + r"\z" for name, pattern in ARROW_PATTERNS.items()}
+# Strings that are empty after str.strip()
+_JAVA_BLANK = "^[" + "".join(f"\\x{{{ord(c):x}}}" for c in PYTHON_WHITESPACE) + r"]*\z"
+
+
+def run_checks_spark(rules: list[RuleDefinition], df: Any) -> list[DQCheckResult]:
+    """Evaluate rules against a Spark DataFrame in one aggregate job.
+
+    Args:
+        rules: List of rules to evaluate.
+        df: pyspark DataFrame to check.
+
+    Returns:
+        List of DQCheckResult objects, in rule order.
+    """
+    try:
+        from pyspark.sql import functions as F
+    except ImportError:
+        raise RuntimeError("pyspark package required")
+
+    types = {f.name: type(f.dataType).__name__ for f in df.schema.fields}
+    expressions = [F.count(F.lit(1))]
+    slots: dict[tuple, int] = {}
+    fallback: list[RuleDefinition] = []
+    for rule in rules:
+        key = rule_key(rule)
+        if rule.dimension not in DIMENSION_CALCULATORS or key in slots:
+            continue
+        compiler = _COMPILERS.get(rule.dimension)
+        expression = compiler(F, rule.column, rule.config or {}, types) if compiler else None
+        if expression is None:
+            fallback.append(rule)
+        else:
+            slots[key] = len(expressions)
+            expressions.append(expression)
+
+    row = df.agg(*[expr.alias(f"m{i}") for i, expr in enumerate(expressions)]).collect()[0]
+    total = row[0]
+    measured = {key: ((row[index] or 0) / total) * 100.0 if total > 0 else 0.0 for key, index in slots.items()}
+
+    streamed = iter(run_checks_streaming(fallback, _local_batches(df, fallback))) if fallback else iter([])
+    results: list[DQCheckResult] = []
+    for rule in compile_rules(rules).rules:
+        if rule.calculator is None:
+            results.append(rule.unknown_dimension_result())
+        elif rule.key in measured:
+            results.append(rule.result(measured[rule.key], {}))
+        else:
+            results.append(next(streamed))
+    return results
+
+
+def _local_batches(df: Any, rules: list[RuleDefinition]) -> Iterator[list[dict]]:
+    """Stream the columns read by ``rules`` to the driver, one partition at a time."""
+    columns = [
+        name
+        for rule in rules
+        for name in DIMENSION_CALCULATORS[rule.dimension].required_columns(rule.column, rule.config)
+        if name in df.columns
+    ]
+    rows = (df.select(*dict.fromkeys(columns)) if columns else df).toLocalIterator()
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row.asDict())
+        if len(batch) >= FALLBACK_BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _col(F: Any, name: Optional[str], types: dict[str, str]) -> Any:
+    """Column by name, or an all-null column when missing (like ``row.get``)."""
+    return F.col(name) if name in types else F.lit(None)
+
+
+def _count_if(F: Any, condition: Any) -> Any:
+    return F.sum(F.when(condition, 1).otherwise(0))
+
+
+def _matches(column: Any, pattern: str) -> Any:
+    """``re.match`` semantics: the pattern must match at the start of the string value."""
+    return column.cast("string").rlike(f"^(?:{pattern})")
+
+
+def _isin(column: Any, spark_type: Optional[str], values: Any) -> Optional[Any]:
+    """Membership test, when Spark will not coerce the values to the column type."""
+    values = list(values)
+    if spark_type == "StringType" and all(isinstance(v, str) for v in values):
+        return column.isin(values)
+    if spark_type in _NUMERIC_TYPES and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return column.isin(values)  # Python 1 == 1.0, as in Spark numeric comparison
+    return None
+
+
+def _completeness(F: Any, column: Optional[str], cfg: dict, types: dict) -> Any:
+    col = _col(F, column, types)
+    if cfg.get("treat_empty_as_null", True) and types.get(column) == "StringType":
+        return _count_if(F, col.isNotNull() & ~col.rlike(_JAVA_BLANK))
+    return F.count(col)
+
+
+def _uniqueness(F: Any, column: Optional[str], cfg: dict, types: dict) -> Any:
+    keys = cfg.get("composite_keys", [column] if column else [])
+    if not keys or cfg.get("approximate") or cfg.get("spill_to_disk"):
+        return None
+    return F.countDistinct(F.struct(*[_col(F, key, types) for key in keys]))  # a struct keeps NULL as a key
+
+
+def _accuracy(F: Any, column: Optional[str], cfg: dict, types: dict) -> Any:
+    col = _col(F, column, types)
+    allowed = cfg.get("allowed_values", [])
+    if cfg.get("pattern"):
+        return _count_if(F, _matches(col, cfg["pattern"]))
+    if isinstance(allowed, dict):
+        return None  # values from a reference column are tested by the Python calculator
+    if allowed:
+        membership = _isin(col, types.get(column), allowed)
+        return None if membership is None else _count_if(F, membership)
+    min_val, max_val = cfg.get("min_value"), cfg.get("max_value")
+    if min_val is None and max_val is None:
+        return F.count(col)
+    if not all(v is None or isinstance(v, (int, float)) for v in (min_val, max_val)):
+        return None
+    number = col.cast("double")
+    condition = number.isNotNull()
+    if min_val is not None:
+        condition &= number >= float(min_val)
+    if max_val is not None:
+        condition &= number <= float(max_val)
+    return _count_if(F, condition)
+
+
+def _validity(F: Any, column: Optional[str], cfg: dict, types: dict) -> Any:
+    col = _col(F, column, types)
+    condition = F.lit(True)
+    if cfg.get("expected_type") in _PYTHON_TYPES:
+        condition = F.lit(types.get(column) in _PYTHON_TYPES.get(cfg["expected_type"], ()))
+    fmt = cfg.get("format")
+    if fmt:
+        condition &= _matches(col, _JAVA_FORMATS[fmt]) if fmt in _JAVA_FORMATS else _matches(col, fmt)
+    allowed = cfg.get("allowed_values")
+    if allowed is not None:
+        if not isinstance(allowed, (list, tuple)):
+            return None  # e.g. a string, where Python ``in`` tests substrings
+        membership = _isin(col, types.get(column), allowed) if allowed else F.lit(False)
+        if membership is None:
+            return None
+        condition &= membership
+    null_score = 0 if cfg.get("not_null", False) else 1
+    return F.sum(F.when(col.isNull(), null_score).when(condition, 1).otherwise(0))
+
+
+def _consistency(F: Any, column: Optional[str], cfg: dict, types: dict) -> Any:
+    if cfg.get("rule"):
+        return None  # expressions are evaluated by the Python calculator
+    col_a, col_b, op = cfg.get("column_a", column), cfg.get("column_b"), cfg.get("operator", "lt")
+    if not col_a or not col_b or op not in COMPARISONS:
+        return F.lit(0)
+    if col_a not in types or types.get(col_a) != types.get(col_b):
+        return None  # Python raises TypeError where Spark would coerce
+    return _count_if(F, COMPARISONS[op](F.col(col_a), F.col(col_b)))
+
+
+_COMPILERS: dict[str, Callable[[Any, Optional[str], dict, dict], Any]] = {
+    "completeness": _completeness,
+    "uniqueness": _uniqueness,
+    "accuracy": _accuracy,
+    "validity": _validity,
+    "consistency": _consistency,
+}
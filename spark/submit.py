@@ -57,10 +57,13 @@ def submit_dq_job(
     return subprocess.run(cmd, capture_output=True, text=True, timeout=3600)
 
 
-def submit_local(job_config: dict) -> dict:
+def submit_local(job_config: dict, workers: Optional[int] = None) -> dict:
     """Run DQ job locally (no Spark cluster needed).
 
-    Useful for development and testing.
+    Useful for development and testing. ``workers`` evaluates the rules in
+    a process pool of that size (overrides ``job_config["workers"]``).
     """
     from spark.dq_job import run_dq_checks
+    if workers is not None:
+        job_config = {**job_config, "workers": workers}
     return run_dq_checks(job_config)
@@ -0,0 +1,78 @@
+"""Tests for DQ metrics API endpoints."""
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.dependencies import SessionLocal, engine
+from api.models.database import Base, DataSource, DQRun, DQScore
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+client = TestClient(app)
+
+
+def _seed() -> tuple[str, str]:
+    db = SessionLocal()
+    try:
+        first = DataSource(name="a", type="sqlite", connection_config="{}")
+        second = DataSource(name="b", type="sqlite", connection_config="{}")
+        db.add_all([first, second])
+        db.flush()
+        for source, day, scores in [
+            (first, 1, {"completeness": 90.0, "validity": 70.0}),
+            (first, 2, {"completeness": 70.0}),
+            (second, 3, {"completeness": 100.0, "validity": 95.0}),
+        ]:
+            run = DQRun(source_id=source.id, status="completed", completed_at=datetime(2026, 1, day))
+            db.add(run)
+            db.flush()
+            db.add_all(
+                DQScore(run_id=run.id, source_id=source.id, dimension=dimension, score=score)
+                for dimension, score in scores.items()
+            )
+        db.commit()
+        return first.id, second.id
+    finally:
+        db.close()
+
+
+def test_metrics_without_scores():
+    assert client.get("/api/metrics/summary").json()["overall_score"] == 0.0
+    assert client.get("/api/metrics/dimensions").json() == []
+
+
+def test_summary_and_dimensions_aggregate_scores():
+    _seed()
+    dimensions = client.get("/api/metrics/dimensions").json()
+    assert dimensions == [
+        {"dimension": "completeness", "score": 86.67, "total_checks": 3, "passed_checks": 2},
+        {"dimension": "validity", "score": 82.5, "total_checks": 2, "passed_checks": 1},
+    ]
+    summary = client.get("/api/metrics/summary").json()
+    assert summary["dimensions"] == dimensions
+    assert summary["overall_score"] == 84.59
+    assert summary["total_runs"] == 3
+    assert summary["last_run_at"].startswith("2026-01-03")
+
+
+def test_source_metrics_aggregate_its_scores():
+    first, _ = _seed()
+    metrics = client.get(f"/api/metrics/sources/{first}").json()
+    assert metrics["source_name"] == "a"
+    assert metrics["dimensions"] == [
+        {"dimension": "completeness", "score": 80.0, "total_checks": 2, "passed_checks": 1},
+        {"dimension": "validity", "score": 70.0, "total_checks": 1, "passed_checks": 0},
+    ]
+    assert metrics["overall_score"] == 75.0
+    assert metrics["run_count"] == 2
+    assert metrics["last_run_at"].startswith("2026-01-02")
+    assert client.get("/api/metrics/sources/missing").status_code == 404
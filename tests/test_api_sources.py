@@ -140,3 +140,29 @@ def test_connection_unsupported_type():
     data = resp.json()
     assert data["success"] is False
     assert "error" in data
+
+
+def test_profile_sqlite_table(tmp_path):
+    """Profiling a source table returns one profile per column."""
+    db_path = tmp_path / "profile.db"
+    import sqlite3
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE people (id INTEGER, name TEXT)")
+    conn.executemany("INSERT INTO people VALUES (?, ?)", [(1, "a"), (2, None), (3, "a")])
+    conn.commit()
+    conn.close()
+    create_resp = client.post("/api/sources", json={
+        "name": "Profile SQLite", "type": "sqlite", "connection_config": {"database": str(db_path)},
+    })
+    source_id = create_resp.json()["id"]
+
+    resp = client.post(f"/api/sources/{source_id}/profile", json={"table_name": "people"})
+    assert resp.status_code == 200
+    columns = resp.json()["columns"]
+    assert list(columns) == ["id", "name"]
+    assert columns["id"]["distinct_count"] == 3
+    assert columns["name"]["null_count"] == 1
+
+    resp = client.post(f"/api/sources/{source_id}/profile", json={"table_name": "people", "columns": ["name"]})
+    assert list(resp.json()["columns"]) == ["name"]
+    assert client.post("/api/sources/missing/profile", json={"table_name": "people"}).status_code == 404
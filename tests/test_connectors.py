@@ -2,7 +2,7 @@
 
 import pytest
 
-from connectors.base import DataConnector
+from connectors.base import DataConnector, SQLPushdownMixin
 from connectors.adls_gen2 import ADLSGen2Connector
 from connectors.sql_server import SQLServerConnector
 
@@ -16,6 +16,10 @@ class TestDataConnectorInterface:
     def test_sql_server_is_connector(self):
         assert issubclass(SQLServerConnector, DataConnector)
 
+    def test_only_sql_connectors_push_down(self):
+        assert issubclass(SQLServerConnector, SQLPushdownMixin) and SQLServerConnector.pushdown_dialect
+        assert ADLSGen2Connector.pushdown_dialect is None and not hasattr(ADLSGen2Connector, "aggregate")
+
     def test_adls_not_connected(self):
         connector = ADLSGen2Connector()
         assert connector.test_connection() is False
@@ -104,6 +104,42 @@ class TestS3Connector:
         schema = connector.get_schema("data.json")
         assert schema == {"id": "int", "name": "str"}
 
+    def test_max_timestamp_reads_parquet_footer_only(self, connector: S3Connector) -> None:
+        pa = pytest.importorskip("pyarrow")
+        import io
+        import os
+        from datetime import datetime
+
+        import pyarrow.parquet as pq
+
+        days = [1, 9, None, 3] * 25000
+        table = pa.table({
+            "ts": pa.array([datetime(2024, 1, d) if d else None for d in days], pa.timestamp("us")),
+            "payload": [os.urandom(16).hex() for _ in days],
+        })
+        sink = io.BytesIO()
+        pq.write_table(table, sink, row_group_size=10000)
+        data = sink.getvalue()
+
+        ranges = []
+
+        def get_object(Bucket: str, Key: str, Range: str) -> dict:
+            start, end = map(int, Range.removeprefix("bytes=").split("-"))
+            ranges.append((start, end))
+            body = MagicMock()
+            body.read.return_value = data[start : end + 1]
+            return {"Body": body}
+
+        connector._client = MagicMock()
+        connector._bucket = "b"
+        connector._client.head_object.return_value = {"ContentLength": len(data), "LastModified": "modified"}
+        connector._client.get_object.side_effect = get_object
+
+        assert connector.max_timestamp("events.parquet", "ts") == datetime(2024, 1, 9)
+        assert sum(end + 1 - start for start, end in ranges) < len(data) // 10
+        assert connector.max_timestamp("events.parquet", "payload") is None
+        assert connector.max_timestamp("events.parquet", None) == "modified"
+
 
 # === Redshift Connector Tests ===
 
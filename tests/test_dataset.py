@@ -0,0 +1,149 @@
+"""Tests for the columnar dataset representation."""
+
+import pytest
+
+from engine.dataset import ColumnarDataset, as_columnar
+from engine.rule_engine import RuleDefinition, run_checks
+
+
+def test_from_rows_projects_all_keys(sample_data):
+    dataset = ColumnarDataset.from_rows(sample_data)
+    assert len(dataset) == 5
+    assert dataset.column("name") == ["Alice", "Bob", None, "Diana", "Eve"]
+    assert dataset.column("missing") == [None] * 5
+    assert dataset.to_rows() == sample_data
+
+
+def test_as_columnar_passthrough(sample_data):
+    dataset = ColumnarDataset.from_rows(sample_data, ["id"])
+    assert as_columnar(dataset, ["name"]) is dataset
+
+
+def test_from_batches_keeps_mixed_types():
+    dataset = ColumnarDataset.from_batches(["v"], [[(1,), (2.5,)], [("x",), (None,)]])
+    assert dataset.column("v") == [1, 2.5, "x", None]
+    assert dataset.arrow_column("v") is None
+
+
+def test_iter_slices(sample_data):
+    slices = list(ColumnarDataset.from_rows(sample_data, ["id"]).iter_slices(2))
+    assert [s.column("id") for s in slices] == [[1, 2], [3, 4], [4]]
+
+
+def test_value_counts_keeps_types_apart():
+    dataset = ColumnarDataset.from_rows([{"v": v} for v in [1, 1.0, True, "1", None, 1] * 10])
+    assert dataset.value_counts("v") == {
+        (int, 1): 20, (float, 1.0): 10, (bool, True): 10, (str, "1"): 10, (type(None), None): 10
+    }
+    assert dataset.value_counts("v") is dataset.value_counts("v")
+
+
+def test_value_counts_skips_distinct_and_unhashable_columns():
+    assert ColumnarDataset.from_rows([{"v": i} for i in range(100)]).value_counts("v") is None
+    assert ColumnarDataset.from_rows([{"v": [1]}] * 10).value_counts("v") is None
+
+
+def test_format_rules_on_repeated_values_match_per_row_checks():
+    rows = [{"v": v} for v in ["a@b.io", "bad", 7, None, "a@b.io", "x@y.org"] * 50]
+    rules = [
+        RuleDefinition(name="f", dimension="validity", column="v", config={"format": "email", "not_null": True}),
+        RuleDefinition(name="t", dimension="validity", column="v", config={"expected_type": "str", "format": "email"}),
+        RuleDefinition(name="p", dimension="accuracy", column="v", config={"pattern": r"\w@"}),
+    ]
+    assert [r.metric_value for r in run_checks(rules, rows)] == [50.0, round(200 / 3, 4), 50.0]
+
+
+class TestArrowBacked:
+    @pytest.fixture
+    def table(self, sample_data):
+        pa = pytest.importorskip("pyarrow")
+        return pa.Table.from_pylist(sample_data)
+
+    def test_from_batches_builds_arrow_columns(self):
+        pytest.importorskip("pyarrow")
+        dataset = ColumnarDataset.from_batches(["id", "name"], [[(1, None), (2, None)], [(3, "c")]])
+        assert dataset.arrow_column("id") is not None
+        assert dataset.column("name") == [None, None, "c"]
+
+    def test_calculators_match_row_path(self, sample_data, table):
+        rules = [
+            RuleDefinition(name="c", dimension="completeness", column="name"),
+            RuleDefinition(name="u", dimension="uniqueness", column="id"),
+            RuleDefinition(name="a", dimension="accuracy", column="age", config={"min_value": 0, "max_value": 150}),
+            RuleDefinition(name="s", dimension="accuracy", column="status", config={"allowed_values": ["active"]}),
+            RuleDefinition(name="v", dimension="validity", column="email", config={"format": "email"}),
+            RuleDefinition(
+                name="k",
+                dimension="consistency",
+                config={"column_a": "created_at", "column_b": "updated_at", "operator": "lte"},
+            ),
+            RuleDefinition(name="t", dimension="timeliness", column="created_at"),
+            RuleDefinition(name="p", dimension="profiling", column="age"),
+        ]
+        assert run_checks(rules, ColumnarDataset.from_arrow(table)) == run_checks(rules, sample_data)
+
+    def test_completeness_from_validity_bitmap(self):
+        pa = pytest.importorskip("pyarrow")
+        from engine.dimensions.completeness import CompletenessCalculator
+
+        table = pa.table({"col": ["a", None, "", " \t", "　", "b"], "num": [1, None, 3, None, 5, 6]})
+        dataset = ColumnarDataset.from_arrow(table)
+        calc = CompletenessCalculator()
+        assert calc.calculate(dataset, "col") == calc.calculate(table.to_pylist(), "col")
+        assert round(calc.calculate(dataset, "col", {"treat_empty_as_null": False}), 2) == 83.33
+        assert round(calc.calculate(dataset, "num"), 2) == 66.67
+
+    def test_builtin_formats_match_python_regex(self):
+        pa = pytest.importorskip("pyarrow")
+        from engine.dimensions.validity import BUILTIN_FORMATS, ValidityCalculator
+
+        # Python-regex corner cases: Unicode digits, a trailing newline, Unicode whitespace, uppercase hex.
+        values = [
+            None,
+            "a.b@example.com",
+            "a.b@example.com\n",
+            "a.b@example.com\n\n",
+            "a@b.c",
+            "+14155550123",
+            "+1٤١٥٥٥٥٠١٢٣",
+            "0123456789",
+            "https://example.com/x",
+            "https://example.com/　x",
+            "https://example.com/\x1cx",
+            "http://",
+            "123e4567-e89b-12d3-a456-426614174000",
+            "123E4567-E89B-12D3-A456-426614174000",
+            "2024-01-31",
+            "２０２４-01-31",
+            "2024-1-31",
+        ]
+        dataset = ColumnarDataset.from_arrow(pa.table({"v": pa.array(values, type=pa.string())}))
+        calc = ValidityCalculator()
+        for fmt in BUILTIN_FORMATS:
+            for not_null in (False, True):
+                config = {"format": fmt, "not_null": not_null}
+                assert calc.calculate(dataset, "v", config) == calc.calculate([{"v": v} for v in values], "v", config)
+
+    @pytest.mark.parametrize(
+        "tz, reference_time",
+        [
+            (None, "2024-01-02T00:00:00"),
+            ("UTC", "2024-01-02T00:00:00+00:00"),
+            ("Europe/Paris", "2024-01-02T03:00:00+02:00"),
+        ],
+    )
+    def test_timeliness_on_timestamp_column_matches_row_path(self, tz, reference_time):
+        pa = pytest.importorskip("pyarrow")
+        from datetime import datetime, timedelta, timezone
+
+        from engine.dimensions.timeliness import TimelinessCalculator
+
+        base = datetime(2024, 1, 2, tzinfo=timezone.utc if tz else None)
+        values = [None if i % 7 == 0 else base - timedelta(minutes=37 * i, microseconds=i) for i in range(200)]
+        column = pa.array(values, type=pa.timestamp("us", tz))
+        calc = TimelinessCalculator()
+        for config in ({"reference_time": reference_time}, {"reference_time": "2024-01-02T00:00:00+05:00"}):
+            arrow_score = calc.calculate(ColumnarDataset.from_arrow(pa.table({"t": column})), "t", config)
+            arrow_details = calc._last_details
+            assert arrow_score == calc.calculate([{"t": v} for v in column.to_pylist()], "t", config)
+            assert arrow_details == calc._last_details
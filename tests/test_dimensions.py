@@ -1,8 +1,11 @@
 """Tests for each DQ dimension calculator."""
 
+import pytest
+
 from engine.dimensions.accuracy import AccuracyCalculator
 from engine.dimensions.completeness import CompletenessCalculator
 from engine.dimensions.consistency import ConsistencyCalculator
+from engine.dimensions.profiling import ProfilingCalculator
 from engine.dimensions.timeliness import TimelinessCalculator
 from engine.dimensions.uniqueness import UniquenessCalculator
 from engine.dimensions.validity import ValidityCalculator
@@ -68,6 +71,23 @@ class TestConsistency:
     def test_empty_data(self):
         assert ConsistencyCalculator().calculate([], config={"column_a": "a", "column_b": "b"}) == 0.0
 
+    def test_rule_expression(self, sample_data):
+        calc = ConsistencyCalculator()
+        config = {"rule": "created_at <= updated_at and (name is None or age between_ok)"}
+        with pytest.raises(ValueError):
+            calc.calculate(sample_data, config=config)
+        config = {"rule": "created_at <= updated_at and (name is None or 0 <= age <= 150)"}
+        assert calc.required_columns(None, config) == ["created_at", "updated_at", "name", "age"]
+        # Row 3 is out of order and row 4 has age 200.
+        assert calc.calculate(sample_data, config=config) == 60.0
+
+    def test_rule_matches_column_comparison(self, sample_data):
+        legacy = {"column_a": "created_at", "column_b": "updated_at", "operator": "lte"}
+        calc = ConsistencyCalculator()
+        assert calc.calculate(sample_data, config={"rule": "created_at <= updated_at"}) == calc.calculate(
+            sample_data, config=legacy
+        )
+
 
 class TestTimeliness:
     def test_fresh_data(self):
@@ -85,6 +105,20 @@ class TestTimeliness:
         score = TimelinessCalculator().calculate(data, "ts", {"max_age_hours": 24})
         assert score == 0.0
 
+    def test_age_details(self):
+        from datetime import datetime, timedelta
+
+        calc = TimelinessCalculator()
+        ref = datetime(2024, 1, 10)
+        ages = [1] * 50 + [10] * 49 + [100]
+        data = [{"ts": (ref - timedelta(hours=h)).isoformat()} for h in ages] + [{"ts": "not a date"}, {"ts": None}]
+        score = calc.calculate(data, "ts", {"reference_time": ref.isoformat(), "max_age_hours": 24})
+        assert score == 99 / 102 * 100
+        details = calc._last_details
+        assert details["max_lag_hours"] == 100
+        assert abs(details["p50_age_hours"] - 1) <= 0.01
+        assert abs(details["p99_age_hours"] - 10) <= 0.1
+
 
 class TestValidity:
     def test_email_format(self, sample_data):
@@ -101,3 +135,89 @@ class TestValidity:
         data = [{"s": "a"}, {"s": "b"}, {"s": "c"}]
         score = ValidityCalculator().calculate(data, "s", {"allowed_values": ["a", "b"]})
         assert abs(score - 66.67) < 1.0
+
+
+class TestApproximateUniqueness:
+    def test_estimate_within_error_bound(self):
+        data = [{"id": i % 20000} for i in range(50000)]
+        calc = UniquenessCalculator()
+        score = calc.calculate(data, "id", {"approximate": True, "precision": 12})
+        details = calc._last_details
+        assert details["method"] == "hyperloglog"
+        assert details["precision"] == 12
+        assert abs(details["estimated_distinct"] - 20000) <= 20000 * 4 * details["relative_error"]
+        assert abs(score - 40.0) <= 40.0 * 4 * details["relative_error"]
+
+    def test_small_cardinality_composite_keys(self):
+        data = [{"a": 1, "b": "x"}, {"a": 1, "b": "y"}, {"a": 1.0, "b": "x"}]
+        calc = UniquenessCalculator()
+        score = calc.calculate(data, config={"composite_keys": ["a", "b"], "approximate": True})
+        assert abs(score - 66.67) < 1.0
+
+    def test_sketch_memory_is_fixed(self):
+        from engine.sketches import HyperLogLog
+
+        sketch = HyperLogLog(10)
+        sketch.add_many(range(100000))
+        assert len(sketch.registers) == 1024
+        other = HyperLogLog(10)
+        other.add_many(range(50000, 150000))
+        assert abs(sketch.merge(other).estimate() - 150000) < 150000 * 0.15
+
+
+class TestSpilledUniqueness:
+    def test_matches_in_memory_result(self, sample_data):
+        calc = UniquenessCalculator()
+        score = calc.calculate(sample_data, "id", {"spill_to_disk": True})
+        assert score == 80.0
+        details = calc._last_details
+        assert details["duplicate_keys"] == 1
+        assert details["duplicate_rows"] == 1
+        assert details["sample_duplicates"] == [{"key": 4, "count": 2}]
+
+    def test_repartitions_under_tiny_budget(self, tmp_path):
+        data = [{"a": i % 3000, "b": str(i % 5)} for i in range(9000)]
+        config = {"composite_keys": ["a", "b"], "spill_to_disk": True, "memory_limit_mb": 0.01, "sample_size": 3}
+        calc = UniquenessCalculator()
+        exact = UniquenessCalculator().calculate(data, config={"composite_keys": ["a", "b"]})
+        assert calc.calculate(data, config={**config, "spill_dir": str(tmp_path)}) == exact
+        assert len(calc._last_details["sample_duplicates"]) == 3
+        assert list(tmp_path.iterdir()) == []
+
+    def test_equal_but_distinct_objects_in_composite_keys(self):
+        a, b = "".join(["ke", "y"]), "".join(["k", "ey"])
+        assert a == b and a is not b
+        data = [{"x": a, "y": a}, {"x": a, "y": b}]
+        config = {"composite_keys": ["x", "y"]}
+        exact = UniquenessCalculator().calculate(data, config=config)
+        calc = UniquenessCalculator()
+        assert calc.calculate(data, config={**config, "spill_to_disk": True}) == exact == 50.0
+        assert calc._last_details["duplicate_keys"] == 1
+
+
+class TestMergeableState:
+    CASES = [
+        (CompletenessCalculator, "name", {}),
+        (UniquenessCalculator, "id", {}),
+        (UniquenessCalculator, "id", {"approximate": True}),
+        (UniquenessCalculator, "id", {"spill_to_disk": True}),
+        (AccuracyCalculator, "age", {"min_value": 0, "max_value": 150}),
+        (ConsistencyCalculator, None, {"column_a": "created_at", "column_b": "updated_at", "operator": "lte"}),
+        (ConsistencyCalculator, None, {"rule": "created_at <= updated_at or age > 100"}),
+        (TimelinessCalculator, "created_at", {"reference_time": "2024-01-02T00:00:00", "max_age_hours": 36}),
+        (ValidityCalculator, "email", {"format": "email"}),
+        (ProfilingCalculator, "age", {}),
+    ]
+
+    def test_split_and_merge_matches_calculate(self, sample_data):
+        for calculator_class, column, config in self.CASES:
+            calc = calculator_class()
+            expected = calc.calculate(sample_data, column, config)
+            expected_details = calc._last_details
+
+            left, right = calc.init(column, config), calc.init(column, config)
+            calc.update(left, sample_data[:3])
+            calc.update(right, sample_data[3:])
+            score, details = calc.finalize(calc.merge(left, right))
+            assert score == expected, calculator_class.__name__
+            assert details == expected_details, calculator_class.__name__
@@ -0,0 +1,100 @@
+"""Tests for consistency rule expressions."""
+
+from datetime import date, datetime
+
+import pytest
+
+from engine.dataset import ColumnarDataset
+from engine.expressions import compile_expression
+from engine.pushdown import DIALECTS, expression_sql
+
+ROWS = [
+    {"a": 1, "b": 2, "f": 0.5, "s": "x", "flag": True, "start": datetime(2024, 1, 1, 6), "end": datetime(2024, 1, 3)},
+    {"a": 5, "b": 0, "f": -1.5, "s": "yz", "flag": False, "start": datetime(2024, 2, 1), "end": datetime(2024, 1, 1)},
+    {"a": None, "b": 3, "f": None, "s": None, "flag": None, "start": None, "end": datetime(2024, 3, 1)},
+    {"a": -4, "b": -4, "f": 2.0, "s": "", "flag": True, "start": datetime(2023, 12, 31), "end": datetime(2024, 1, 1)},
+]
+
+EXPRESSIONS = [
+    ("a < b", [True, False, None, False]),
+    ("a <= b < 3", [True, False, False, True]),
+    ("a / b > 0", [True, None, None, True]),
+    ("a % 3 == 2", [False, True, None, True]),
+    ("a * 2 + f > 2", [True, True, None, False]),
+    ("-a > b", [False, False, None, True]),
+    ("a is None or a > 0", [True, True, True, False]),
+    ("not (flag and a > 0)", [False, True, None, True]),
+    ("s in ('x', '')", [True, False, None, True]),
+    ("length(s) == 2", [False, True, None, False]),
+    ("coalesce(a, b) > 2", [False, True, True, False]),
+    ("(a if flag else b) > 0", [True, False, True, False]),
+    ("start < end", [True, False, None, True]),
+    ("days_between(start, end) >= 1", [True, False, None, True]),
+    ("date(start) == date('2024-01-01')", [True, False, None, False]),
+    ("year(start) == 2024 and month(end) == 1", [True, True, False, False]),
+    ("s < a", [None, None, None, None]),
+    ("s == a", [False, False, None, False]),
+    ("col('a') == a", [True, True, None, True]),
+]
+
+
+@pytest.mark.parametrize("text,expected", EXPRESSIONS)
+def test_expression_values(text, expected):
+    expression = compile_expression(text)
+    dataset = ColumnarDataset.from_rows(ROWS, expression.columns)
+    assert expression.evaluate(dataset) == expected
+    assert expression.count(dataset) == sum(1 for value in expected if value)
+
+
+@pytest.mark.parametrize("text,expected", EXPRESSIONS)
+def test_arrow_columns_match_python(text, expected):
+    pa = pytest.importorskip("pyarrow")
+    expression = compile_expression(text)
+    dataset = ColumnarDataset.from_arrow(pa.Table.from_pylist(ROWS))
+    assert expression.count(dataset) == sum(1 for value in expected if value)
+
+
+def test_iso_strings_are_dates():
+    expression = compile_expression("days_between(start, end) == 1.5 and date(end) == date('2024-01-03')")
+    rows = [{"start": "2024-01-01T12:00:00", "end": "2024-01-03"}, {"start": "not a date", "end": "2024-01-03"}]
+    assert expression.evaluate(ColumnarDataset.from_rows(rows)) == [True, None]
+    assert compile_expression("date(d) < date('2024-06-01')").evaluate(
+        ColumnarDataset.from_rows([{"d": date(2024, 1, 1)}])
+    ) == [True]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "__import__('os').system('true')",
+        "a.real > 0",
+        "a[0] > 0",
+        "open('x')",
+        "lambda: 1",
+        "a ** 2 > 1",
+        "a is 1",
+        "a in b",
+        "a in (1, None)",
+        "length(a, b)",
+        "a <",
+    ],
+)
+def test_rejects_unsupported_syntax(text):
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+
+def test_expression_sql():
+    schema = {"a": "INTEGER", "b": "BIGINT", "s": "TEXT", "start": "DATE", "end": "DATE", "ts": "TIMESTAMP"}
+    sqlite = DIALECTS["sqlite"]
+    assert expression_sql("a / b > 0.5 or s is None", schema, sqlite) == (
+        '(((CAST("a" AS REAL) / NULLIF(CAST("b" AS REAL), 0)) > 0.5) OR ("s" IS NULL))'
+    )
+    assert expression_sql("start <= end and s in (\"it's\", 'b')", schema, sqlite) == (
+        """(("start" <= "end") AND ("s" IN ('it''s', 'b')))"""
+    )
+    assert expression_sql("coalesce(a, 0) > -1", schema, DIALECTS["postgresql"]) == '(COALESCE("a", 0) > -1)'
+    # Untranslatable: modulo, functions, coercing comparisons, collation-dependent text order, bare columns.
+    for text in ["a % 2 == 0", "year(start) > 2000", "s < 1", "start < ts", "a > 0 and s", "missing > 1"]:
+        assert expression_sql(text, schema, sqlite) is None, text
+    assert expression_sql("s < 'm'", schema, DIALECTS["postgresql"]) is None
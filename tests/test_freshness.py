@@ -0,0 +1,69 @@
+"""Tests for metadata-only freshness checks."""
+
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+
+from connectors.sqlite import SQLiteConnector
+from engine.freshness import run_checks_with_metadata
+from engine.rule_engine import RuleDefinition, run_checks
+
+REFERENCE = {"reference_time": "2024-01-02T00:00:00", "max_age_hours": 24}
+
+RULES = [
+    RuleDefinition(name="fresh", dimension="timeliness", column="ts", config={**REFERENCE, "mode": "max_only"}),
+    RuleDefinition(
+        name="stale",
+        dimension="timeliness",
+        column="ts",
+        threshold=100.0,
+        config={**REFERENCE, "mode": "max_only", "reference_time": "2024-03-01T00:00:00"},
+    ),
+    RuleDefinition(name="all_rows", dimension="timeliness", column="ts", config=REFERENCE),
+    RuleDefinition(name="id_complete", dimension="completeness", column="id"),
+]
+
+
+@pytest.fixture
+def connector(tmp_path):
+    db_path = str(tmp_path / "events.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE events (id INTEGER, ts TEXT)")
+    conn.executemany(
+        "INSERT INTO events VALUES (?, ?)",
+        [(1, "2023-12-01T00:00:00"), (2, None), (3, "2024-01-01T06:00:00"), (4, "2023-06-01T00:00:00")],
+    )
+    conn.commit()
+    conn.close()
+
+    connector = SQLiteConnector()
+    connector.connect({"database": db_path})
+    yield connector
+    connector.close()
+
+
+def test_max_only_from_metadata_matches_scan(connector):
+    """Freshness from SELECT MAX() scores like scanning every row in max_only mode."""
+    scanned = run_checks(RULES, connector.read_data("events"))
+    results = run_checks_with_metadata(
+        RULES, connector, "events", lambda rest: run_checks(rest, connector.read_data("events"))
+    )
+    assert results == scanned
+    assert results[0].metric_value == 100.0 and results[0].details == {"lag_hours": 18.0}
+    assert results[1].metric_value == 0.0 and not results[1].passed
+
+
+def test_metadata_only_rules_skip_the_scan(connector):
+    run_rest = MagicMock()
+    results = run_checks_with_metadata(RULES[:2], connector, "events", run_rest)
+    run_rest.assert_not_called()
+    assert [r.rule_name for r in results] == ["fresh", "stale"]
+
+
+def test_unknown_metadata_falls_back_to_scan(connector):
+    rows = connector.read_data("events")
+    source = MagicMock()
+    source.max_timestamp.side_effect = [None, Exception("no access")]
+    results = run_checks_with_metadata(RULES, source, "events", lambda rest: run_checks(rest, rows))
+    assert results == run_checks(RULES, rows)
@@ -1,12 +1,17 @@
 """Tests for job execution and DQ check processing."""
 
 import json
+import threading
+import time
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
 
 from api.main import app
-from api.dependencies import engine
-from api.models.database import Base
+from api.dependencies import SessionLocal, engine
+from api.job_runner import JobRunner, get_job_runner, shutdown_job_runner
+from api.models.database import Base, DataSource, DQResult, DQRun
 
 # Create a test database for each test
 @pytest.fixture(autouse=True)
@@ -14,12 +19,23 @@ def setup_db():
     """Create tables before each test and drop after."""
     Base.metadata.create_all(bind=engine)
     yield
+    get_job_runner().wait(timeout=60)
     Base.metadata.drop_all(bind=engine)
 
 
 client = TestClient(app)
 
 
+def wait_for_job(job_id: str, timeout: float = 60.0) -> dict:
+    """Poll a job until it leaves the pending and running states."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] not in ("pending", "running") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
 def test_job_execution_with_sqlite_source():
     """Test successful job execution with SQLite source and rules."""
     # Create a SQLite data source
@@ -67,14 +83,17 @@ def test_job_execution_with_sqlite_source():
         }
     })
 
-    # Should fail initially because in-memory SQLite won't have any tables
+    # Jobs are queued and executed in the background
     assert job_resp.status_code == 201
     job = job_resp.json()
 
     # The job should exist and have a status
     assert "id" in job
     assert job["source_id"] == source_id
-    assert job["status"] in ["running", "failed"]  # Could be either depending on execution timing
+    assert job["status"] == "pending"
+
+    # Should fail because in-memory SQLite won't have any tables
+    assert wait_for_job(job["id"])["status"] == "failed"
 
 
 def test_job_execution_with_missing_source():
@@ -90,9 +109,7 @@ def test_job_execution_with_missing_source():
     job = job_resp.json()
 
     # Check the job details - it should have failed
-    job_detail_resp = client.get(f"/api/jobs/{job['id']}")
-    assert job_detail_resp.status_code == 200
-    job_detail = job_detail_resp.json()
+    job_detail = wait_for_job(job["id"])
     assert job_detail["status"] == "failed"
     assert "not found" in job_detail.get("error_message", "").lower()
 
@@ -121,8 +138,7 @@ def test_job_execution_with_no_rules():
     job = job_resp.json()
 
     # Job should fail because no rules found
-    job_detail_resp = client.get(f"/api/jobs/{job['id']}")
-    job_detail = job_detail_resp.json()
+    job_detail = wait_for_job(job["id"])
     assert job_detail["status"] == "failed"
     assert "no active rules" in job_detail.get("error_message", "").lower()
 
@@ -138,11 +154,10 @@ def test_job_list_and_filtering():
     source_id = source_resp.json()["id"]
 
     # Submit multiple jobs
-    for i in range(3):
-        client.post("/api/jobs", json={
-            "source_id": source_id,
-            "parameters": {"test_job": i}
-        })
+    job_ids = [
+        client.post("/api/jobs", json={"source_id": source_id, "parameters": {"test_job": i}}).json()["id"]
+        for i in range(3)
+    ]
 
     # Test job listing
     list_resp = client.get("/api/jobs")
@@ -150,6 +165,7 @@ def test_job_list_and_filtering():
     job_list = list_resp.json()
     assert job_list["total"] == 3
     assert len(job_list["items"]) == 3
+    assert [item["id"] for item in job_list["items"]] == job_ids[::-1]  # newest first, queued or not
 
     # Test filtering by source
     filtered_resp = client.get(f"/api/jobs?source_id={source_id}")
@@ -158,8 +174,10 @@ def test_job_list_and_filtering():
     assert filtered_list["total"] == 3
 
     # Test filtering by status
+    assert get_job_runner().wait(timeout=60)
     status_resp = client.get("/api/jobs?status=failed")
     assert status_resp.status_code == 200
+    assert status_resp.json()["total"] == 3
 
 
 def test_job_retry_functionality():
@@ -180,13 +198,15 @@ def test_job_retry_functionality():
     original_job_id = job_resp.json()["id"]
 
     # Wait for it to complete/fail, then retry
+    wait_for_job(original_job_id)
     retry_resp = client.post(f"/api/jobs/{original_job_id}/retry")
     assert retry_resp.status_code == 200
 
     new_job = retry_resp.json()
     assert new_job["id"] != original_job_id
     assert new_job["source_id"] == source_id
-    assert new_job["status"] in ["running", "failed", "pending"]
+    assert new_job["status"] == "pending"
+    assert wait_for_job(new_job["id"])["status"] == "failed"  # the retry is executed too
 
 
 def test_get_nonexistent_job():
@@ -237,4 +257,159 @@ def test_job_execution_creates_results():
     assert "started_at" in job  # Should have started_at timestamp
     assert job["total_rules"] == 0  # Will be 0 initially, updated after execution
     assert job["passed_rules"] == 0
-    assert job["failed_rules"] == 0
\ No newline at end of file
+    assert job["failed_rules"] == 0
+
+def test_job_streams_sqlite_table(tmp_path):
+    """A job over a real table streams it in batches and stores one result per rule."""
+    import sqlite3
+
+    db_path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE customers (id INTEGER, name TEXT)")
+    rows = [(i, None if i % 4 == 0 else f"n{i}") for i in range(25000)]
+    conn.executemany("INSERT INTO customers VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+    source_id = client.post("/api/sources", json={
+        "name": "streamed", "type": "sqlite", "connection_config": {"database": db_path}
+    }).json()["id"]
+    rule_ids = [
+        client.post("/api/rules", json={
+            "name": "name_complete", "dimension": "completeness", "source_id": source_id,
+            "column_name": "name", "threshold": 80.0,
+        }).json()["id"],
+        client.post("/api/rules", json={
+            "name": "id_unique", "dimension": "uniqueness", "source_id": source_id,
+            "column_name": "id", "threshold": 100.0,
+        }).json()["id"],
+    ]
+
+    job = wait_for_job(client.post("/api/jobs", json={"source_id": source_id, "rule_ids": rule_ids}).json()["id"])
+    assert job["status"] == "completed"
+    assert job["total_rules"] == 2
+    assert (job["passed_rules"], job["failed_rules"]) == (1, 1)  # 75% complete fails, ids are unique
+
+    parallel = wait_for_job(client.post("/api/jobs", json={
+        "source_id": source_id, "rule_ids": rule_ids, "parameters": {"workers": 2, "pushdown": False},
+    }).json()["id"])
+    assert parallel["status"] == "completed"
+    assert parallel["passed_rules"] == 1
+
+
+def test_job_results_keep_their_rule_ids(tmp_path):
+    """Results are stored against the rule that produced them, even when rule names repeat."""
+    import sqlite3
+
+    db_path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE customers (id INTEGER, name TEXT)")
+    conn.executemany("INSERT INTO customers VALUES (?, ?)", [(i, None if i % 4 == 0 else f"n{i}") for i in range(100)])
+    conn.commit()
+    conn.close()
+
+    source_id = client.post("/api/sources", json={
+        "name": "dupes", "type": "sqlite", "connection_config": {"database": db_path}
+    }).json()["id"]
+    thresholds = {}
+    for threshold in (50.0, 90.0):
+        rule_id = client.post("/api/rules", json={
+            "name": "name_complete", "dimension": "completeness", "source_id": source_id,
+            "column_name": "name", "threshold": threshold,
+        }).json()["id"]
+        thresholds[rule_id] = threshold
+
+    job = wait_for_job(client.post("/api/jobs", json={"source_id": source_id}).json()["id"])
+    assert job["status"] == "completed", job.get("error_message")
+    assert (job["passed_rules"], job["failed_rules"]) == (1, 1)
+    db = SessionLocal()
+    try:
+        results = db.query(DQResult).filter(DQResult.run_id == job["id"]).all()
+    finally:
+        db.close()
+    assert {result.rule_id: result.threshold for result in results} == thresholds
+    assert {result.rule_id: result.passed for result in results} == {
+        rule_id: threshold < 75.0 for rule_id, threshold in thresholds.items()
+    }
+
+    # The run's completeness score is stored for the metrics endpoints
+    dimensions = client.get("/api/metrics/dimensions").json()
+    assert dimensions == [{"dimension": "completeness", "score": 75.0, "total_checks": 1, "passed_checks": 0}]
+
+
+def test_job_checks_referential_integrity_against_named_source(tmp_path):
+    """Reference sources named in a rule are resolved to registered data sources."""
+    import sqlite3
+
+    crm_path, shop_path = str(tmp_path / "crm.db"), str(tmp_path / "shop.db")
+    conn = sqlite3.connect(crm_path)
+    conn.execute("CREATE TABLE customers (id INTEGER)")
+    conn.executemany("INSERT INTO customers VALUES (?)", [(i,) for i in range(10)])
+    conn.commit()
+    conn.close()
+    conn = sqlite3.connect(shop_path)
+    conn.execute("CREATE TABLE orders (customer_id INTEGER)")
+    conn.executemany("INSERT INTO orders VALUES (?)", [(1,), (2,), (3,), (42,)])
+    conn.commit()
+    conn.close()
+
+    client.post("/api/sources", json={"name": "crm", "type": "sqlite", "connection_config": {"database": crm_path}})
+    shop_id = client.post("/api/sources", json={
+        "name": "shop", "type": "sqlite", "connection_config": {"database": shop_path}
+    }).json()["id"]
+    rule_resp = client.post("/api/rules", json={
+        "name": "order_customer_exists", "dimension": "referential_integrity", "source_id": shop_id,
+        "column_name": "customer_id", "threshold": 100.0,
+        "config": {
+            "reference": {"source": "crm", "table": "customers", "column": "id", "cache_dir": str(tmp_path / "cache")}
+        },
+    })
+    assert rule_resp.status_code == 201
+
+    job = client.post("/api/jobs", json={"source_id": shop_id, "rule_ids": [rule_resp.json()["id"]]}).json()
+    job = wait_for_job(job["id"])
+    assert job["status"] == "completed", job.get("error_message")
+    assert job["failed_rules"] == 1
+    results = client.get(f"/api/jobs/{job['id']}").json()
+    assert results["status"] == "completed"
+
+
+def test_job_runner_limits_concurrency_per_source_type(monkeypatch):
+    """Runs of a saturated source type wait while runs of other types start."""
+    shutdown_job_runner()  # keep the application's runner from claiming these runs
+    lock = threading.Lock()
+    running, peak, order = {}, {}, []
+    db = SessionLocal()
+    sources = {kind: DataSource(name=kind, type=kind, connection_config="{}") for kind in ("spark", "sqlite")}
+    db.add_all(sources.values())
+    db.commit()
+    for kind in ("spark", "sqlite"):
+        for i in range(4):
+            db.add(DQRun(id=f"{kind}-{i}", source_id=sources[kind].id, status="pending",
+                         available_at=datetime(2024, 1, 1, 0, 0, i if kind == "spark" else 10 + i)))
+    db.commit()
+    db.close()
+
+    def fake_run_job(run_id, owner):
+        kind = run_id.split("-")[0]
+        with lock:
+            order.append(run_id)
+            running[kind] = running.get(kind, 0) + 1
+            peak[kind] = max(peak.get(kind, 0), running[kind])
+        time.sleep(0.05)
+        with lock:
+            running[kind] -= 1
+        db = SessionLocal()
+        db.query(DQRun).filter(DQRun.id == run_id).update({"status": "completed"})
+        db.commit()
+        db.close()
+        return "completed"
+
+    monkeypatch.setattr("api.job_runner.run_job", fake_run_job)
+    runner = JobRunner(max_workers=3, concurrency={"spark": 1}, executor="thread", poll_seconds=0.05)
+    runner.start()
+    assert runner.wait(timeout=10)
+    runner.shutdown()
+    assert sorted(order) == [f"{kind}-{i}" for kind in ("spark", "sqlite") for i in range(4)]
+    assert peak == {"spark": 1, "sqlite": 2}
+    assert order.index("sqlite-0") < order.index("spark-1")  # not stuck behind the queued spark runs
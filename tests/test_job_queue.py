@@ -0,0 +1,96 @@
+"""Tests for the durable job queue (claims, leases and retries)."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api import job_queue
+from api.config import settings
+from api.dependencies import SessionLocal, engine
+from api.job_runner import shutdown_job_runner
+from api.models.database import Base, DataSource, DQRun
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    """Create tables without a job runner, so runs stay where the tests put them."""
+    shutdown_job_runner()
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _queue(db, *run_ids, source_type="sqlite"):
+    source = DataSource(name=source_type, type=source_type, connection_config="{}")
+    db.add(source)
+    db.flush()
+    past = datetime.now(timezone.utc) - timedelta(minutes=1)
+    for i, run_id in enumerate(run_ids):
+        db.add(DQRun(id=run_id, source_id=source.id, status="pending", available_at=past + timedelta(seconds=i)))
+    db.commit()
+
+
+def _run(db, run_id) -> DQRun:
+    db.expire_all()
+    return db.query(DQRun).filter(DQRun.id == run_id).one()
+
+
+def test_claim_is_exclusive_and_ordered(setup_db):
+    db = setup_db
+    _queue(db, "a", "b", "c")
+    assert job_queue.claim(db, "one", 2) == [("a", "sqlite"), ("b", "sqlite")]
+    assert job_queue.claim(db, "two", 2) == [("c", "sqlite")]
+    assert job_queue.claim(db, "two", 2) == []
+    run = _run(db, "a")
+    assert (run.status, run.lease_owner, run.attempts) == ("running", "one", 1)
+
+
+def test_claim_respects_source_type_limits(setup_db):
+    db = setup_db
+    _queue(db, "spark-0", "spark-1", source_type="spark")
+    _queue(db, "sqlite-0", source_type="sqlite")
+    claimed = job_queue.claim(db, "one", 3, {"spark": 1})
+    assert [run_id for run_id, _ in claimed] == ["spark-0", "sqlite-0"]
+
+
+def test_release_retries_with_backoff_then_fails(setup_db):
+    db = setup_db
+    _queue(db, "a")
+    for attempt in range(1, settings.job_max_attempts):
+        job_queue.claim(db, "one", 1)
+        assert job_queue.release(db, "a", "one", "timeout") == "pending"
+        assert _run(db, "a").attempts == attempt
+        assert job_queue.claim(db, "one", 1) == []  # backing off
+        db.query(DQRun).filter(DQRun.id == "a").update({"available_at": datetime(2000, 1, 1)})
+        db.commit()
+    job_queue.claim(db, "one", 1)
+    assert job_queue.release(db, "a", "one", "timeout") == "failed"
+    assert _run(db, "a").error_message == "timeout"
+
+
+def test_release_without_retry_fails_at_once(setup_db):
+    db = setup_db
+    _queue(db, "a")
+    job_queue.claim(db, "one", 1)
+    assert job_queue.release(db, "a", "two", "not mine") is None
+    assert job_queue.release(db, "a", "one", "no rules", retry=False) == "failed"
+    assert _run(db, "a").attempts == 1
+
+
+def test_expired_lease_is_reclaimed_until_max_attempts(setup_db):
+    db = setup_db
+    _queue(db, "a")
+    job_queue.claim(db, "one", 1)
+    assert job_queue.heartbeat(db, "a", "one")
+    for attempt in range(settings.job_max_attempts):
+        db.query(DQRun).filter(DQRun.id == "a").update({"lease_expires_at": datetime(2000, 1, 1)})
+        db.commit()
+        claimed = job_queue.claim(db, "two", 1)
+        if attempt + 1 < settings.job_max_attempts:
+            assert claimed == [("a", "sqlite")]
+    assert not job_queue.heartbeat(db, "a", "one")
+    run = _run(db, "a")
+    assert (run.status, run.lease_owner) == ("failed", None)
+    assert "lease expired" in run.error_message
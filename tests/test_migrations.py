@@ -0,0 +1,59 @@
+"""Tests for upgrading databases created by earlier versions."""
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from api import job_queue
+from api.migrations import upgrade_schema
+from api.models.database import Base, DQRun, Schedule
+
+
+@pytest.fixture
+def old_engine(tmp_path):
+    """A database whose dq_runs and schedules tables predate their new columns, holding a run and a schedule."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE dq_runs (id VARCHAR(36) PRIMARY KEY, source_id VARCHAR(36), status VARCHAR(20) NOT NULL,"
+            " started_at DATETIME, completed_at DATETIME, total_rules INTEGER, passed_rules INTEGER,"
+            " failed_rules INTEGER, error_message TEXT, parameters TEXT)"
+        ))
+        conn.execute(text("INSERT INTO dq_runs (id, status) VALUES ('old', 'pending')"))
+        conn.execute(text(
+            "INSERT INTO dq_runs (id, status, started_at, completed_at)"
+            " VALUES ('done', 'completed', '2026-01-02 03:04:05', '2026-01-02 03:05:00')"
+        ))
+        conn.execute(text(
+            "CREATE TABLE schedules (id VARCHAR(36) PRIMARY KEY, name VARCHAR(255), source_id VARCHAR(36),"
+            " cron_expression VARCHAR(100), rule_ids TEXT, is_active BOOLEAN, last_run_at DATETIME,"
+            " next_run_at DATETIME, created_at DATETIME)"
+        ))
+        conn.execute(text("INSERT INTO schedules (id, created_at) VALUES ('daily', '2026-01-02 03:04:05')"))
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def test_adds_missing_columns_and_backfills(old_engine):
+    assert upgrade_schema(old_engine) == [
+        "dq_runs.attempts", "dq_runs.available_at", "dq_runs.lease_owner", "dq_runs.lease_expires_at",
+        "dq_runs.created_at", "schedules.updated_at",
+    ]
+    assert "ix_schedules_updated_at" in {index["name"] for index in inspect(old_engine).get_indexes("schedules")}
+    assert {"ix_dq_runs_queue", "ix_dq_runs_source_completed"} <= {
+        index["name"] for index in inspect(old_engine).get_indexes("dq_runs")
+    }
+    with Session(old_engine) as db:
+        run, done = db.query(DQRun).order_by(DQRun.id.desc()).all()
+        assert (run.attempts, run.available_at, run.lease_owner, run.created_at) == (0, None, None, None)
+        assert done.created_at == done.started_at
+        assert job_queue.claim(db, "runner", 1) == [("old", "")]  # the old run is still queued
+        assert db.get(DQRun, "old").attempts == 1
+        schedule = db.query(Schedule).one()
+        assert schedule.updated_at == schedule.created_at
+
+
+def test_upgrade_is_idempotent(old_engine):
+    upgrade_schema(old_engine)
+    assert upgrade_schema(old_engine) == []
@@ -1,6 +1,10 @@
 """Tests for the profiling dimension calculator."""
 
+import math
+
+from engine.dataset import ColumnarDataset
 from engine.dimensions.profiling import ProfilingCalculator
+from engine.table_profile import profile_table
 
 
 class TestProfiling:
@@ -80,3 +84,101 @@ class TestProfiling:
         assert dist[0]["count"] == 10
         assert dist[4]["value"] == "e"
         assert dist[4]["count"] == 2
+
+    def test_numeric_percentiles_and_stddev(self):
+        data = [{"col": float(i)} for i in range(1, 10001)]
+        calc = ProfilingCalculator()
+        calc.calculate(data, "col")
+        details = calc._last_details
+
+        assert abs(details["stddev_value"] - 2886.75) < 0.01
+        for name, expected in [("p1", 100.99), ("p50", 5000.5), ("p99", 9900.01)]:
+            assert abs(details["percentiles"][name] - expected) <= expected * 0.01
+        assert details["median_value"] == details["percentiles"]["p50"]
+        assert details["min_value"] == 1.0 and details["max_value"] == 10000.0
+
+    def test_high_cardinality_column_uses_fixed_memory(self):
+        calc = ProfilingCalculator()
+        config = {"exact_distinct_limit": 1000, "top_k_capacity": 50}
+        state = calc.init("col", config)
+        for start in range(0, 200000, 10000):
+            calc.update(state, [{"col": i if i % 10 else "hot"} for i in range(start, start + 10000)])
+
+        assert state.distinct is None
+        assert len(state.frequent.counts) <= 50
+        assert len(state.quantiles.positive) <= state.quantiles.max_buckets
+        _, details = calc.finalize(state)
+        assert details["distinct_count_approximate"] is True
+        assert abs(details["distinct_count"] - 180001) < 180001 * 0.03
+        assert details["most_common"]["value"] == "hot"
+        assert 20000 - state.frequent.error <= details["most_common"]["count"] <= 20000
+
+    def test_most_common_is_exact_below_the_distinct_limit(self):
+        data = [{"col": i % 2000} for i in range(10000)] + [{"col": "hot"}] * 7
+        calc = ProfilingCalculator()
+        calc.calculate(data, "col")
+        details = calc._last_details
+
+        assert details["most_common_approximate"] is False
+        assert details["most_common"] == {"value": "hot", "count": 7}
+        assert all(entry["count"] == 5 for entry in details["value_distribution"][1:])
+
+        calc.calculate(data, "col", {"top_k_capacity": 100})
+        assert calc._last_details["most_common_approximate"] is True
+
+    def test_infinite_values_keep_an_infinite_mean_across_batches(self):
+        calc = ProfilingCalculator()
+        left, right = calc.init("col"), calc.init("col")
+        calc.update(left, [{"col": 1.0}, {"col": float("inf")}])
+        calc.update(left, [{"col": 2.0}])
+        calc.update(right, [{"col": float("inf")}, {"col": 3}])
+        _, details = calc.finalize(calc.merge(left, right))
+        assert details["mean_value"] == float("inf")
+        assert math.isnan(details["stddev_value"])
+
+        calc.update(right, [{"col": float("-inf")}])
+        assert math.isnan(calc.finalize(right)[1]["mean_value"])
+
+    def test_merged_sketches_match_single_pass(self):
+        data = [{"col": (i * 7919) % 5000} for i in range(20000)]
+        config = {"exact_distinct_limit": 1000}
+        calc = ProfilingCalculator()
+        expected = calc.calculate(data, "col", config)
+        expected_details = calc._last_details
+
+        left, right = calc.init("col", config), calc.init("col", config)
+        calc.update(left, data[:7000])
+        calc.update(right, data[7000:])
+        score, details = calc.finalize(calc.merge(left, right))
+        assert score == expected
+        assert details["percentiles"] == expected_details["percentiles"]
+        assert details["distinct_count"] == expected_details["distinct_count"]
+
+
+class TestTableProfile:
+    def test_profiles_every_column_like_the_calculator(self, sample_data):
+        profiles = profile_table(sample_data)
+
+        assert list(profiles) == list(dict.fromkeys(name for row in sample_data for name in row))
+        calc = ProfilingCalculator()
+        for column, profile in profiles.items():
+            assert profile["score"] == round(calc.calculate(sample_data, column), 4)
+            assert {k: v for k, v in profile.items() if k != "score"} == calc._last_details
+
+    def test_reads_batches_once(self, sample_data):
+        reads = []
+
+        def batches():
+            for start in range(0, len(sample_data), 2):
+                reads.append(start)
+                yield sample_data[start : start + 2]
+
+        profiles = profile_table(batches(), columns=["age", "name"])
+        assert reads == [0, 2, 4]
+        assert profiles == profile_table(sample_data, columns=["age", "name"])
+
+    def test_parallel_matches_single_process(self, sample_data):
+        expected = profile_table(sample_data)
+        assert profile_table(sample_data, workers=3) == expected
+        assert profile_table(ColumnarDataset.from_rows(sample_data), workers=2) == expected
+        assert profile_table(iter([]), workers=2) == {}
@@ -0,0 +1,127 @@
+"""Tests for SQL pushdown of dimension metrics."""
+
+import sqlite3
+
+import pytest
+
+from connectors.sqlite import SQLiteConnector
+from engine.pushdown import DIALECTS, plan_pushdown, run_checks_pushdown
+from engine.rule_engine import RuleDefinition, run_checks
+
+RULES = [
+    RuleDefinition(name="name_complete", dimension="completeness", column="name", threshold=90.0),
+    RuleDefinition(
+        name="name_present", dimension="completeness", column="name", config={"treat_empty_as_null": False}
+    ),
+    RuleDefinition(name="id_unique", dimension="uniqueness", column="id", threshold=100.0),
+    RuleDefinition(name="email_unique", dimension="uniqueness", column="email"),
+    RuleDefinition(name="age_range", dimension="accuracy", column="age", config={"min_value": 0, "max_value": 150}),
+    RuleDefinition(
+        name="status_ref", dimension="accuracy", column="status", config={"allowed_values": ["active", "it's"]}
+    ),
+    RuleDefinition(name="status_valid", dimension="validity", column="status", config={"allowed_values": ["active"]}),
+    RuleDefinition(name="email_format", dimension="validity", column="email", config={"format": "email"}),
+    RuleDefinition(
+        name="ordered",
+        dimension="consistency",
+        config={"column_a": "created_at", "column_b": "updated_at", "operator": "lte"},
+    ),
+    RuleDefinition(name="missing", dimension="completeness", column="not_a_column"),
+    RuleDefinition(name="bogus", dimension="nonexistent", column="name"),
+]
+
+
+@pytest.fixture
+def connector(tmp_path, sample_data):
+    db_path = str(tmp_path / "pushdown.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE people "
+        "(id INTEGER, name TEXT, email TEXT, age INTEGER, status TEXT, created_at DATE, updated_at DATE)"
+    )
+    rows = [tuple(row.values()) for row in sample_data]
+    rows += [(6, "  \t", None, None, "it's", "", "2024-01-01"), (7, "", "bob@example.com", 80, None, None, None)]
+    conn.executemany("INSERT INTO people VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+    connector = SQLiteConnector()
+    connector.connect({"database": db_path})
+    yield connector
+    connector.close()
+
+
+def test_pushdown_matches_python_calculators(connector):
+    """Counters computed in SQLite give the same results as streaming the rows."""
+    expected = run_checks(RULES, connector.read_data("people"))
+    assert run_checks_pushdown(RULES, connector, "people") == expected
+
+
+def test_plan_pushes_counts_and_falls_back(connector):
+    """Regex rules and unknown columns are left to the Python calculators."""
+    plan = plan_pushdown(RULES, connector.get_schema("people"), DIALECTS["sqlite"])
+    assert [rule.name for rule in plan.fallback] == ["email_format", "missing", "bogus"]
+    assert len(plan.expressions) == 1 + len(RULES) - 3
+    assert "'it''s'" in plan.expressions[plan.slots[("accuracy", "status", '{"allowed_values": ["active", "it\'s"]}')]]
+
+
+def test_consistency_expressions_match_python(connector):
+    """Expression rules are pushed down when SQL agrees with Python, and streamed otherwise."""
+    expressions = [
+        "created_at <= updated_at and status in ('active', 'inactive')",
+        "age / id > 5 or name is None",
+        "coalesce(age, 0) - id >= 20",
+        "(name if age > 30 else email) != 'Diana'",
+        "age % 7 == 1",
+        "year(created_at) == 2024",
+    ]
+    rules = [RuleDefinition(name=text, dimension="consistency", config={"rule": text}) for text in expressions]
+    plan = plan_pushdown(rules, connector.get_schema("people"), DIALECTS["sqlite"])
+    assert [rule.name for rule in plan.fallback] == expressions[4:]
+    assert run_checks_pushdown(rules, connector, "people") == run_checks(rules, connector.read_data("people"))
+
+
+def test_plan_respects_dialect_text_semantics():
+    """Case-insensitive collations keep text uniqueness in Python; numeric keys are still pushed."""
+    schema = {"email": "varchar", "id": "int"}
+    rules = [
+        RuleDefinition(name="e", dimension="uniqueness", column="email"),
+        RuleDefinition(name="i", dimension="uniqueness", column="id"),
+    ]
+    plan = plan_pushdown(rules, schema, DIALECTS["mysql"])
+    assert [rule.name for rule in plan.fallback] == ["e"]
+    assert plan.expressions[1] == "(COUNT(DISTINCT `id`) + MAX(CASE WHEN `id` IS NULL THEN 1 ELSE 0 END))"
+
+
+def test_pushdown_empty_table_raises(tmp_path):
+    """An empty table is reported like an empty stream."""
+    db_path = str(tmp_path / "empty.db")
+    sqlite3.connect(db_path).execute("CREATE TABLE t (a INTEGER)").connection.close()
+    connector = SQLiteConnector()
+    connector.connect({"database": db_path})
+    with pytest.raises(ValueError, match="No data found"):
+        run_checks_pushdown([RuleDefinition(name="c", dimension="completeness", column="a")], connector, "t")
+
+
+def test_blank_text_uses_python_whitespace(tmp_path):
+    """Pushed-down blank checks trim the same Unicode whitespace as str.strip()."""
+    from engine.formats import PYTHON_WHITESPACE
+
+    db_path = str(tmp_path / "blank.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE t (name TEXT)")
+    values = [(char,) for char in PYTHON_WHITESPACE] + [("\u3000a\xa0",), ("\u200b",), ("x",)]
+    conn.executemany("INSERT INTO t VALUES (?)", values)
+    conn.commit()
+    conn.close()
+    connector = SQLiteConnector()
+    connector.connect({"database": db_path})
+    rules = [RuleDefinition(name="name_complete", dimension="completeness", column="name")]
+    try:
+        pushed = run_checks_pushdown(rules, connector, "t")
+        assert pushed == run_checks(rules, connector.read_data("t"))
+        assert pushed[0].metric_value == round(3 / len(values) * 100, 4)  # U+200B is not whitespace
+    finally:
+        connector.close()
+    for dialect in DIALECTS.values():
+        assert dialect.blank.format('"name"').count('"name"') == 1
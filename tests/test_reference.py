@@ -0,0 +1,241 @@
+"""Tests for referential integrity and allowed-value checks against cached reference columns."""
+
+import importlib.util
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+import pytest
+
+from connectors.sqlite import SQLiteConnector
+from engine import reference as reference_cache
+from engine.dataset import ColumnarDataset
+from engine.dimensions.accuracy import AccuracyCalculator
+from engine.dimensions.referential_integrity import ReferentialIntegrityCalculator
+from engine.dimensions.validity import ValidityCalculator
+from engine.reference import KeyIndex, ValueSet, allowed_value_set, load_index, reference_index, reference_values
+from engine.rule_engine import RuleDefinition, run_checks
+
+requires_numpy = pytest.mark.skipif(importlib.util.find_spec("numpy") is None, reason="numpy not installed")
+
+
+@pytest.fixture
+def reference(tmp_path):
+    db_path = str(tmp_path / "ref.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE customers (customer_id INTEGER, code TEXT)")
+    conn.executemany("INSERT INTO customers VALUES (?, ?)", [(i, f"c{i}") for i in range(0, 2000, 2)] + [(None, None)])
+    conn.commit()
+    conn.close()
+    return {
+        "source_type": "sqlite",
+        "source_config": {"database": db_path},
+        "table": "customers",
+        "column": "customer_id",
+        "cache_dir": str(tmp_path / "cache"),
+    }
+
+
+@pytest.fixture
+def orders():
+    return [{"customer_id": None if i % 10 == 9 else i, "code": f"c{i}"} for i in range(100)]
+
+
+@requires_numpy
+def test_key_index_matches_set_semantics():
+    ints = KeyIndex.build([[3, 1, None], [2, 3]])
+    assert ints.kind == "int" and len(ints) == 3
+    assert ints.find([1, 1.0, 4, "1", 2**70, True]) == [True, True, False, False, False, True]
+
+    mixed = KeyIndex.build([[1, 2], ["a", 2.5]])
+    assert mixed.kind == "hash" and len(mixed) == 4
+    assert mixed.find(["a", 1.0, 2.5, "b", 3]) == [True, True, True, False, False]
+    assert KeyIndex.build([]).find([1, "a"]) == [False, False]
+
+
+@requires_numpy
+def test_scores_keys_found_in_reference(reference, orders):
+    calc = ReferentialIntegrityCalculator()
+    score = calc.calculate(orders, "customer_id", {"reference": reference, "sample_size": 3})
+    details = calc._last_details
+    # 90 non-null keys (the nulls replace odd ones); the 50 even keys exist in the reference.
+    assert score == pytest.approx(50 / 90 * 100)
+    assert details["checked_keys"] == 90
+    assert details["missing_keys"] == 40
+    assert details["null_keys"] == 10
+    assert details["reference_keys"] == 1000
+    assert details["sample_missing"] == [1, 3, 5]
+
+    text = calc.calculate(orders, "code", {"reference": {**reference, "column": "code"}})
+    assert text == 50.0
+
+
+@requires_numpy
+def test_arrow_and_parallel_runs_match(reference, orders):
+    pa = pytest.importorskip("pyarrow")
+    rules = [
+        RuleDefinition(
+            name="fk", dimension="referential_integrity", column="customer_id", config={"reference": reference}
+        ),
+        RuleDefinition(
+            name="code", dimension="referential_integrity", column="code",
+            config={"reference": {**reference, "column": "code"}},
+        ),
+    ]
+    expected = run_checks(rules, orders)
+    assert run_checks(rules, ColumnarDataset.from_arrow(pa.Table.from_pylist(orders))) == expected
+    assert run_checks(rules, orders, workers=2) == expected
+
+
+@requires_numpy
+def test_index_is_cached_until_the_data_changes(reference, orders, monkeypatch):
+    reads = []
+    original = SQLiteConnector.read_data_iterator
+
+    def counting(self, path, limit=None, columns=None):
+        reads.append(path)
+        return original(self, path, limit=limit, columns=columns)
+
+    monkeypatch.setattr(SQLiteConnector, "read_data_iterator", counting)
+    calc = ReferentialIntegrityCalculator()
+    config = {"reference": reference}
+    assert calc.calculate(orders, "customer_id", config) == pytest.approx(50 / 90 * 100)
+    assert calc.calculate(orders, "customer_id", config) == pytest.approx(50 / 90 * 100)
+    assert reads == ["customers"]
+
+    conn = sqlite3.connect(reference["source_config"]["database"])
+    conn.executemany("INSERT INTO customers VALUES (?, ?)", [(i, None) for i in range(1, 100, 2)])
+    conn.commit()
+    conn.close()
+    assert calc.calculate(orders, "customer_id", config) == 100.0
+    assert reads == ["customers", "customers"]
+
+
+def test_index_expires_after_in_place_updates(reference, orders, monkeypatch):
+    """An update that keeps the count, min and max is picked up once the index outlives its TTL."""
+    calc = ReferentialIntegrityCalculator()
+    config = {"reference": {**reference, "ttl_seconds": 60}}
+    assert calc.calculate(orders, "customer_id", config) == pytest.approx(50 / 90 * 100)
+
+    conn = sqlite3.connect(reference["source_config"]["database"])
+    conn.execute("UPDATE customers SET customer_id = 7 WHERE customer_id = 4")
+    conn.commit()
+    conn.close()
+    assert calc.calculate(orders, "customer_id", config) == pytest.approx(50 / 90 * 100)  # same fingerprint
+
+    now = time.time()
+    monkeypatch.setattr("engine.reference.time.time", lambda: now + 61)
+    assert calc.calculate(orders, "customer_id", config) == pytest.approx(50 / 90 * 100)  # 7 found, 4 missing
+    assert calc._last_details["sample_missing"][:3] == [1, 3, 4]
+
+
+@requires_numpy
+def test_processes_drop_indexes_rebuilt_by_another(reference, orders, monkeypatch):
+    """A process that mapped an index reloads it once another process has rebuilt the file."""
+    config = {**reference, "ttl_seconds": 60}
+    handle, index = reference_index(config)
+    assert index.find([4, 7]) == [True, False]
+
+    conn = sqlite3.connect(reference["source_config"]["database"])
+    conn.execute("UPDATE customers SET customer_id = 7 WHERE customer_id = 4")
+    conn.commit()
+    conn.close()
+    now = time.time()
+    monkeypatch.setattr("engine.reference.time.time", lambda: now + 61)
+    mapped = OrderedDict(reference_cache._loaded)
+    reference_cache._loaded.clear()  # as in a fresh process
+    assert reference_index(config)[0] == handle
+
+    reference_cache._loaded.update(mapped)  # back in the process that mapped the old file
+    assert load_index(handle).find([4, 7]) == [False, True]
+
+
+@requires_numpy
+def test_rebuild_removes_superseded_index_files(reference):
+    cache_dir = reference["cache_dir"]
+    old, _ = reference_index(reference)
+    reference_index({**reference, "column": "code"})
+    conn = sqlite3.connect(reference["source_config"]["database"])
+    conn.execute("INSERT INTO customers VALUES (5000, NULL)")
+    conn.commit()
+    conn.close()
+    new, _ = reference_index(reference)
+    assert new != old
+    assert len(os.listdir(cache_dir)) == 4  # the new customer_id index and the code index, each with metadata
+    assert not os.path.exists(old) and os.path.exists(new)
+    with pytest.raises(ValueError, match="not found"):
+        load_index(old)
+
+
+def test_requires_reference(monkeypatch):
+    monkeypatch.setattr("engine.reference._source_resolver", None)
+    with pytest.raises(ValueError, match="reference table and column"):
+        ReferentialIntegrityCalculator().init("customer_id", {})
+    with pytest.raises(ValueError, match="source resolver"):
+        ReferentialIntegrityCalculator().init("id", {"reference": {"source": "crm", "table": "t", "column": "id"}})
+
+
+def test_value_set_matches_set_semantics():
+    pa = pytest.importorskip("pyarrow")
+    allowed = ValueSet([1, 2.5, True, "a", float("nan"), 2**70, None])
+    assert 1.0 in allowed and "a" in allowed and None not in allowed and [1] not in allowed
+    columns = {
+        "int": [1, 2, None, 3],
+        "float": [1.0, 2.5, float("nan"), 0.5],
+        "string": ["a", "1", None, "b"],
+        "bool": [True, False, None, True],
+    }
+    for values in columns.values():
+        expected = sum(1 for value in values if value is not None and value in allowed)
+        assert allowed.count_in(pa.array(values)) == expected
+    assert allowed_value_set(["a", "b"]) is allowed_value_set(["a", "b"])
+    assert allowed_value_set("abc") == "abc"  # strings keep Python substring semantics
+
+
+def test_allowed_values_from_reference_column(reference, orders, monkeypatch):
+    reads = []
+    original = SQLiteConnector.read_data_iterator
+
+    def counting(self, path, limit=None, columns=None):
+        reads.append(path)
+        return original(self, path, limit=limit, columns=columns)
+
+    monkeypatch.setattr(SQLiteConnector, "read_data_iterator", counting)
+    codes = {**reference, "column": "code"}
+    rules = [
+        RuleDefinition(name="a", dimension="accuracy", column="code", config={"allowed_values": codes}),
+        RuleDefinition(name="v", dimension="validity", column="code", config={"allowed_values": codes}),
+    ]
+    results = run_checks(rules, orders)
+    assert [result.metric_value for result in results] == [50.0, 50.0]
+    assert run_checks(rules, orders, workers=2) == results
+    assert len(reference_values(codes)) == 1000
+    assert reads == ["customers"]  # loaded once, shared by both rules, both runs and the workers
+
+    conn = sqlite3.connect(reference["source_config"]["database"])
+    conn.executemany("INSERT INTO customers VALUES (?, ?)", [(None, f"c{i}") for i in range(1, 100, 2)])
+    conn.commit()
+    conn.close()
+    assert AccuracyCalculator().calculate(orders, "code", {"allowed_values": codes}) == 100.0
+    assert ValidityCalculator().calculate(orders, "code", {"allowed_values": codes}) == 100.0
+    assert reads == ["customers", "customers"]
+
+
+def test_allowed_values_expire_after_in_place_updates(reference, orders, monkeypatch):
+    """An update that keeps the count, min ("c0") and max ("c998") is picked up once the values outlive their TTL."""
+    codes = {**reference, "column": "code", "ttl_seconds": 60}
+    config = {"allowed_values": codes}
+    assert AccuracyCalculator().calculate(orders, "code", config) == 50.0
+
+    conn = sqlite3.connect(reference["source_config"]["database"])
+    conn.execute("UPDATE customers SET code = 'c1' WHERE code = 'c1000'")
+    conn.commit()
+    conn.close()
+    assert AccuracyCalculator().calculate(orders, "code", config) == 50.0  # same fingerprint
+    assert ValidityCalculator().calculate(orders, "code", config) == 50.0
+
+    now = time.time()
+    monkeypatch.setattr("engine.reference.time.time", lambda: now + 61)
+    assert AccuracyCalculator().calculate(orders, "code", config) == 51.0
+    assert ValidityCalculator().calculate(orders, "code", config) == 51.0
@@ -1,6 +1,8 @@
 """Tests for the DQ rule engine."""
 
-from engine.rule_engine import RuleDefinition, evaluate_rule, load_rules_from_yaml, run_checks
+from concurrent.futures import ThreadPoolExecutor
+
+from engine.rule_engine import RuleDefinition, compile_rules, evaluate_rule, load_rules_from_yaml, run_checks
 
 
 def test_load_rules_from_yaml(sample_rules_yaml):
@@ -54,3 +56,123 @@ def test_evaluate_operators(sample_data):
 
     rule_eq = RuleDefinition(name="test", dimension="completeness", column="name", threshold=80.0, operator="eq")
     assert evaluate_rule(rule_eq, sample_data).passed is True
+
+
+def test_fused_run_matches_per_rule(sample_data):
+    """Fused evaluation returns the same results as evaluating each rule alone."""
+    rules = [
+        RuleDefinition(name="c", dimension="completeness", column="name", threshold=90.0),
+        RuleDefinition(name="u", dimension="uniqueness", column="id", threshold=100.0),
+        RuleDefinition(name="a", dimension="accuracy", column="age", config={"min_value": 0, "max_value": 150}),
+        RuleDefinition(name="v", dimension="validity", column="email", config={"format": "email"}),
+        RuleDefinition(
+            name="k",
+            dimension="consistency",
+            config={"column_a": "created_at", "column_b": "updated_at", "operator": "lte"},
+        ),
+        RuleDefinition(name="p", dimension="profiling", column="status"),
+        RuleDefinition(name="x", dimension="nonexistent", column="name"),
+    ]
+    assert run_checks(rules, sample_data) == run_checks(rules, sample_data, fused=False)
+
+
+def test_fused_run_shares_identical_rules(sample_data):
+    """Rules that only differ by name and threshold get independent results."""
+    rules = [
+        RuleDefinition(name="strict", dimension="completeness", column="name", threshold=90.0),
+        RuleDefinition(name="loose", dimension="completeness", column="name", threshold=50.0),
+    ]
+    strict, loose = run_checks(rules, sample_data)
+    assert strict.metric_value == loose.metric_value == 80.0
+    assert strict.passed is False
+    assert loose.passed is True
+
+
+def test_run_checks_on_columnar_dataset(sample_data):
+    """Calculators accept a pre-projected ColumnarDataset."""
+    from engine.dataset import ColumnarDataset
+
+    dataset = ColumnarDataset.from_rows(sample_data, ["name", "id"])
+    rules = [
+        RuleDefinition(name="c", dimension="completeness", column="name"),
+        RuleDefinition(name="missing", dimension="completeness", column="not_projected"),
+    ]
+    results = run_checks(rules, dataset)
+    assert results[0].metric_value == 80.0
+    assert results[1].metric_value == 0.0
+
+
+def test_streaming_matches_full_run(sample_data):
+    """Streaming batches through accumulators gives the same results as one pass."""
+    from engine.rule_engine import run_checks_streaming
+
+    rules = [
+        RuleDefinition(name="c", dimension="completeness", column="name", threshold=90.0),
+        RuleDefinition(name="u", dimension="uniqueness", column="id", threshold=100.0),
+        RuleDefinition(name="a", dimension="accuracy", column="age", config={"min_value": 0, "max_value": 150}),
+        RuleDefinition(name="v", dimension="validity", column="email", config={"format": "email"}),
+        RuleDefinition(name="p", dimension="profiling", column="status"),
+    ]
+    batches = [sample_data[:2], [], sample_data[2:4], sample_data[4:]]
+    assert run_checks_streaming(rules, iter(batches)) == run_checks(rules, sample_data)
+
+
+def test_parallel_run_matches_single_process(sample_data):
+    """Sharding rows across worker processes merges back to the single-process results."""
+    from engine.dataset import ColumnarDataset
+
+    rules = [
+        RuleDefinition(name="c", dimension="completeness", column="name", threshold=90.0),
+        RuleDefinition(name="u", dimension="uniqueness", column="id", threshold=100.0),
+        RuleDefinition(name="s", dimension="uniqueness", column="id", config={"spill_to_disk": True}),
+        RuleDefinition(name="a", dimension="accuracy", column="age", config={"min_value": 0, "max_value": 150}),
+        RuleDefinition(name="v", dimension="validity", column="email", config={"format": "email"}),
+        RuleDefinition(name="t", dimension="timeliness", column="created_at", config={"max_age_hours": 1}),
+        RuleDefinition(name="p", dimension="profiling", column="status"),
+    ]
+    expected = run_checks(rules, sample_data)
+    assert run_checks(rules, sample_data, workers=2) == expected
+    assert run_checks(rules, ColumnarDataset.from_rows(sample_data), workers=3) == expected
+    assert run_checks(rules, [], workers=2) == run_checks(rules, [])
+
+
+def test_compiled_plan_is_reusable_and_isolated(sample_data):
+    """A compiled plan gives the rules' results on every run and ignores later edits to the rules."""
+    rules = [
+        RuleDefinition(name="a", dimension="accuracy", column="age", config={"min_value": 0, "max_value": 150}),
+        RuleDefinition(name="a2", dimension="accuracy", column="age", config={"max_value": 150, "min_value": 0}),
+        RuleDefinition(name="c", dimension="completeness", column="name", threshold=90.0, operator="lt"),
+        RuleDefinition(name="x", dimension="nonexistent", column="name"),
+    ]
+    expected = run_checks(rules, sample_data)
+    plan = compile_rules(rules)
+    assert len(plan.specs) == 2 and plan.columns == ("age", "name")
+
+    rules[0].config["max_value"] = 10
+    assert run_checks(plan, sample_data) == run_checks(plan, sample_data, fused=False) == expected
+    assert [evaluate_rule(rule, sample_data) for rule in plan.rules] == expected
+    assert expected[2].passed is True  # 80 < 90
+
+
+def test_concurrent_runs_share_a_plan(sample_data):
+    """Threads running one plan over different data each get their own results and details."""
+    rules = [
+        RuleDefinition(name="p", dimension="profiling", column="status"),
+        RuleDefinition(name="u", dimension="uniqueness", column="id", threshold=100.0),
+    ]
+    plan = compile_rules(rules)
+    datasets = [sample_data[:size] for size in range(1, len(sample_data) + 1)] * 20
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda data: run_checks(plan, data, fused=False), datasets))
+    assert results == [run_checks(rules, data) for data in datasets]
+
+
+def test_results_carry_rule_ids(sample_data):
+    """Each result names the stored rule it came from, also for rules sharing a metric or name."""
+    rules = [
+        RuleDefinition(name="c", dimension="completeness", column="name", threshold=90.0, rule_id="r1"),
+        RuleDefinition(name="c", dimension="completeness", column="name", threshold=50.0, rule_id="r2"),
+        RuleDefinition(name="x", dimension="nonexistent", column="name", rule_id="r3"),
+    ]
+    assert [result.rule_id for result in run_checks(rules, sample_data)] == ["r1", "r2", "r3"]
+    assert [result.rule_id for result in run_checks(rules, sample_data, fused=False)] == ["r1", "r2", "r3"]
@@ -0,0 +1,126 @@
+"""Tests for cron expressions and the schedule runner."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.cron import CronExpression
+from api.dependencies import SessionLocal, engine
+from api.job_runner import shutdown_job_runner
+from api.models.database import Base, DataSource, DQRun, Schedule
+from api.scheduler import Scheduler
+
+NOW = datetime(2026, 10, 18, 12, 34, 56, tzinfo=timezone.utc)  # a Sunday
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("* * * * *", datetime(2026, 10, 18, 12, 35)),
+    ("*/15 * * * *", datetime(2026, 10, 18, 12, 45)),
+    ("0 6 * * *", datetime(2026, 10, 19, 6, 0)),
+    ("0 9 * * mon-fri", datetime(2026, 10, 19, 9, 0)),
+    ("0 0 13 * 5", datetime(2026, 10, 23, 0, 0)),  # day of month OR day of week
+    ("0 0 29 feb *", datetime(2028, 2, 29, 0, 0)),
+    ("@monthly", datetime(2026, 11, 1, 0, 0)),
+])
+def test_cron_next_after(expression, expected):
+    assert CronExpression(expression).next_after(NOW) == expected.replace(tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("expression", ["0 6 * *", "60 * * * *", "* * * * mon-", "*/0 * * * *"])
+def test_cron_rejects_malformed_expressions(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+def test_cron_that_never_matches_raises():
+    with pytest.raises(ValueError, match="never matches"):
+        CronExpression("0 0 30 2 *").next_after(NOW)
+
+
+@pytest.fixture
+def db():
+    """Tables without a job runner, so queued runs stay pending."""
+    shutdown_job_runner()
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _schedules(db, count, cron="0 * * * *", next_run_at=None, rule_ids=None):
+    source = DataSource(name="src", type="sqlite", connection_config="{}")
+    db.add(source)
+    db.flush()
+    schedules = [
+        Schedule(
+            name=f"s{i}", source_id=source.id, cron_expression=cron, next_run_at=next_run_at,
+            rule_ids=json.dumps(rule_ids) if rule_ids else None,
+        )
+        for i in range(count)
+    ]
+    db.add_all(schedules)
+    db.commit()
+    return source.id, [schedule.id for schedule in schedules]
+
+
+def test_new_schedule_waits_for_its_next_cron_time(db):
+    _schedules(db, 1, rule_ids=["r1"])
+    scheduler = Scheduler(jitter_seconds=0)
+    scheduler.refresh(db, NOW)
+    assert db.query(Schedule).one().next_run_at == datetime(2026, 10, 18, 13, 0)
+    assert scheduler.run_due(db, NOW) == []
+
+    [run_id] = scheduler.run_due(db, datetime(2026, 10, 18, 13, 0, tzinfo=timezone.utc))
+    run = db.query(DQRun).filter(DQRun.id == run_id).one()
+    assert run.status == "pending"
+    assert json.loads(run.parameters)["rule_ids"] == ["r1"]
+    assert db.query(Schedule).one().next_run_at == datetime(2026, 10, 18, 14, 0)
+    assert scheduler.next_fire_at() == datetime(2026, 10, 18, 14, 0, tzinfo=timezone.utc)
+
+
+def test_missed_runs_collapse_into_one_catch_up_run(db):
+    _schedules(db, 1, next_run_at=datetime(2026, 10, 18, 7, 0))  # down since 7:00
+    scheduler = Scheduler(jitter_seconds=0)
+    scheduler.refresh(db, NOW)
+    assert len(scheduler.run_due(db, NOW)) == 1
+    assert db.query(Schedule).one().next_run_at == datetime(2026, 10, 18, 13, 0)
+    assert scheduler.run_due(db, NOW) == []
+
+
+def test_jitter_spreads_runs_and_source_cap_defers(db):
+    _schedules(db, 5, next_run_at=datetime(2026, 10, 18, 13, 0))
+    scheduler = Scheduler(jitter_seconds=600, max_queued_per_source=2)
+    scheduler.refresh(db, NOW)
+    top_of_hour = datetime(2026, 10, 18, 13, 0, tzinfo=timezone.utc)
+    fire_times = sorted(entry.fire_at for entry in scheduler._entries.values())
+    assert top_of_hour <= fire_times[0] < fire_times[-1] <= top_of_hour + timedelta(seconds=600)
+
+    assert len(scheduler.run_due(db, top_of_hour + timedelta(minutes=10))) == 2
+    assert db.query(DQRun).count() == 2
+    db.query(DQRun).update({"status": "completed"})
+    db.commit()
+    assert len(scheduler.run_due(db, top_of_hour + timedelta(minutes=12))) == 2
+
+
+def test_concurrent_schedulers_queue_each_run_once(db):
+    _schedules(db, 3, next_run_at=datetime(2026, 10, 18, 12, 0))
+    first, second = (Scheduler(jitter_seconds=0, max_queued_per_source=10) for _ in range(2))
+    first.refresh(db, NOW)
+    second.refresh(db, NOW)
+    assert len(first.run_due(db, NOW)) == 3
+    assert second.run_due(db, NOW) == []
+    assert db.query(DQRun).count() == 3
+    assert second.next_fire_at() == datetime(2026, 10, 18, 13, 0, tzinfo=timezone.utc)
+
+
+def test_refresh_picks_up_changed_schedules(db):
+    _, [schedule_id] = _schedules(db, 1, next_run_at=datetime(2030, 1, 1))
+    scheduler = Scheduler(jitter_seconds=0)
+    scheduler.refresh(db)
+    assert scheduler.next_fire_at() == datetime(2030, 1, 1, tzinfo=timezone.utc)
+    db.query(Schedule).filter(Schedule.id == schedule_id).update({"is_active": False})
+    db.commit()
+    scheduler.refresh(db)  # only loads schedules changed since the last refresh
+    assert scheduler.next_fire_at() is None
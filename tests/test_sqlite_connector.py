@@ -82,3 +82,14 @@ def test_not_connected_raises() -> None:
     c = SQLiteConnector()
     with pytest.raises(RuntimeError):
         c.read_data("users")
+
+
+def test_read_columnar(test_db: str) -> None:
+    """Test reading a table straight into column arrays."""
+    c = SQLiteConnector(batch_size=2)
+    c.connect({"database": test_db})
+    dataset = c.read_columnar("users")
+    assert len(dataset) == 3
+    assert dataset.column("id") == [1, 2, 3]
+    assert dataset.column("email") == ["alice@test.com", None, "carol@test.com"]
+    c.close()